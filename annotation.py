@@ -2,25 +2,197 @@
 """إنشاء ملف annotation بناءً على ملفات dataset.
 Создание файла аннотации на основе файлов набора данных"""
 
+import csv
+import json
 import os
-import pandas as pd
-from typing import List, Dict, Any
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
 
+# Обход папок общий с копированием; iter_file_batches доступен и отсюда
+# فحص المجلدات مشترك مع النسخ؛ iter_file_batches متاح من هنا أيضاً
+from file_operations import (DEFAULT_SCAN_WORKERS, PROGRESS_INTERVAL, DirScan, FileRow,
+                             OperationCancelled, iter_file_batches, scan_directory,
+                             walk_directories)
+from file_hashing import FileHasher, HashCache
 
-def create_annotation_file(source_folder: str, save_path: str) -> None:
+# أعمدة ملف annotation - Столбцы файла аннотации
+ANNOTATION_HEADER = ["filename", "path", "size_bytes"]
+# عمود تجزئة المحتوى (اختياري) - Столбец хеша содержимого (необязательный)
+HASH_COLUMN = "hash"
+# عمود الحالة في الوضع التزايدي - Столбец статуса в инкрементальном режиме
+STATUS_COLUMN = "status"
+STATUS_ADDED = "added"
+STATUS_REMOVED = "removed"
+STATUS_MODIFIED = "modified"
+STATUS_UNCHANGED = "unchanged"
+# ملف جانبي بأزمنة تعديل المجلدات والملفات (لا تُكتب في CSV)
+# Файл-спутник с временами изменения папок и файлов (в CSV не пишутся)
+DIR_INDEX_SUFFIX = ".dirs.json"
+DIR_INDEX_VERSION = 2
+# ذاكرة التجزئات حسب (inode، الحجم، زمن التعديل) - Кэш хешей по (inode, размер, время)
+HASH_CACHE_SUFFIX = ".hashes.json"
+# المجلدات المعدلة قبل الفحص بأقل من هذا تُعاد قراءتها في التشغيل التالي:
+# دقة أزمنة نظام الملفات قد لا تميز تعديلاً حدث أثناء الفحص
+# Папки, измененные менее чем за это время до обхода, перечитываются в
+# следующий раз: точность времени ФС может не отличить правку во время обхода
+RACY_WINDOW_NS = 2 * 10**9
+
+
+def _dir_key(folder: str) -> str:
+    # نفس شكل os.path.dirname(path) لصفوف الملفات
+    # Тот же вид, что os.path.dirname(path) у строк файлов
+    return os.path.dirname(os.path.join(folder, ""))
+
+
+def dir_index_path(save_path: str) -> str:
+    """مسار الملف الجانبي للمجلدات - Путь к файлу-спутнику папок"""
+    return save_path + DIR_INDEX_SUFFIX
+
+
+def hash_cache_path(save_path: str) -> str:
+    """مسار ذاكرة التجزئات - Путь к кэшу хешей"""
+    return save_path + HASH_CACHE_SUFFIX
+
+
+def _load_previous_manifest(save_path: str, source_folder: str
+                            ) -> Tuple[Dict[str, Dict[str, FileRow]], Dict[str, dict]]:
+    """
+    قراءة ملف annotation السابق وملفه الجانبي
+    Чтение прежнего файла аннотации и его файла-спутника
+
+    Returns:
+        Tuple: (الصفوف حسب المجلد، أزمنة المجلدات) - (строки по папкам, времена папок)
+    """
+    rows_by_dir: Dict[str, Dict[str, FileRow]] = {}
+    if not os.path.exists(save_path):
+        return rows_by_dir, {}
+
+    with open(save_path, "r", newline="", encoding="utf-8-sig") as f:
+        for record in csv.DictReader(f):
+            if record.get(STATUS_COLUMN) == STATUS_REMOVED:
+                continue
+            row = (record["filename"], record["path"], int(record["size_bytes"]), None)
+            rows_by_dir.setdefault(os.path.dirname(row[1]), {})[row[1]] = row
+
+    dirs: Dict[str, dict] = {}
+    try:
+        with open(dir_index_path(save_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        # الملف الجانبي صالح فقط لنفس المجلد المصدر ونفس محتوى annotation
+        # Спутник годен только для той же папки и того же файла аннотации
+        if (index.get("version") == DIR_INDEX_VERSION
+                and index.get("source") == source_folder
+                and index.get("manifest_mtime_ns") == os.stat(save_path).st_mtime_ns):
+            dirs = index["dirs"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # أزمنة الملفات من الملف الجانبي؛ بدونه المقارنة بالحجم فقط
+    # Времена файлов из спутника; без него сравнение только по размеру
+    for folder, info in dirs.items():
+        rows = rows_by_dir.get(_dir_key(folder))
+        if not rows:
+            continue
+        mtimes = info.get("files", {})
+        for path, row in rows.items():
+            rows[path] = row[:3] + (mtimes.get(row[0]),)
+    return rows_by_dir, dirs
+
+
+def _write_dir_index(save_path: str, source_folder: str, dirs: Dict[str, dict]) -> None:
+    index = {
+        "version": DIR_INDEX_VERSION,
+        "source": source_folder,
+        "manifest_mtime_ns": os.stat(save_path).st_mtime_ns,
+        "dirs": dirs,
+    }
+    path = dir_index_path(save_path)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def _rescan_directory(folder: str, previous: Optional[dict],
+                      previous_rows: Optional[Dict[str, FileRow]],
+                      verify_files: bool) -> DirScan:
+    """
+    إعادة فحص المجلد فقط إذا تغير زمن تعديله
+    Повторный обход папки, только если изменилось ее время изменения
+    """
+    if previous is None or previous.get("mtime_ns") is None:
+        return scan_directory(folder)
+    try:
+        mtime_ns = os.stat(folder).st_mtime_ns
+    except OSError:
+        # المجلد حُذف: كل ملفاته تصبح removed - Папка удалена: все файлы removed
+        return DirScan(folder, None, [], [])
+    if mtime_ns != previous["mtime_ns"]:
+        return scan_directory(folder)
+
+    # قائمة الأسماء لم تتغير - Список имен не изменился
+    rows = list((previous_rows or {}).values())
+    if verify_files:
+        # زمن المجلد لا يتغير عند تعديل محتوى ملف موجود
+        # Время папки не меняется при правке содержимого существующего файла
+        checked = []
+        for name, path, _, _ in rows:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            checked.append((name, path, stat.st_size, stat.st_mtime_ns))
+        rows = checked
+    return DirScan(folder, mtime_ns, rows, list(previous.get("subdirs", [])), reused=True)
+
+
+def _file_status(old: Optional[FileRow], new: FileRow) -> str:
+    if old is None:
+        return STATUS_ADDED
+    if old[2] != new[2] or (old[3] is not None and old[3] != new[3]):
+        return STATUS_MODIFIED
+    return STATUS_UNCHANGED
+
+
+def create_annotation_file(source_folder: str, save_path: str,
+                           workers: Optional[int] = None, incremental: bool = False,
+                           verify_files: bool = False,
+                           progress: Optional[Callable[[Dict[str, int]], None]] = None,
+                           cancel_event: Optional[threading.Event] = None,
+                           hash_files: bool = False,
+                           hash_workers: Optional[int] = None) -> Dict[str, int]:
     """
     إنشاء ملف CSV يحتوي على قائمة الملفات في مجلد المصدر وتفاصيلها
     
     Args:
         source_folder (str): مسار مجلد المصدر الذي يحتوي على الملفات
         save_path (str): مسار حفظ ملف annotation الناتج
+        workers (int): عدد خيوط فحص المجلدات - Потоков обхода папок
+        incremental (bool): تحديث الملف السابق: المجلدات التي لم يتغير زمن تعديلها
+                            لا يُعاد فحصها، ويُضاف عمود status
+                            (added / removed / modified / unchanged)
+                            Обновить прежний файл: папки с неизменным временем
+                            изменения не перечитываются, добавляется столбец status
+        verify_files (bool): في الوضع التزايدي فحص حجم وزمن كل ملف حتى في
+                             المجلدات غير المتغيرة (يكشف تعديل المحتوى في المكان)
+                             В инкрементальном режиме проверять каждый файл
+                             и в неизменных папках (находит правки на месте)
+        progress (Callable): يستقبل نسخة من الإحصاءات أثناء الفحص (files, bytes, ...)
+                             Получает копию статистики во время обхода
+        cancel_event (threading.Event): حدث الإلغاء - Событие отмены
+        hash_files (bool): إضافة عمود hash (BLAKE2b للمحتوى) محسوب في مجموعة
+                           عمليات؛ الملفات غير المتغيرة تؤخذ من ذاكرة التجزئات
+                           Добавить столбец hash (BLAKE2b содержимого), считается
+                           в пуле процессов; неизменные файлы берутся из кэша
+        hash_workers (int): عدد عمليات التجزئة - Процессов хеширования
         
     Raises:
         RuntimeError: إذا حدث خطأ أثناء إنشاء الملف أو لم توجد ملفات
         FileNotFoundError: إذا لم يكن المجلد المصدري موجوداً
+        OperationCancelled: تم ضبط حدث الإلغاء (الملف السابق يبقى كما هو)
         
     Returns:
-        None: يتم حفظ الملف في المسار المحدد
+        Dict[str, int]: إحصاءات الملفات والمجلدات - Статистика файлов и папок
     """
     # التحقق من وجود المجلد المصدر أولاً
     if not os.path.exists(source_folder):
@@ -30,33 +202,116 @@ def create_annotation_file(source_folder: str, save_path: str) -> None:
     if not os.path.isdir(source_folder):
         raise ValueError(f"المسار المحدد ليس مجلد: {source_folder}")
     
+    tmp_path = save_path + ".tmp"
+    hasher = None
     try:
-        files: List[Dict[str, Any]] = []
-        for root, _, filenames in os.walk(source_folder):
-            for name in filenames:
-                file_path = os.path.join(root, name)
-                try:
-                    file_size = os.path.getsize(file_path)
-                    files.append({
-                        "filename": name,
-                        "path": file_path,
-                        "size_bytes": file_size
-                    })
-                except (OSError, PermissionError) as e:
-                    print(f"تحذير: لا يمكن الوصول إلى الملف {file_path}: {e}")
+        stats = {"files": 0, "bytes": 0, STATUS_ADDED: 0, STATUS_REMOVED: 0,
+                 STATUS_MODIFIED: 0, STATUS_UNCHANGED: 0, "scanned_dirs": 0, "reused_dirs": 0,
+                 "hashed": 0, "hash_cache_hits": 0}
+        last_report = 0.0
+        scan = scan_directory
+        header = ANNOTATION_HEADER + ([HASH_COLUMN] if hash_files else [])
+        # تجزئة الملفات المحذوفة غير معروفة - Хеш удаленных файлов неизвестен
+        removed_extra = [""] if hash_files else []
+        if incremental:
+            previous_rows, previous_dirs = _load_previous_manifest(save_path, source_folder)
+            header = header + [STATUS_COLUMN]
+
+            def scan(folder: str) -> DirScan:
+                return _rescan_directory(folder, previous_dirs.get(folder),
+                                         previous_rows.get(_dir_key(folder)), verify_files)
+
+        # الصفوف تُكتب دفعة بعد دفعة بدلاً من بناء DataFrame كامل في الذاكرة،
+        # والملف المؤقت يحل محل الملف القديم فقط عند النجاح
+        # Строки пишутся пакетами вместо DataFrame в памяти; временный файл
+        # заменяет старый только при успехе
+        dirs: Dict[str, dict] = {}
+        racy_after_ns = time.time_ns() - RACY_WINDOW_NS
+        with open(tmp_path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            results = walk_directories(source_folder, workers or DEFAULT_SCAN_WORKERS, scan)
+            if hash_files:
+                # المجلدات تنتظر تجزئات ملفاتها مع الحفاظ على الترتيب
+                # Папки ждут хешей своих файлов, порядок сохраняется
+                hasher = FileHasher(hash_workers, HashCache(hash_cache_path(save_path)))
+                results = hasher.iter_hashed(
+                    results, lambda result: [row[1] for row in result.rows])
+            else:
+                results = ((result, None) for result in results)
+            for result, hashes in results:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled()
+                mtime_ns = result.mtime_ns
+                if mtime_ns is not None and mtime_ns >= racy_after_ns:
+                    mtime_ns = None
+                dirs[result.folder] = {"mtime_ns": mtime_ns, "subdirs": result.subdirs,
+                                       "files": {row[0]: row[3] for row in result.rows}}
+                stats["reused_dirs" if result.reused else "scanned_dirs"] += 1
+                stats["files"] += len(result.rows)
+                stats["bytes"] += sum(row[2] for row in result.rows)
+                rows = [row[:3] for row in result.rows]
+                if hashes is not None:
+                    rows = [tuple(row) + (digest,) for row, digest in zip(rows, hashes)]
+                    stats["hashed"] = hasher.hashed
+                    stats["hash_cache_hits"] = hasher.cache_hits
+                if progress is not None and time.perf_counter() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.perf_counter()
+                    progress(dict(stats))
+                if not incremental:
+                    writer.writerows(rows)
                     continue
+                old_rows = previous_rows.pop(_dir_key(result.folder), {})
+                for scanned, row in zip(result.rows, rows):
+                    status = _file_status(old_rows.pop(row[1], None), scanned)
+                    stats[status] += 1
+                    writer.writerow(list(row) + [status])
+                for row in old_rows.values():
+                    stats[STATUS_REMOVED] += 1
+                    writer.writerow(list(row[:3]) + removed_extra + [STATUS_REMOVED])
+
+            if incremental:
+                # مجلدات لم تعد موجودة - Папки, которых больше нет
+                for old_rows in previous_rows.values():
+                    for row in old_rows.values():
+                        stats[STATUS_REMOVED] += 1
+                        writer.writerow(list(row[:3]) + removed_extra + [STATUS_REMOVED])
+
+        if progress is not None:
+            progress(dict(stats))
 
         # التحقق من وجود ملفات فعلاً
-        if not files:
+        if not stats["files"]:
             raise RuntimeError("لم يتم العثور على أي ملفات في المجلد المصدر")
-            
-        df = pd.DataFrame(files)
-        df.to_csv(save_path, index=False, encoding="utf-8-sig")
-        print(f"تم إنشاء ملف annotation بنجاح: {save_path}")
+
+        os.replace(tmp_path, save_path)
+        try:
+            _write_dir_index(save_path, source_folder, dirs)
+        except OSError as e:
+            # بدون الملف الجانبي يعيد التشغيل التزايدي التالي فحص كل شيء
+            # Без спутника следующий инкрементальный запуск обойдет все заново
+            print(f"تحذير: لا يمكن حفظ {dir_index_path(save_path)}: {e}")
+        if hash_files:
+            try:
+                hasher.cache.save()
+            except OSError as e:
+                # التشغيل التالي يعيد تجزئة كل الملفات - Следующий запуск перехеширует все
+                print(f"تحذير: لا يمكن حفظ {hash_cache_path(save_path)}: {e}")
+        if incremental:
+            print(f"تم تحديث ملف annotation: {save_path} "
+                  f"(added={stats[STATUS_ADDED]}, removed={stats[STATUS_REMOVED]}, "
+                  f"modified={stats[STATUS_MODIFIED]})")
+        else:
+            print(f"تم إنشاء ملف annotation بنجاح: {save_path}")
+        return stats
         
     except Exception as e:
+        if hasher is not None:
+            hasher.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
         # إعادة رفع الاستثناءات المحددة التي نعرفها
-        if isinstance(e, (FileNotFoundError, RuntimeError)):
+        if isinstance(e, (FileNotFoundError, RuntimeError, OperationCancelled)):
             raise e
         else:
             raise RuntimeError(f"حدث خطأ أثناء إنشاء annotation: {e}")
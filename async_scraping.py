@@ -0,0 +1,148 @@
+"""
+Async Scraping Engine - محرك الاستخراج غير المتزامن
+Асинхронный движок скрапинга Wuzzuf
+
+Same inputs and output shape as scrape_wuzzuf_jobs (six parallel lists), with
+an asyncio interface that reports the rows of every completed page through a
+callback. This is a thread-backed adapter, not a native async HTTP client:
+each blocking requests call and parse runs via asyncio.to_thread in a thread
+pool owned by the engine's own event loop, so throughput is the same as
+scrape_wuzzuf_jobs with the same number of workers. The private loop lets it
+be started from any worker thread (e.g. WebScrapingThread).
+
+Адаптер поверх потоков: блокирующие запросы выполняются в пуле потоков.
+محول فوق الخيوط: الطلبات الحاجبة تُنفذ في مجموعة خيوط.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from http_cache import HttpCache
+from rate_limiting import RequestScheduler
+from web_scraping import (DEFAULT_PARSER, DEFAULT_WORKERS, JOBS_PER_PAGE,
+                          WUZZUF_SEARCH_URL, JobRecord, build_search_url,
+                          create_session, fetch_page, get_parser, records_to_lists)
+
+# on_page(page_num, pages_done, pages_total, page_data_lists): only the rows of
+# page_num, in arrival order - صفوف الصفحة page_num فقط بترتيب الوصول
+PageCallback = Callable[[int, int, int, List[List[str]]], None]
+
+
+async def scrape_wuzzuf_jobs_async(search_query: str = "python", max_pages: int = 2,
+                                   concurrency: int = DEFAULT_WORKERS,
+                                   on_page: Optional[PageCallback] = None,
+                                   session: Optional[requests.Session] = None,
+                                   base_url: str = WUZZUF_SEARCH_URL,
+                                   parser: str = DEFAULT_PARSER,
+                                   http_cache: Optional[HttpCache] = None,
+                                   scheduler: Optional[RequestScheduler] = None) -> Tuple[bool, List]:
+    """
+    Scrape Wuzzuf pages from asyncio code - استخراج صفحات Wuzzuf من كود asyncio
+    Скрапинг страниц Wuzzuf из кода asyncio
+
+    Requests and parsing are blocking and run in worker threads; up to
+    `concurrency` pages are in flight at once.
+
+    Args:
+        search_query (str): Job search term - مصطلح البحث عن الوظائف
+        max_pages (int): Maximum pages to scrape - الحد الأقصى لعدد الصفحات
+        concurrency (int): Requests in flight at once - عدد الطلبات المتزامنة
+        on_page (PageCallback): Called with the rows of each new page
+                                يُستدعى بصفوف كل صفحة جديدة
+        session (requests.Session): Shared session - جلسة مشتركة
+        base_url (str): Search page URL - رابط صفحة البحث
+        parser (str): Registered page parser name - اسم محلل الصفحات
+        http_cache (HttpCache): Conditional-request HTTP cache - ذاكرة HTTP المؤقتة
+        scheduler (RequestScheduler): Pacing, retries and adaptive concurrency - جدولة الطلبات
+
+    Returns:
+        Tuple[bool, List]: (Success status, Data lists) - (حالة النجاح، قوائم البيانات)
+    """
+    parse_func = get_parser(parser)
+    own_session = session is None
+    if own_session:
+        session = create_session(concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_and_parse(page_num: int):
+        url = build_search_url(search_query, page_num, base_url)
+        async with semaphore:
+            content = await asyncio.to_thread(fetch_page, url, session, None, http_cache,
+                                              scheduler)
+        return page_num, await asyncio.to_thread(parse_func, content)
+
+    pages: Dict[int, List[JobRecord]] = {}
+    skipped = 0
+
+    def collected() -> List[JobRecord]:
+        return [record for p in sorted(pages) for record in pages[p]]
+
+    def report(page_num: int, total: int) -> None:
+        if on_page is not None:
+            on_page(page_num, len(pages), total, records_to_lists(pages[page_num]))
+
+    try:
+        # First page gives the total count - الصفحة الأولى تعطي العدد الكلي
+        _, (page_limit, first_page, skipped) = await fetch_and_parse(0)
+        last_page = max_pages
+        if page_limit is not None:
+            last_page = min(max_pages, page_limit // JOBS_PER_PAGE + 1)
+        pages[0] = first_page
+        report(0, last_page)
+
+        tasks = [asyncio.create_task(fetch_and_parse(page_num))
+                 for page_num in range(1, last_page)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                page_num, (_, page_records, page_skipped) = await next_done
+                pages[page_num] = page_records
+                skipped += page_skipped
+                report(page_num, last_page)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        records = collected()
+        # تم استخراج وظيفة بنجاح Successfully extracted jobs
+        print(f"Успешно извлечено {len(records)} вакансий")
+        if skipped:
+            # تم تخطي بطاقات غير صالحة Skipped malformed cards
+            print(f"Пропущено некорректных карточек: {skipped}")
+        return True, records_to_lists(records)
+
+    except Exception as e:
+        #حدث خطأ أثناء الاستخراج  Error during extraction
+        print(f"Произошла ошибка при извлечении: {e}")
+        return False, []
+
+    finally:
+        if own_session:
+            session.close()
+
+
+def run_async_scrape(search_query: str = "python", max_pages: int = 2,
+                     concurrency: int = DEFAULT_WORKERS,
+                     on_page: Optional[PageCallback] = None,
+                     base_url: str = WUZZUF_SEARCH_URL,
+                     parser: str = DEFAULT_PARSER,
+                     http_cache: Optional[HttpCache] = None,
+                     scheduler: Optional[RequestScheduler] = None) -> Tuple[bool, List]:
+    """
+    Run the engine on a private event loop - تشغيل المحرك في حلقة أحداث خاصة
+    Запуск движка в собственном цикле событий текущего потока
+
+    The loop gets its own thread pool for the blocking page requests.
+    """
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency * 2)
+    loop.set_default_executor(executor)
+    try:
+        return loop.run_until_complete(scrape_wuzzuf_jobs_async(
+            search_query, max_pages, concurrency, on_page, base_url=base_url, parser=parser,
+            http_cache=http_cache, scheduler=scheduler))
+    finally:
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
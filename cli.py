@@ -0,0 +1,250 @@
+"""
+Командная строка без графического интерфейса
+واجهة سطر الأوامر بدون واجهة رسومية
+Headless command-line entry point
+
+Все рабочие процессы доступны без MainWindow: модули импортируются только
+внутри выбранной подкоманды, PySide6 не загружается вовсе, поэтому запуск
+подходит для cron и серверов без дисплея.
+
+Examples:
+    python cli.py scrape python django --pages 3 --output jobs.csv --append
+    python cli.py annotate ./dataset annotation.csv
+    python cli.py reorganize ./dataset ./dataset_copy
+    python cli.py duplicates ./dataset --report duplicates.csv
+    python cli.py search-by-date 15/01/2024 --csv ./dataset/jobs.csv
+    python cli.py analyze jobs.csv
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+
+def cmd_scrape(args: argparse.Namespace) -> int:
+    """
+    Извлечение вакансий с Wuzzuf - استخراج الوظائف من Wuzzuf
+    """
+    from web_scraping import (DEFAULT_PARSER, save_jobs_to_csv, scrape_wuzzuf_batch,
+                              scrape_wuzzuf_jobs)
+
+    http_cache = None
+    if not args.no_cache:
+        from http_cache import DEFAULT_TTL, HttpCache
+        http_cache = HttpCache(ttl=DEFAULT_TTL if args.cache_ttl is None else args.cache_ttl)
+    scheduler = None
+    if args.rate is not None or args.retries is not None:
+        from rate_limiting import RequestScheduler
+        scheduler = RequestScheduler(rate=args.rate,
+                                     max_retries=3 if args.retries is None else args.retries)
+
+    options = dict(workers=args.workers, parser=args.parser or DEFAULT_PARSER,
+                   http_cache=http_cache, scheduler=scheduler)
+    if args.base_url:
+        options["base_url"] = args.base_url
+    if len(args.queries) > 1:
+        success, data = scrape_wuzzuf_batch(args.queries, args.pages, **options)
+    else:
+        checkpoint = None
+        if args.resume:
+            from scrape_checkpoint import ScrapeCheckpoint
+            checkpoint = ScrapeCheckpoint()
+        success, data = scrape_wuzzuf_jobs(args.queries[0], args.pages,
+                                           checkpoint=checkpoint, **options)
+    if not success:
+        return 1
+    if not data or not data[0]:
+        print("Вакансии не найдены")
+        return 0
+    return 0 if save_jobs_to_csv(data, args.output, mode="a" if args.append else "w") else 1
+
+
+def cmd_annotate(args: argparse.Namespace) -> int:
+    """
+    Создание файла аннотации - إنشاء ملف annotation
+    """
+    from annotation import create_annotation_file
+
+    try:
+        create_annotation_file(args.source_folder, args.save_path, workers=args.workers,
+                               incremental=args.incremental, verify_files=args.verify_files,
+                               hash_files=args.hash, hash_workers=args.hash_workers)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_reorganize(args: argparse.Namespace) -> int:
+    """
+    Реорганизация набора данных - إعادة تنظيم مجموعة البيانات
+    """
+    from file_operations import OperationCancelled
+    from reorganize_dataset import reorganize_dataset
+
+    if not os.path.isdir(args.source_folder):
+        print(f"Ошибка: папка не найдена: {args.source_folder}", file=sys.stderr)
+        return 1
+    options = {"strategy": args.strategy, "skip_unchanged": args.skip_unchanged,
+               "dedup": args.dedup}
+    if args.workers:
+        options["workers"] = args.workers
+    try:
+        reorganize_dataset(args.source_folder, args.dest_folder, **options)
+    except OperationCancelled:
+        print("Операция отменена", file=sys.stderr)
+        return 1
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_duplicates(args: argparse.Namespace) -> int:
+    """
+    Поиск одинаковых файлов - البحث عن الملفات المتطابقة
+    """
+    from dedup import find_duplicates, write_duplicate_report
+
+    try:
+        report = find_duplicates(args.source_folder, hash_workers=args.hash_workers)
+        if args.report:
+            write_duplicate_report(report, args.report)
+    except OSError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    print(f"Дубликаты: {report.summary()}")
+    if args.report:
+        print(f"Отчет сохранен в: {args.report}")
+    return 0
+
+
+def cmd_search_by_date(args: argparse.Namespace) -> int:
+    """
+    Поиск вакансий по дате - البحث عن الوظائف حسب التاريخ
+    """
+    from data_utils import get_data_by_date
+
+    try:
+        data = get_data_by_date(args.date, args.csv, use_cache=not args.no_cache,
+                                stream=args.stream)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    if data is None or data.empty:
+        print("Нет данных за указанную дату")
+        return 0
+    if args.output:
+        data.to_csv(args.output, index=False, encoding="utf-8")
+        print(f"Найдено {len(data)} записей, сохранено в: {args.output}")
+    else:
+        print(data.to_string(index=False))
+    return 0
+
+
+def cmd_analyze(args: argparse.Namespace) -> int:
+    """
+    Анализ вакансий с графиками - تحليل الوظائف مع الرسوم البيانية
+    """
+    # Без дисплея matplotlib должен рисовать в файл بدون شاشة يرسم matplotlib في ملف
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    from data_analysis import analyze_job_data_with_charts
+
+    success, report, chart_path = analyze_job_data_with_charts(args.csv)
+    print(report)
+    if chart_path:
+        print(f"Графики сохранены в: {chart_path}")
+    return 0 if success else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Парсер аргументов со всеми подкомандами - محلل الوسائط مع كل الأوامر الفرعية
+    """
+    parser = argparse.ArgumentParser(
+        prog="job-analytics",
+        description="Job Analytics Platform - командная строка / سطر الأوامر")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scrape = subparsers.add_parser("scrape", help="Извлечь вакансии с Wuzzuf")
+    scrape.add_argument("queries", nargs="+", help="Поисковые запросы")
+    scrape.add_argument("--pages", type=int, default=2, help="Страниц на запрос")
+    scrape.add_argument("--workers", type=int, default=1, help="Параллельных загрузок")
+    scrape.add_argument("--parser", choices=["bs4", "lxml"], help="Парсер страниц")
+    scrape.add_argument("--output", default="jobs.csv", help="CSV-файл результата")
+    scrape.add_argument("--append", action="store_true",
+                        help="Добавить только новые вакансии в существующий файл")
+    scrape.add_argument("--no-cache", action="store_true", help="Не использовать HTTP-кэш")
+    scrape.add_argument("--cache-ttl", type=float, help="Время жизни HTTP-кэша, сек")
+    scrape.add_argument("--rate", type=float, help="Запросов в секунду")
+    scrape.add_argument("--retries", type=int, help="Повторов при ошибках")
+    scrape.add_argument("--resume", action="store_true",
+                        help="Продолжить прерванный запуск (один запрос)")
+    scrape.add_argument("--base-url", help="Адрес страницы поиска (зеркало или тестовый сервер)")
+    scrape.set_defaults(func=cmd_scrape)
+
+    annotate = subparsers.add_parser("annotate", help="Создать файл аннотации")
+    annotate.add_argument("source_folder", help="Папка набора данных")
+    annotate.add_argument("save_path", help="Путь к CSV аннотации")
+    annotate.add_argument("--workers", type=int, help="Потоков обхода папок")
+    annotate.add_argument("--incremental", action="store_true",
+                          help="Обновить существующий файл, перечитав только измененные папки")
+    annotate.add_argument("--verify-files", action="store_true",
+                          help="С --incremental проверять размер и время каждого файла")
+    annotate.add_argument("--hash", action="store_true",
+                          help="Добавить столбец hash (BLAKE2b содержимого)")
+    annotate.add_argument("--hash-workers", type=int, help="Процессов хеширования")
+    annotate.set_defaults(func=cmd_annotate)
+
+    reorganize = subparsers.add_parser("reorganize", help="Реорганизовать набор данных")
+    reorganize.add_argument("source_folder", help="Исходная папка")
+    reorganize.add_argument("dest_folder", help="Целевая папка")
+    reorganize.add_argument("--workers", type=int, help="Потоков копирования")
+    reorganize.add_argument("--strategy", choices=["copy", "hardlink", "reflink"],
+                            default="copy", help="Копия, жесткая ссылка или клон (reflink)")
+    reorganize.add_argument("--skip-unchanged", action="store_true",
+                            help="Пропускать файлы с тем же размером и временем в цели")
+    reorganize.add_argument("--dedup", action="store_true",
+                            help="Копировать одинаковые файлы один раз, остальные - ссылки")
+    reorganize.set_defaults(func=cmd_reorganize)
+
+    duplicates = subparsers.add_parser("duplicates", help="Найти одинаковые файлы")
+    duplicates.add_argument("source_folder", help="Папка набора данных")
+    duplicates.add_argument("--report", help="Сохранить отчет в CSV")
+    duplicates.add_argument("--hash-workers", type=int, help="Процессов хеширования")
+    duplicates.set_defaults(func=cmd_duplicates)
+
+    search = subparsers.add_parser("search-by-date", help="Найти вакансии по дате")
+    search.add_argument("date", help="Дата в формате ДД/ММ/ГГГГ")
+    search.add_argument("--csv", required=True, help="CSV-файл набора данных")
+    search.add_argument("--output", help="Сохранить результат в CSV")
+    search.add_argument("--stream", action="store_true", help="Читать файл блоками")
+    search.add_argument("--no-cache", action="store_true", help="Не использовать кэш")
+    search.set_defaults(func=cmd_search_by_date)
+
+    analyze = subparsers.add_parser("analyze", help="Анализ вакансий с графиками")
+    analyze.add_argument("csv", help="CSV-файл вакансий")
+    analyze.set_defaults(func=cmd_analyze)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки - نقطة دخول سطر الأوامر
+
+    Returns:
+        int: Код завершения (0 - успех) - رمز الخروج (0 - نجاح)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # Контрольные точки ведутся только для одного запроса
+    # نقاط الحفظ تُدار لاستعلام واحد فقط
+    if args.command == "scrape" and args.resume and len(args.queries) > 1:
+        parser.error("--resume поддерживается только для одного запроса")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
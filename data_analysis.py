@@ -8,9 +8,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import Tuple, Dict, Any, List
-import csv
 import os
 
+from data_utils import compact_dataframe, load_jobs_csv, memory_report
+
 
 class DataAnalyzer:
     """
@@ -22,20 +23,24 @@ class DataAnalyzer:
         """Initialize the analyzer - تهيئة المحلل"""
         self.df = None
         self.analysis_results = {}
+        self.memory_before = None
     
-    def load_data(self, file_path: str) -> bool:
+    def load_data(self, file_path: str, compact: bool = False) -> bool:
         """
         Load and prepare data from CSV file - تحضير البيانات من ملف CSV
+        
+        Args:
+            file_path (str): Path to CSV file - مسار ملف CSV
+            compact (bool): Use category/pyarrow dtypes - استخدام أنواع مضغوطة
         """
         try:
-            # Try different encodings - تجربة ترميزات مختلفة
-            try:
-                self.df = pd.read_csv(file_path, encoding='utf-8', sep=';', quoting=csv.QUOTE_NONE)
-            except UnicodeDecodeError:
-                try:
-                    self.df = pd.read_csv(file_path, encoding='cp1251', sep=';', quoting=csv.QUOTE_NONE)
-                except:
-                    self.df = pd.read_csv(file_path, encoding='latin-1', sep=';', quoting=csv.QUOTE_NONE)
+            # Shared loader: encoding sniffed once, file parsed once
+            # المحمل المشترك: تحديد الترميز مرة واحدة وتحليل الملف مرة واحدة
+            self.df = load_jobs_csv(file_path)
+            
+            self.memory_before = self.df.memory_usage(deep=True, index=False)
+            if compact:
+                self.df = compact_dataframe(self.df)
             
             print(f"Data loaded  : {len(self.df)}")  # Data loaded
             return True
@@ -44,6 +49,14 @@ class DataAnalyzer:
             print(f"Error loading data: {e}")  # Error loading data
             return False
     
+    def memory_report(self) -> pd.DataFrame:
+        """
+        Bytes per column before and after compact loading - الذاكرة لكل عمود قبل وبعد الضغط
+        """
+        if self.df is None or self.memory_before is None:
+            return pd.DataFrame(columns=['before_bytes', 'after_bytes', 'ratio'])
+        return memory_report(self.memory_before, self.df)
+    
     def clean_data(self) -> None:
         """
         Clean and prepare the dataset - تنظيف وتحضير مجموعة البيانات
@@ -77,6 +90,9 @@ class DataAnalyzer:
         
         # Handle missing values - معالجة القيم المفقودة
         if 'job_title' in self.df.columns:
+            # Categorical titles cannot take new values - الفئات لا تقبل قيمًا جديدة
+            if isinstance(self.df['job_title'].dtype, pd.CategoricalDtype):
+                self.df['job_title'] = self.df['job_title'].astype(object)
             self.df['job_title'] = self.df['job_title'].replace(r'^\s*$', np.nan, regex=True)
             self.df = self.df.fillna({'job_title': 'unknown'})
     
@@ -3,24 +3,208 @@
  البيانات باستخدام pandas.
 """
 
+import codecs
 import csv
-from datetime import datetime, timedelta
-from typing import Optional
+import os
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, Optional, Set, Tuple
+import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
+from dataset_cache import HAS_PYARROW, get_default_cache
+from dataset_index import DatasetIndex, normalize_date_key
+
+# Кодировки в порядке проверки (как раньше в DataAnalyzer.load_data)
+# الترميزات بترتيب الفحص
+ENCODING_CANDIDATES = ['utf-8', 'cp1251', 'latin-1']
+# Сколько байт читать для определения кодировки عدد البايتات لتحديد الترميز
+ENCODING_SNIFF_BYTES = 64 * 1024
+_encoding_cache: Dict[Tuple[str, int, int], str] = {}
+# Значения, которые считаются отсутствующей датой القيم التي تعتبر تاريخًا مفقودًا
+MISSING_DATE_MARKERS = ['nan', 'null', 'none', 'not date']
+# Сколько индексов дат держать в памяти процесса عدد فهارس التواريخ في الذاكرة
+MAX_CACHED_INDEXES = 8
+_index_cache: "OrderedDict[tuple, DatasetIndex]" = OrderedDict()
+# Бюджет памяти потокового чтения (байты) ميزانية الذاكرة للقراءة المتدفقة
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# Во сколько раз строка в DataFrame больше, чем в файле نسبة حجم الصف في الذاكرة
+ROW_MEMORY_FACTOR = 4
+# Доля уникальных значений, ниже которой столбец становится category
+# نسبة القيم الفريدة التي يتحول تحتها العمود إلى category
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+# Порядок проверки единиц такой же, как в convert_date ترتيب فحص الوحدات كما في convert_date
+_RELATIVE_UNITS = ['day', 'week', 'month', 'year']
+
+""" Определение кодировки по ограниченному префиксу файла. Результат
+    кэшируется для каждой версии файла (путь, размер, mtime). تحديد الترميز من
+    بداية الملف فقط مع حفظ النتيجة لكل نسخة من الملف."""
+
+
+def detect_encoding(csv_path: str, sample_bytes: Optional[int] = None) -> str:
+    sample_bytes = sample_bytes or ENCODING_SNIFF_BYTES
+    stat = os.stat(csv_path)
+    key = (os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns)
+    cached = _encoding_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with open(csv_path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    complete = len(sample) < sample_bytes
+
+    encoding = ENCODING_CANDIDATES[-1]
+    if sample.startswith(codecs.BOM_UTF8):
+        encoding = 'utf-8-sig'
+    else:
+        for candidate in ENCODING_CANDIDATES:
+            # Инкрементальный декодер не ломается на обрезанном символе в конце
+            # المفكك التدريجي لا يفشل عند حرف مقطوع في النهاية
+            decoder = codecs.getincrementaldecoder(candidate)()
+            try:
+                decoder.decode(sample, final=complete)
+            except UnicodeDecodeError:
+                continue
+            encoding = candidate
+            break
+
+    _encoding_cache[key] = encoding
+    return encoding
+
+    """ Общий загрузчик CSV вакансий: кодировка определяется один раз, файл
+    разбирается один раз. المحمل المشترك لملفات CSV: تحديد الترميز مرة واحدة
+    وتحليل الملف مرة واحدة."""
+
+
+def load_jobs_csv(csv_path: str, **kwargs) -> pd.DataFrame:
+    encoding = detect_encoding(csv_path)
+    options = dict(sep=';', quoting=csv.QUOTE_NONE)
+    options.update(kwargs)
+    try:
+        return pd.read_csv(csv_path, encoding=encoding, **options)
+    except UnicodeDecodeError:
+        # Префикс был корректным, но дальше в файле нет: следующая кодировка
+        # البداية صحيحة لكن باقي الملف لا: نجرب الترميز التالي
+        stat = os.stat(csv_path)
+        key = (os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns)
+        base = 'utf-8' if encoding == 'utf-8-sig' else encoding
+        remaining = ENCODING_CANDIDATES[ENCODING_CANDIDATES.index(base) + 1:]
+        for candidate in remaining:
+            try:
+                df = pd.read_csv(csv_path, encoding=candidate, **options)
+            except UnicodeDecodeError:
+                continue
+            _encoding_cache[key] = candidate
+            return df
+        raise
+
 """ Чтение CSV-файла с правильной кодировкой и разделителем قراءة ملف CSV
     باستخدام الترميز والفاصل الصحيح."""
 
 
-def read_dataset(csv_path: str) -> pd.DataFrame:
-    df = pd.read_csv(
-        csv_path,
-        encoding='macroman',
-        sep=';',
-        quoting=csv.QUOTE_NONE)
+def read_dataset(csv_path: str, compact: bool = False) -> pd.DataFrame:
+    df = load_jobs_csv(csv_path)
+    if compact:
+        df = compact_dataframe(df)
+    return df
+
+    """ Компактные типы: повторяющиеся строки -> category, остальные строки ->
+    pyarrow string (если установлен pyarrow). أنواع مضغوطة: النصوص المتكررة إلى
+    category والباقي إلى pyarrow string."""
+
+
+def compact_dataframe(df: pd.DataFrame,
+                      max_unique_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> pd.DataFrame:
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col]
+        non_null = values.count()
+        if non_null == 0:
+            continue
+        if values.nunique(dropna=True) / non_null <= max_unique_ratio:
+            df[col] = values.astype('category')
+        elif HAS_PYARROW and values.dropna().map(type).eq(str).all():
+            df[col] = values.astype('string[pyarrow]')
     return df
 
+    """ Отчет о памяти по столбцам до и после сжатия (в байтах). تقرير الذاكرة
+    لكل عمود قبل وبعد الضغط (بالبايت)."""
+
+
+def memory_report(before, after) -> pd.DataFrame:
+    def column_bytes(data) -> pd.Series:
+        if isinstance(data, pd.DataFrame):
+            return data.memory_usage(deep=True, index=False)
+        return pd.Series(data, dtype='int64')
+
+    report = pd.DataFrame({
+        'before_bytes': column_bytes(before),
+        'after_bytes': column_bytes(after),
+    }).fillna(0).astype('int64')
+    report.loc['TOTAL'] = report.sum()
+    report['ratio'] = (report['after_bytes']
+                       / report['before_bytes'].replace(0, np.nan)).round(3)
+    return report
+
+    """ Оценка размера блока (в строках) по бюджету памяти. تقدير حجم الكتلة
+    (بالصفوف) حسب ميزانية الذاكرة."""
+
+
+def estimate_chunksize(csv_path: str, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                       sample_bytes: int = 1 << 20) -> int:
+    with open(csv_path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    lines = max(sample.count(b'\n'), 1)
+    bytes_per_row = max(len(sample) / lines, 1.0)
+    return max(int(memory_budget / (bytes_per_row * ROW_MEMORY_FACTOR)), 1)
+
+    """ Потоковое чтение CSV-файла блоками. قراءة ملف CSV على دفعات.
+    Все столбцы читаются как строки, чтобы хеши строк совпадали между блоками.
+    """
+
+
+def read_dataset_chunks(csv_path: str, chunksize: Optional[int] = None,
+                        memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Iterator[pd.DataFrame]:
+    if chunksize is None:
+        chunksize = estimate_chunksize(csv_path, memory_budget)
+    with pd.read_csv(
+            csv_path,
+            encoding=detect_encoding(csv_path),
+            sep=';',
+            quoting=csv.QUOTE_NONE,
+            dtype=str,
+            chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+    """ Удаление строк, уже встреченных в предыдущих блоках (по хешу строки).
+    حذف الصفوف التي ظهرت في الدفعات السابقة (حسب بصمة الصف)."""
+
+
+def drop_seen_rows(df: pd.DataFrame, seen: Set[int]) -> pd.DataFrame:
+    if df.empty:
+        return df
+    digests = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    keep = np.fromiter((digest not in seen for digest in digests.tolist()),
+                       dtype=bool, count=len(digests))
+    seen.update(digests[keep].tolist())
+    return df[keep]
+
+    """ Очищенные блоки без дубликатов между блоками. دفعات منظفة بدون تكرار
+    بين الدفعات."""
+
+
+def iter_clean_chunks(csv_path: str, chunksize: Optional[int] = None,
+                      memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Iterator[pd.DataFrame]:
+    seen: Set[int] = set()
+    for chunk in read_dataset_chunks(csv_path, chunksize, memory_budget):
+        chunk = drop_seen_rows(clean_dataset(chunk), seen)
+        if not chunk.empty:
+            yield chunk
+
     """Очистка данных: تنظيف البيانات:"""
 
 
@@ -41,7 +225,7 @@ def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
 
 def convert_date(text_date: str) -> str:
     if pd.isna(text_date) or text_date == '' or str(
-            text_date).strip().lower() in ['nan', 'null', 'none', 'not date']:
+            text_date).strip().lower() in MISSING_DATE_MARKERS:
         return "not date"
     today = datetime.now()
     text_date = str(text_date).strip().lower()
@@ -70,29 +254,169 @@ def convert_date(text_date: str) -> str:
     except (ValueError, TypeError, IndexError):
         return "No date"
 
+
+def convert_dates(dates: pd.Series, now: Optional[datetime] = None,
+                  as_string: bool = False) -> pd.Series:
+    """
+    Векторное преобразование относительных дат ("2 days ago") в datetime64.
+    تحويل متجه للتواريخ النسبية ("2 days ago") إلى datetime64.
+
+    Каждое уникальное значение вычисляется один раз, а все строки используют
+    одну общую точку отсчета ``now``. يتم حساب كل قيمة فريدة مرة واحدة فقط.
+
+    Args:
+        dates: Столбец с текстовыми датами - عمود التواريخ النصية
+        now: Точка отсчета (по умолчанию datetime.now()) - نقطة المرجع
+        as_string: Вернуть строки '%d/%m/%Y' как convert_date - إرجاع نصوص
+
+    Returns:
+        pd.Series: datetime64 (NaT для нераспознанных) или строки при as_string
+    """
+    reference = pd.Timestamp(now if now is not None else datetime.now()).normalize()
+
+    # Группировка одинаковых строк: разбор выполняется только для уникальных
+    # значений تجميع القيم المتطابقة: يتم التحليل للقيم الفريدة فقط
+    codes, uniques = pd.factorize(dates, use_na_sentinel=True)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip().str.lower()
+
+    missing = text.eq('') | text.isin(MISSING_DATE_MARKERS)
+    parts = text.str.extract(r'^([+-]?\d+)\s+(\S+)')
+    number = pd.to_numeric(parts[0], errors='coerce')
+    unit = parts[1].fillna('')
+
+    days = pd.Series(np.nan, index=text.index)
+    months = pd.Series(np.nan, index=text.index)
+    matched = pd.Series(False, index=text.index)
+    for name in _RELATIVE_UNITS:
+        mask = unit.str.contains(name, regex=False) & ~matched & number.notna()
+        matched |= mask
+        if name == 'day':
+            days[mask] = number[mask]
+        elif name == 'week':
+            days[mask] = number[mask] * 7
+        elif name == 'month':
+            months[mask] = number[mask]
+        else:
+            months[mask] = number[mask] * 12
+
+    values = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    # Слишком большие сдвиги выходят за диапазон datetime64[ns]
+    # الإزاحات الكبيرة جدًا تتجاوز نطاق datetime64[ns]
+    day_mask = days.notna() & days.abs().lt(100_000)
+    if day_mask.any():
+        values[day_mask] = reference - pd.to_timedelta(days[day_mask], unit='D')
+    # relativedelta считается один раз на каждое число месяцев
+    # يتم حساب relativedelta مرة واحدة لكل عدد من الأشهر
+    for count in months.dropna().unique():
+        try:
+            shifted = pd.Timestamp(reference - relativedelta(months=int(count)))
+        except (ValueError, OverflowError):
+            continue
+        values[months == count] = shifted
+
+    result = pd.Series(values.to_numpy().take(codes), index=dates.index,
+                       name=dates.name)
+    # Отсутствующие значения в исходном столбце (код -1) القيم المفقودة الأصلية
+    result[codes == -1] = pd.NaT
+    if not as_string:
+        return result
+
+    formatted = result.dt.strftime('%d/%m/%Y').astype(object)
+    is_missing = np.append(missing.to_numpy(), True).take(codes)
+    formatted[result.isna()] = "No date"
+    formatted[result.isna() & is_missing] = "not date"
+    return formatted
+
     """  Чтение файла, его очистка и применение преобразования даты. قراءة الملف
      وتنظيفه وتطبيق تحويل التاريخ."""
 
 
-def process_dataset(csv_path: str) -> pd.DataFrame:
+def process_dataset(csv_path: str, parse_dates: bool = False) -> pd.DataFrame:
     df = read_dataset(csv_path)
     df = clean_dataset(df)
     if "date" in df.columns:
-        df["date"] = df["date"].apply(convert_date)
+        # Одна общая точка отсчета для всего файла نقطة مرجعية واحدة لكل الملف
+        df["date"] = convert_dates(df["date"], as_string=not parse_dates)
     return df
 
-    """Возврат строк, соответствующих определенной дате, после обработки
-    # данных. إرجاع الصفوف المطابقة لتاريخ معين بعد تجهيز البيانات."""
+    """ Обработанные данные из кэша на диске или после полной обработки.
+    البيانات المعالجة من الذاكرة المؤقتة أو بعد المعالجة الكاملة."""
+
+
+def load_processed_dataset(csv_path: str, use_cache: bool = True) -> pd.DataFrame:
+    if not use_cache:
+        return process_dataset(csv_path)
+    return get_default_cache().get_or_process(csv_path, process_dataset)
+
+    """ Индекс дат, построенный один раз для каждой версии файла. فهرس
+    التواريخ يُبنى مرة واحدة لكل نسخة من الملف."""
+
+
+def get_dataset_index(csv_path: str, use_cache: bool = True) -> DatasetIndex:
+    if not use_cache:
+        return _build_index(load_processed_dataset(csv_path, use_cache=False))
+
+    stat = os.stat(csv_path)
+    key = (os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns,
+           date.today())
+    index = _index_cache.get(key)
+    if index is not None:
+        _index_cache.move_to_end(key)
+        return index
+
+    index = _build_index(load_processed_dataset(csv_path))
+    _index_cache[key] = index
+    while len(_index_cache) > MAX_CACHED_INDEXES:
+        _index_cache.popitem(last=False)
+    return index
 
 
-def get_data_by_date(date_value: str, csv_path: str) -> Optional[pd.DataFrame]:
-    df = process_dataset(csv_path)
+def _build_index(df: pd.DataFrame) -> DatasetIndex:
     if "date" not in df.columns:
         # عمود 'date' غير موجود في الملف بعد المعالجة.
         raise ValueError("Столбец 'date' отсутствует в файле после обработки")
-    print("columns:", df.columns)
+    return DatasetIndex(df, "date")
+
+    """Возврат строк, соответствующих определенной дате, после обработки
+    # данных. إرجاع الصفوف المطابقة لتاريخ معين بعد تجهيز البيانات."""
+
+
+def get_data_by_date(date_value: str, csv_path: str, use_cache: bool = True,
+                     stream: bool = False,
+                     chunksize: Optional[int] = None) -> Optional[pd.DataFrame]:
+    if stream:
+        return stream_data_by_date(date_value, csv_path, chunksize=chunksize)
+    index = get_dataset_index(csv_path, use_cache=use_cache)
+    print("columns:", index.df.columns)
+    return index.select(date_value)
+
+    """ Поиск по дате без загрузки всего файла: фильтр применяется к каждому
+    блоку, в памяти остаются только совпавшие строки. البحث بالتاريخ دون تحميل
+    الملف كاملًا: يتم الترشيح لكل دفعة."""
+
 
-    filtered = df[df["date"] == date_value]
-    if filtered.empty:
+def stream_data_by_date(date_value: str, csv_path: str,
+                        chunksize: Optional[int] = None,
+                        memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Optional[pd.DataFrame]:
+    target = normalize_date_key(date_value)
+    if isinstance(target, pd.Timestamp):
+        target = target.strftime('%d/%m/%Y')
+    reference = datetime.now()
+    seen: Set[int] = set()
+    parts = []
+    for chunk in read_dataset_chunks(csv_path, chunksize, memory_budget):
+        chunk = clean_dataset(chunk)
+        if "date" not in chunk.columns:
+            # عمود 'date' غير موجود في الملف بعد المعالجة.
+            raise ValueError("Столбец 'date' отсутствует в файле после обработки")
+        dates = convert_dates(chunk["date"], now=reference, as_string=True)
+        mask = (dates.str.strip().str.lower() == str(target).lower()).to_numpy()
+        # Дубликаты проверяются по исходным строкам, как в clean_dataset
+        # يتم فحص التكرار على الصفوف الأصلية كما في clean_dataset
+        matched = drop_seen_rows(chunk[mask], seen)
+        if not matched.empty:
+            matched = matched.assign(date=dates[matched.index])
+            parts.append(matched)
+    if not parts:
         return None
-    return filtered
+    return pd.concat(parts)
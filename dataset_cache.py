@@ -0,0 +1,281 @@
+""" Кэш обработанных наборов данных на диске. ذاكرة تخزين مؤقت على القرص
+ للبيانات المعالجة.
+
+Обработанный DataFrame сохраняется в бинарном колоночном формате (parquet,
+если установлен pyarrow, иначе pickle) и привязывается к отпечатку исходного
+файла: путь, размер, mtime и хеш содержимого. Изменение файла автоматически
+делает запись недействительной. Каждый исходный файл занимает одну запись;
+записи удаленных файлов, давно не использованные записи и самые старые записи
+сверх лимита размера удаляются при сохранении новой записи.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Версия формата кэша: увеличить при изменении обработки данных
+# إصدار تنسيق الذاكرة المؤقتة: يجب زيادته عند تغيير معالجة البيانات
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "job_analytics")
+# Лимиты кэша: общий размер и время с последнего использования записи
+# حدود الذاكرة المؤقتة: الحجم الكلي والمدة منذ آخر استخدام للمدخل
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+MAX_ENTRY_AGE = 30 * 24 * 3600
+
+DATA_EXTENSIONS = (".parquet", ".pkl")
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def file_content_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Хеш содержимого файла (BLAKE2b) - بصمة محتوى الملف
+
+    Args:
+        file_path (str): Путь к файлу - مسار الملف
+        block_size (int): Размер блока чтения - حجم كتلة القراءة
+
+    Returns:
+        str: Шестнадцатеричный хеш - البصمة بالنظام الست عشري
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """
+    Кэш обработанных DataFrame на диске - ذاكرة مؤقتة للبيانات المعالجة على القرص
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_bytes: int = MAX_CACHE_BYTES, max_age: float = MAX_ENTRY_AGE):
+        """
+        Args:
+            cache_dir (str): Папка кэша (по умолчанию JOB_ANALYTICS_CACHE_DIR
+                             или ~/.cache/job_analytics) - مجلد الذاكرة المؤقتة
+            max_bytes (int): Предельный размер кэша - الحجم الأقصى للذاكرة المؤقتة
+            max_age (float): Секунд с последнего использования записи
+                             ثواني منذ آخر استخدام للمدخل
+        """
+        self.cache_dir = (cache_dir or os.environ.get("JOB_ANALYTICS_CACHE_DIR")
+                          or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_paths(self, csv_path: str) -> Dict[str, str]:
+        key = hashlib.blake2b(os.path.abspath(csv_path).encode("utf-8"),
+                              digest_size=16).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        data_ext = ".parquet" if HAS_PYARROW else ".pkl"
+        return {"meta": base + ".json", "data": base + data_ext}
+
+    def fingerprint(self, csv_path: str, with_hash: bool = True) -> Dict[str, Any]:
+        """
+        Отпечаток исходного файла - بصمة الملف المصدر
+        """
+        stat = os.stat(csv_path)
+        result = {
+            "version": CACHE_VERSION,
+            "path": os.path.abspath(csv_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            # Относительные даты зависят от текущего дня
+            # التواريخ النسبية تعتمد على اليوم الحالي
+            "reference_date": date.today().isoformat(),
+        }
+        if with_hash:
+            result["content_hash"] = file_content_hash(csv_path)
+        return result
+
+    def _is_valid(self, meta: Dict[str, Any], csv_path: str) -> bool:
+        current = self.fingerprint(csv_path, with_hash=False)
+        for field in ("version", "path", "reference_date"):
+            if meta.get(field) != current[field]:
+                return False
+        if meta.get("size") != current["size"]:
+            return False
+        if meta.get("mtime_ns") == current["mtime_ns"]:
+            return True
+        # mtime изменился: сравнить содержимое تغير mtime: مقارنة المحتوى
+        return meta.get("content_hash") == file_content_hash(csv_path)
+
+    def load(self, csv_path: str) -> Optional[pd.DataFrame]:
+        """
+        Загрузка обработанных данных из кэша - تحميل البيانات من الذاكرة المؤقتة
+
+        Returns:
+            Optional[pd.DataFrame]: Данные или None при промахе - البيانات أو None
+        """
+        paths = self._entry_paths(csv_path)
+        try:
+            with open(paths["meta"], "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if not self._is_valid(meta, csv_path):
+                self.misses += 1
+                return None
+            if paths["data"].endswith(".parquet"):
+                df = pd.read_parquet(paths["data"])
+            else:
+                df = pd.read_pickle(paths["data"])
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        # mtime метаданных - время последнего использования для prune()
+        # mtime للبيانات الوصفية هو زمن آخر استخدام لـ prune()
+        try:
+            os.utime(paths["meta"])
+        except OSError:
+            pass
+        return df
+
+    def store(self, csv_path: str, df: pd.DataFrame,
+              fingerprint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Сохранение обработанных данных в кэш - حفظ البيانات في الذاكرة المؤقتة
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        paths = self._entry_paths(csv_path)
+        meta = fingerprint or self.fingerprint(csv_path)
+
+        # Атомарная запись через временный файл الكتابة الذرية عبر ملف مؤقت
+        fd, tmp_data = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            if paths["data"].endswith(".parquet"):
+                df.to_parquet(tmp_data, index=True)
+            else:
+                df.to_pickle(tmp_data)
+            os.replace(tmp_data, paths["data"])
+        finally:
+            if os.path.exists(tmp_data):
+                os.remove(tmp_data)
+
+        tmp_meta = paths["meta"] + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, paths["meta"])
+
+        # Данные того же файла в другом формате больше не нужны
+        # بيانات نفس الملف بتنسيق آخر لم تعد مطلوبة
+        base = os.path.splitext(paths["meta"])[0]
+        for ext in DATA_EXTENSIONS:
+            if base + ext != paths["data"] and os.path.exists(base + ext):
+                os.remove(base + ext)
+        self.prune()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(время использования, размер, база пути) записей - مدخلات الذاكرة"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            base = os.path.join(self.cache_dir, name[:-len(".json")])
+            try:
+                used = os.stat(base + ".json").st_mtime
+                size = sum(os.path.getsize(base + ext)
+                           for ext in (".json",) + DATA_EXTENSIONS
+                           if os.path.exists(base + ext))
+            except OSError:
+                continue
+            entries.append((used, size, base))
+        return entries
+
+    def _source_exists(self, base: str) -> bool:
+        try:
+            with open(base + ".json", "r", encoding="utf-8") as f:
+                return os.path.exists(json.load(f)["path"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    @staticmethod
+    def _remove_entry(base: str) -> None:
+        for ext in (".json",) + DATA_EXTENSIONS:
+            try:
+                os.remove(base + ext)
+            except FileNotFoundError:
+                pass
+
+    def prune(self) -> int:
+        """
+        Удаление записей удаленных файлов, записей старше max_age и самых
+        давно использованных записей сверх max_bytes
+        حذف مدخلات الملفات المحذوفة والمدخلات الأقدم من max_age والأقدم
+        استخداماً فوق max_bytes
+
+        Returns:
+            int: Сколько записей удалено - عدد المدخلات المحذوفة
+        """
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        removed = 0
+        expire_before = time.time() - self.max_age
+        kept = []
+        for used, size, base in self._entries():
+            if used < expire_before or not self._source_exists(base):
+                self._remove_entry(base)
+                removed += 1
+            else:
+                kept.append((used, size, base))
+
+        total = sum(size for _, size, _ in kept)
+        kept.sort()
+        # Самая свежая запись остается, даже если одна превышает лимит
+        # المدخل الأحدث يبقى حتى لو تجاوز الحد وحده
+        while total > self.max_bytes and len(kept) > 1:
+            _, size, base = kept.pop(0)
+            self._remove_entry(base)
+            total -= size
+            removed += 1
+        return removed
+
+    def get_or_process(self, csv_path: str,
+                       processor: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Вернуть данные из кэша или обработать файл и сохранить результат
+        إرجاع البيانات من الذاكرة المؤقتة أو معالجة الملف وحفظ النتيجة
+        """
+        cached = self.load(csv_path)
+        if cached is not None:
+            return cached
+
+        # Отпечаток снимается до обработки أخذ البصمة قبل المعالجة
+        fingerprint = self.fingerprint(csv_path)
+        df = processor(csv_path)
+        try:
+            self.store(csv_path, df, fingerprint)
+        except (OSError, ValueError, ImportError) as e:
+            # Кэш необязателен: ошибка записи не прерывает работу
+            print(f"Не удалось сохранить кэш: {e}")
+        return df
+
+    def clear(self) -> None:
+        """Очистка кэша - مسح الذاكرة المؤقتة"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((".json", ".parquet", ".pkl")):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+_default_cache: Optional[DatasetCache] = None
+
+
+def get_default_cache() -> DatasetCache:
+    """Общий кэш процесса - الذاكرة المؤقتة المشتركة للعملية"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DatasetCache()
+    return _default_cache
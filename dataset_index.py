@@ -0,0 +1,135 @@
+""" Индекс дат для быстрого поиска строк обработанного набора данных.
+ فهرس التواريخ للبحث السريع في صفوف البيانات المعالجة.
+
+Индекс строится один раз: словарь "нормализованная дата -> позиции строк"
+для точного поиска за O(1) и отсортированный массив дат для запросов по
+диапазону через бинарный поиск.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%d/%m/%Y'
+
+
+def normalize_date_key(value: Any, date_format: str = DATE_FORMAT) -> Any:
+    """
+    Нормализация значения даты в ключ индекса - توحيد قيمة التاريخ كمفتاح للفهرس
+
+    Даты превращаются в pd.Timestamp (полночь), остальные значения - в строку
+    в нижнем регистре ("not date", "no date").
+
+    Args:
+        value: Дата, строка или Timestamp - تاريخ أو نص
+        date_format (str): Формат строковых дат - صيغة التواريخ النصية
+
+    Returns:
+        pd.Timestamp или str - مفتاح الفهرس
+    """
+    if isinstance(value, (datetime, date, np.datetime64)):
+        return pd.Timestamp(value).normalize()
+    text = str(value).strip()
+    try:
+        return pd.Timestamp(datetime.strptime(text, date_format))
+    except ValueError:
+        return text.lower()
+
+
+class DatasetIndex:
+    """
+    Индекс строк по дате - فهرس الصفوف حسب التاريخ
+    """
+
+    def __init__(self, df: pd.DataFrame, column: str = "date",
+                 date_format: str = DATE_FORMAT):
+        """
+        Args:
+            df (pd.DataFrame): Обработанные данные - البيانات المعالجة
+            column (str): Столбец даты - عمود التاريخ
+            date_format (str): Формат строковых дат - صيغة التواريخ النصية
+        """
+        if column not in df.columns:
+            # عمود التاريخ غير موجود
+            raise ValueError(f"Столбец '{column}' отсутствует в данных")
+
+        self.df = df
+        self.column = column
+        self.date_format = date_format
+
+        # Разбор выполняется только для уникальных значений столбца
+        # يتم التحليل للقيم الفريدة في العمود فقط
+        codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+        unique_keys = [normalize_date_key(value, date_format) for value in uniques]
+
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self._positions: Dict[Any, np.ndarray] = {}
+        for code, key in enumerate(unique_keys):
+            positions = order[bounds[code]:bounds[code + 1]]
+            if key in self._positions:
+                # Разные записи одной даты ("1/1/2024" и "01/01/2024")
+                # كتابات مختلفة لنفس التاريخ
+                positions = np.sort(np.concatenate([self._positions[key], positions]))
+            self._positions[key] = positions
+
+        # Отсортированный массив дат для запросов по диапазону
+        # مصفوفة تواريخ مرتبة لاستعلامات النطاق
+        unique_dates = np.array(
+            [key.to_datetime64() if isinstance(key, pd.Timestamp) else np.datetime64('NaT')
+             for key in unique_keys] + [np.datetime64('NaT')],
+            dtype='datetime64[ns]')
+        dates = unique_dates[codes]
+        dated_positions = np.flatnonzero(~np.isnat(dates))
+        date_order = np.argsort(dates[dated_positions], kind='stable')
+        self._sorted_dates = dates[dated_positions][date_order]
+        self._sorted_positions = dated_positions[date_order]
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def __contains__(self, value: Any) -> bool:
+        return len(self.lookup(value)) > 0
+
+    def lookup(self, value: Any) -> np.ndarray:
+        """
+        Позиции строк для даты - مواقع الصفوف لتاريخ معين
+
+        Returns:
+            np.ndarray: Позиции строк (iloc) по возрастанию - مواقع الصفوف
+        """
+        key = normalize_date_key(value, self.date_format)
+        return self._positions.get(key, np.empty(0, dtype=np.intp))
+
+    def select(self, value: Any) -> Optional[pd.DataFrame]:
+        """
+        Строки для даты или None - الصفوف المطابقة للتاريخ أو None
+        """
+        positions = self.lookup(value)
+        if len(positions) == 0:
+            return None
+        return self.df.iloc[positions]
+
+    def between(self, start: Any, end: Any) -> pd.DataFrame:
+        """
+        Строки с датами в диапазоне [start, end] - الصفوف بين تاريخين (شامل)
+
+        Args:
+            start: Начальная дата - تاريخ البداية
+            end: Конечная дата - تاريخ النهاية
+
+        Returns:
+            pd.DataFrame: Строки в исходном порядке - الصفوف بالترتيب الأصلي
+        """
+        start_key = normalize_date_key(start, self.date_format)
+        end_key = normalize_date_key(end, self.date_format)
+        if not isinstance(start_key, pd.Timestamp) or not isinstance(end_key, pd.Timestamp):
+            # تاريخ غير صالح
+            raise ValueError(f"Неверный диапазон дат: {start} - {end}")
+
+        left = np.searchsorted(self._sorted_dates, start_key.to_datetime64(), side='left')
+        right = np.searchsorted(self._sorted_dates, end_key.to_datetime64(), side='right')
+        positions = np.sort(self._sorted_positions[left:right])
+        return self.df.iloc[positions]
@@ -0,0 +1,197 @@
+""" Поиск одинаковых файлов в наборе данных. البحث عن الملفات المتطابقة في مجموعة البيانات.
+
+Кандидаты отсеиваются от дешевого к дорогому: сначала размер (только
+метаданные обхода), затем частичный хеш первых PARTIAL_HASH_SIZE байт и
+только потом полный хеш содержимого. Большинство файлов отсеивается на
+первых двух шагах, не читая их целиком.
+
+يُصفّى المرشحون من الأرخص إلى الأغلى: الحجم أولاً، ثم تجزئة جزئية لأول
+PARTIAL_HASH_SIZE بايت، وأخيراً التجزئة الكاملة للمحتوى.
+"""
+
+import csv
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from file_hashing import FileHasher, HashCache
+from file_operations import DEFAULT_SCAN_WORKERS, OperationCancelled, iter_file_batches
+
+# Частичный хеш читает столько байт с начала файла
+# التجزئة الجزئية تقرأ هذا العدد من البايتات من بداية الملف
+PARTIAL_HASH_SIZE = 64 * 1024
+
+# أعمدة تقرير التكرار - Столбцы отчета о дубликатах
+DUPLICATE_REPORT_HEADER = ["group", "hash", "size_bytes", "path", "original"]
+
+
+class DuplicateGroup(NamedTuple):
+    """
+    Группа одинаковых файлов - مجموعة ملفات متطابقة
+    """
+    digest: str
+    size: int
+    # Отсортированы; первый остается оригиналом - مرتبة؛ الأول يبقى الأصل
+    paths: List[str]
+
+    @property
+    def wasted_bytes(self) -> int:
+        return self.size * (len(self.paths) - 1)
+
+
+class DuplicateReport(NamedTuple):
+    """
+    Итог поиска дубликатов - نتيجة البحث عن التكرار
+    """
+    groups: List[DuplicateGroup]
+    files_scanned: int
+    bytes_scanned: int
+    # Сколько файлов дошло до частичного и полного хеширования
+    # عدد الملفات التي وصلت إلى التجزئة الجزئية والكاملة
+    partial_hashed: int
+    full_hashed: int
+
+    @property
+    def duplicate_files(self) -> int:
+        return sum(len(group.paths) - 1 for group in self.groups)
+
+    @property
+    def wasted_bytes(self) -> int:
+        return sum(group.wasted_bytes for group in self.groups)
+
+    def duplicate_map(self) -> Dict[str, str]:
+        """Дубликат -> оригинал - نسخة مكررة -> الأصل"""
+        return {path: group.paths[0] for group in self.groups for path in group.paths[1:]}
+
+    def summary(self) -> str:
+        """Строка итогов - سطر الملخص"""
+        return (f"{len(self.groups)} групп, {self.duplicate_files} дубликатов, "
+                f"{self.wasted_bytes / 2**20:.1f} МБ можно освободить "
+                f"(просмотрено {self.files_scanned} файлов; частичный хеш: "
+                f"{self.partial_hashed}, полный: {self.full_hashed})")
+
+
+def _check_cancel(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise OperationCancelled()
+
+
+def _regroup(hashed, sizes: Dict[str, int]) -> Dict[tuple, List[str]]:
+    """
+    Группы по (размер, хеш), файлы, ставшие недоступными, отбрасываются
+    المجموعات حسب (الحجم، التجزئة)، الملفات غير المتاحة تُستبعد
+    """
+    groups: Dict[tuple, List[str]] = {}
+    for paths, digests in hashed:
+        for path, digest in zip(paths, digests):
+            if digest:
+                groups.setdefault((sizes[path], digest), []).append(path)
+    return groups
+
+
+def find_duplicates(source_folder: str, workers: int = DEFAULT_SCAN_WORKERS,
+                    hash_workers: Optional[int] = None,
+                    partial_size: int = PARTIAL_HASH_SIZE,
+                    cache_path: Optional[str] = None,
+                    cancel_event: Optional[threading.Event] = None) -> DuplicateReport:
+    """
+    Поиск файлов с одинаковым содержимым - البحث عن ملفات بنفس المحتوى
+
+    Args:
+        source_folder (str): Папка набора данных - مجلد مجموعة البيانات
+        workers (int): Потоков обхода папок - خيوط فحص المجلدات
+        hash_workers (int): Процессов хеширования - عمليات التجزئة
+        partial_size (int): Байт для частичного хеша - بايتات التجزئة الجزئية
+        cache_path (str): Кэш полных хешей (например, файл .hashes.json
+                          аннотации) - ذاكرة التجزئات الكاملة (مثل ملف annotation)
+        cancel_event (threading.Event): Событие отмены - حدث الإلغاء
+
+    Raises:
+        FileNotFoundError: Исходной папки нет - المجلد المصدر غير موجود
+        OperationCancelled: Событие отмены установлено - تم ضبط حدث الإلغاء
+
+    Returns:
+        DuplicateReport: Группы дубликатов и статистика - مجموعات التكرار والإحصاءات
+    """
+    if not os.path.isdir(source_folder):
+        raise FileNotFoundError(f"Исходная папка не найдена: {source_folder}")
+
+    # 1. Размер: файлы уникального размера не могут иметь дубликатов.
+    # Пустые файлы не учитываются: ссылка на них ничего не экономит
+    # الحجم: الملفات ذات الحجم الفريد لا يمكن أن تتكرر. الملفات الفارغة لا تُحسب
+    by_size: Dict[int, List[str]] = {}
+    files_scanned = bytes_scanned = 0
+    for rows in iter_file_batches(source_folder, workers):
+        _check_cancel(cancel_event)
+        for _, path, size, _ in rows:
+            files_scanned += 1
+            bytes_scanned += size
+            if size:
+                by_size.setdefault(size, []).append(path)
+    sizes = {path: size for size, paths in by_size.items() if len(paths) > 1
+             for path in paths}
+    candidates = [paths for paths in by_size.values() if len(paths) > 1]
+
+    # 2. Частичный хеш начала файла - التجزئة الجزئية لبداية الملف
+    hasher = FileHasher(hash_workers, limit=partial_size)
+    try:
+        hashed = []
+        for paths, digests in hasher.iter_hashed(candidates, lambda paths: paths):
+            _check_cancel(cancel_event)
+            hashed.append((paths, digests))
+    finally:
+        hasher.close()
+    partial_hashed = hasher.hashed
+    by_partial = _regroup(hashed, sizes)
+
+    # 3. Полный хеш только для файлов длиннее partial_size; у коротких
+    # частичный хеш уже охватывает весь файл
+    # التجزئة الكاملة فقط للملفات الأطول من partial_size
+    groups: List[DuplicateGroup] = []
+    full_candidates = []
+    for (size, digest), paths in by_partial.items():
+        if len(paths) < 2:
+            continue
+        if size <= partial_size:
+            groups.append(DuplicateGroup(digest, size, sorted(paths)))
+        else:
+            full_candidates.append(paths)
+
+    full_hashed = 0
+    if full_candidates:
+        hasher = FileHasher(hash_workers, HashCache(cache_path))
+        try:
+            hashed = []
+            for paths, digests in hasher.iter_hashed(full_candidates, lambda paths: paths):
+                _check_cancel(cancel_event)
+                hashed.append((paths, digests))
+        finally:
+            hasher.close()
+        full_hashed = hasher.hashed + hasher.cache_hits
+        if cache_path is not None:
+            try:
+                hasher.cache.save()
+            except OSError as e:
+                print(f"Предупреждение: не удалось сохранить {cache_path}: {e}")
+        for (size, digest), paths in _regroup(hashed, sizes).items():
+            if len(paths) > 1:
+                groups.append(DuplicateGroup(digest, size, sorted(paths)))
+
+    groups.sort(key=lambda group: group.paths[0])
+    return DuplicateReport(groups, files_scanned, bytes_scanned, partial_hashed, full_hashed)
+
+
+def write_duplicate_report(report: DuplicateReport, save_path: str) -> None:
+    """
+    Запись отчета о дубликатах в CSV - كتابة تقرير التكرار إلى CSV
+
+    Одна строка на файл группы; original - путь сохраняемого файла.
+    سطر لكل ملف في المجموعة؛ original هو مسار الملف الذي يبقى.
+    """
+    with open(save_path + ".tmp", "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(DUPLICATE_REPORT_HEADER)
+        for number, group in enumerate(report.groups, 1):
+            for path in group.paths:
+                writer.writerow([number, group.digest, group.size, path, group.paths[0]])
+    os.replace(save_path + ".tmp", save_path)
@@ -0,0 +1,310 @@
+""" Хеши содержимого файлов для аннотации. تجزئة محتوى الملفات لملف annotation.
+
+Файлы хешируются BLAKE2b в пуле процессов (хеширование занимает процессор,
+поэтому потоки упираются в GIL при мелких файлах); большие файлы читаются
+через mmap без копирования в память процесса. Готовые хеши хранятся в
+HashCache по ключу (устройство, inode, размер, время изменения), поэтому
+повторная аннотация хеширует только измененные файлы.
+
+تُجزأ الملفات بخوارزمية BLAKE2b في مجموعة عمليات، والملفات الكبيرة تُقرأ عبر
+mmap. التجزئات الجاهزة تُحفظ في HashCache حسب (الجهاز، inode، الحجم، زمن
+التعديل) فلا يُعاد حساب إلا الملفات المعدلة.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+HASH_ALGORITHM = "blake2b"
+# 128 бит достаточно для поиска дубликатов и проверки целостности
+# 128 بت كافية لكشف التكرار والتحقق من السلامة
+DIGEST_SIZE = 16
+# Файлы от этого размера читаются через mmap - الملفات من هذا الحجم تُقرأ عبر mmap
+MMAP_THRESHOLD = 1024 * 1024
+# Размер блока для чтения мелких файлов - حجم كتلة قراءة الملفات الصغيرة
+READ_CHUNK = 1024 * 1024
+
+DEFAULT_HASH_WORKERS = os.cpu_count() or 1
+# Одно задание процесса: до стольких файлов или байт
+# مهمة واحدة للعملية: حتى هذا العدد من الملفات أو البايتات
+HASH_JOB_FILES = 64
+HASH_JOB_BYTES = 64 * 1024 * 1024
+# Незавершенное задание отправляется, если столько элементов ждут его
+# المهمة غير المكتملة تُرسل إذا انتظرها هذا العدد من العناصر
+MAX_PENDING_ITEMS = 256
+
+# Файлы, измененные менее чем за это время до хеширования, не кэшируются:
+# правка в тот же тик времени ФС не изменила бы ключ
+# الملفات المعدلة قبل التجزئة بأقل من هذا لا تُخزن: تعديل في نفس دقة زمن
+# نظام الملفات لن يغير المفتاح
+RACY_WINDOW_NS = 2 * 10**9
+
+HASH_CACHE_VERSION = 1
+
+
+def hash_file(path: str, limit: Optional[int] = None) -> str:
+    """
+    Хеш содержимого файла - تجزئة محتوى الملف
+
+    Args:
+        path (str): Путь к файлу - مسار الملف
+        limit (int): Хешировать только первые limit байт (частичный хеш);
+                     для файла не длиннее limit совпадает с полным
+                     تجزئة أول limit بايت فقط؛ للملف الأقصر تساوي التجزئة الكاملة
+
+    Returns:
+        str: Шестнадцатеричный BLAKE2b - BLAKE2b بالنظام الست عشري
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if limit is None and size >= MMAP_THRESHOLD:
+            # Страницы файла хешируются прямо из кэша страниц ядра
+            # صفحات الملف تُجزأ مباشرة من ذاكرة صفحات النواة
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            remaining = limit
+            buffer = bytearray(READ_CHUNK if limit is None else min(READ_CHUNK, limit))
+            view = memoryview(buffer)
+            while remaining is None or remaining > 0:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                if remaining is not None:
+                    read = min(read, remaining)
+                    remaining -= read
+                digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def cache_key(stat: os.stat_result) -> str:
+    """Ключ кэша хешей - مفتاح ذاكرة التجزئات"""
+    return f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _hash_job(items: List[Tuple[str, str]],
+              limit: Optional[int] = None) -> List[Tuple[str, bool]]:
+    """
+    Выполняется в процессе пула: хеширует файлы задания
+    تُنفذ في عملية المجموعة: تجزئة ملفات المهمة
+
+    Returns:
+        List: (хеш или "" если файл исчез, можно ли кэшировать)
+              (التجزئة أو "" إذا اختفى الملف، هل يمكن تخزينها)
+    """
+    results = []
+    racy_after_ns = time.time_ns() - RACY_WINDOW_NS
+    for path, key in items:
+        try:
+            digest = hash_file(path, limit)
+            stat = os.stat(path)
+        except OSError:
+            results.append(("", False))
+            continue
+        # Файл не менялся во время чтения и не слишком свежий
+        # الملف لم يتغير أثناء القراءة وليس حديثاً جداً
+        cacheable = (limit is None and cache_key(stat) == key
+                     and stat.st_mtime_ns < racy_after_ns)
+        results.append((digest, cacheable))
+    return results
+
+
+class HashCache:
+    """
+    Кэш хешей по (устройство, inode, размер, время изменения)
+    ذاكرة التجزئات حسب (الجهاز، inode، الحجم، زمن التعديل)
+
+    Сохраняются только записи, использованные в текущем запуске, так что
+    удаленные файлы не накапливаются.
+    تُحفظ فقط المدخلات المستخدمة في التشغيل الحالي فلا تتراكم الملفات المحذوفة.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, str] = {}
+        self.used: Dict[str, str] = {}
+        if path is not None:
+            self.entries = self._load(path)
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, str]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (data.get("version") == HASH_CACHE_VERSION
+                    and data.get("algorithm") == HASH_ALGORITHM
+                    and data.get("digest_size") == DIGEST_SIZE):
+                return dict(data["hashes"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return {}
+
+    def get(self, key: str) -> Optional[str]:
+        digest = self.entries.get(key)
+        if digest is not None:
+            self.used[key] = digest
+        return digest
+
+    def put(self, key: str, digest: str) -> None:
+        self.used[key] = digest
+
+    def save(self) -> None:
+        """Атомарная запись кэша - كتابة الذاكرة بشكل ذري"""
+        if self.path is None:
+            return
+        data = {"version": HASH_CACHE_VERSION, "algorithm": HASH_ALGORITHM,
+                "digest_size": DIGEST_SIZE, "hashes": self.used}
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(self.path + ".tmp", self.path)
+
+
+class _HashJob:
+    """Задание для процесса пула - مهمة لعملية المجموعة"""
+
+    def __init__(self):
+        # (путь, ключ, список хешей элемента, индекс) - (المسار، المفتاح، القائمة، الفهرس)
+        self.slots: List[Tuple[str, str, List[Optional[str]], int]] = []
+        self.bytes = 0
+        self.future = None
+        self.results: Optional[List[Tuple[str, bool]]] = None
+        self.collected = False
+
+    def done(self) -> bool:
+        return (self.results is not None
+                or (self.future is not None and self.future.done()))
+
+
+class FileHasher:
+    """
+    Параллельное хеширование с сохранением порядка элементов
+    تجزئة متوازية مع الحفاظ على ترتيب العناصر
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache: Optional[HashCache] = None,
+                 limit: Optional[int] = None):
+        """
+        Args:
+            workers (int): Процессов хеширования (1 - в текущем процессе)
+                           عدد عمليات التجزئة (1 - في العملية الحالية)
+            cache (HashCache): Кэш хешей - ذاكرة التجزئات
+            limit (int): Частичные хеши первых limit байт (кэш не используется)
+                         تجزئات جزئية لأول limit بايت (بدون ذاكرة التجزئات)
+        """
+        self.workers = max(1, workers or DEFAULT_HASH_WORKERS)
+        self.cache = cache if cache is not None else HashCache()
+        self.limit = limit
+        self.hashed = 0
+        self.cache_hits = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Пул создается только когда есть что хешировать
+        # المجموعة تُنشأ فقط عند وجود ما يُجزأ
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        return self._executor
+
+    def _submit(self, job: _HashJob) -> None:
+        items = [(path, key) for path, key, _, _ in job.slots]
+        if self.workers == 1:
+            job.results = _hash_job(items, self.limit)
+        else:
+            job.future = self._get_executor().submit(_hash_job, items, self.limit)
+
+    def _collect(self, job: _HashJob) -> None:
+        if job.collected:
+            return
+        results = job.future.result() if job.future is not None else job.results
+        for (_, key, digests, index), (digest, cacheable) in zip(job.slots, results):
+            digests[index] = digest
+            if cacheable:
+                self.cache.put(key, digest)
+        self.hashed += len(job.slots)
+        job.collected = True
+
+    def iter_hashed(self, items: Iterable, get_paths: Callable[[object], List[str]]
+                    ) -> Iterator[Tuple[object, List[str]]]:
+        """
+        Хеши файлов каждого элемента в исходном порядке
+        تجزئات ملفات كل عنصر بالترتيب الأصلي
+
+        Args:
+            items (Iterable): Элементы (например, DirScan) - العناصر
+            get_paths (Callable): Пути файлов элемента - مسارات ملفات العنصر
+
+        Yields:
+            Tuple: (элемент, хеши его файлов; "" - файл недоступен)
+                   (العنصر، تجزئات ملفاته؛ "" - الملف غير متاح)
+        """
+        # Элементы ждут своих заданий; задания собирают файлы из нескольких
+        # элементов, чтобы мелкие папки не порождали мелкие задания
+        # العناصر تنتظر مهامها؛ المهمة تجمع ملفات عدة عناصر
+        pending = deque()
+        submitted = deque()
+        job = _HashJob()
+        max_in_flight = self.workers * 2
+
+        try:
+            for item in items:
+                digests: List[Optional[str]] = []
+                jobs = []
+                for path in get_paths(item):
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        digests.append("")
+                        continue
+                    key = cache_key(stat)
+                    digest = self.cache.get(key) if self.limit is None else None
+                    digests.append(digest)
+                    if digest is not None:
+                        self.cache_hits += 1
+                        continue
+                    job.slots.append((path, key, digests, len(digests) - 1))
+                    job.bytes += stat.st_size
+                    if not jobs or jobs[-1] is not job:
+                        jobs.append(job)
+                    if len(job.slots) >= HASH_JOB_FILES or job.bytes >= HASH_JOB_BYTES:
+                        self._submit(job)
+                        submitted.append(job)
+                        job = _HashJob()
+                pending.append((item, digests, jobs))
+                if job.slots and len(pending) > MAX_PENDING_ITEMS:
+                    self._submit(job)
+                    submitted.append(job)
+                    job = _HashJob()
+
+                # Не больше max_in_flight заданий в очереди пула
+                # لا أكثر من max_in_flight مهمة في طابور المجموعة
+                while submitted and submitted[0].collected:
+                    submitted.popleft()
+                while len(submitted) > max_in_flight:
+                    self._collect(submitted.popleft())
+                while pending and all(j.collected or j.done() for j in pending[0][2]):
+                    entry = pending.popleft()
+                    for j in entry[2]:
+                        self._collect(j)
+                    yield entry[0], entry[1]
+
+            if job.slots:
+                self._submit(job)
+            while pending:
+                item, digests, jobs = pending.popleft()
+                for j in jobs:
+                    self._collect(j)
+                yield item, digests
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Остановка пула процессов - إيقاف مجموعة العمليات"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,597 @@
+""" Параллельное копирование деревьев файлов со статистикой. النسخ المتوازي
+ لشجرة الملفات مع الإحصاءات.
+
+walk_directories обходит дерево через os.scandir, обрабатывая вложенные папки
+в пуле потоков; этот обход используют и копирование, и аннотация.
+
+copy_tree сначала обходит исходную папку, затем
+одним проходом создает все целевые папки и копирует файлы в пуле потоков.
+На Linux данные копируются внутри ядра через os.copy_file_range (на btrfs/XFS
+и NFS 4.2 это может быть клонирование без чтения), с откатом на
+shutil.copyfile, который использует sendfile. Ход копирования (файлы и байты,
+скорость) передается в callback, операцию можно отменить через threading.Event.
+
+Стратегии: copy (полная копия), hardlink (жесткая ссылка, цель и источник -
+один и тот же файл) и reflink (клонирование FICLONE на btrfs/XFS, иначе
+копия). skip_unchanged, как rsync, пропускает файлы, у которых в цели уже
+совпадают размер и время изменения, поэтому повторный запуск после сбоя
+копирует только оставшиеся файлы.
+
+duplicates (см. dedup.find_duplicates) задает одинаковые файлы: в цель
+копируется только оригинал, а дубликаты становятся жесткими ссылками на
+его копию.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# عدد خيوط فحص المجلدات (العمل مقيد بالإدخال/الإخراج وليس بالمعالج)
+# Потоков обхода папок (работа ограничена вводом-выводом, а не процессором)
+DEFAULT_SCAN_WORKERS = 8
+
+# Копирование ограничено диском и сетью, а не процессором
+# النسخ مقيد بالقرص والشبكة وليس بالمعالج
+DEFAULT_COPY_WORKERS = 8
+# Мин. интервал между вызовами progress (сек) أقل فاصل بين استدعاءات progress
+PROGRESS_INTERVAL = 0.2
+# Размер одного вызова copy_file_range حجم استدعاء copy_file_range الواحد
+COPY_CHUNK = 64 * 1024 * 1024
+
+# ioctl клонирования файла в Linux (linux/fs.h) - استدعاء استنساخ الملف في Linux
+FICLONE = 0x40049409
+
+# Ошибки, при которых copy_file_range или FICLONE недоступны для этой пары файлов
+# أخطاء تعني أن copy_file_range أو FICLONE غير متاح لهذين الملفين
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF,
+                    errno.EOPNOTSUPP, errno.ETXTBSY, errno.EPERM, errno.ENOTTY}
+# Ошибки, при которых жесткая ссылка невозможна - أخطاء تمنع الرابط الصلب
+_LINK_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP}
+
+# Стратегии копирования - استراتيجيات النسخ
+COPY = "copy"
+HARDLINK = "hardlink"
+REFLINK = "reflink"
+COPY_STRATEGIES = (COPY, HARDLINK, REFLINK)
+
+# Результаты обработки файла - نتائج معالجة الملف
+COPIED = "copied"
+LINKED = "linked"
+CLONED = "cloned"
+SKIPPED = "skipped"
+# Ссылка или клон невозможны, файл скопирован - تعذر الرابط أو الاستنساخ فنُسخ الملف
+FELL_BACK = "fell_back"
+# Дубликат связан с копией оригинала в цели - النسخة المكررة مرتبطة بنسخة الأصل في الهدف
+DEDUPLICATED = "deduplicated"
+
+# (источник, цель, размер, время изменения в нс) - (المصدر، الهدف، الحجم، زمن التعديل)
+CopyTask = Tuple[str, str, int, Optional[int]]
+
+# (filename, path, size_bytes, mtime_ns)
+FileRow = Tuple[str, str, int, Optional[int]]
+
+
+class DirScan(NamedTuple):
+    """
+    نتيجة فحص مجلد واحد - Результат обхода одной папки
+    """
+    folder: str
+    mtime_ns: Optional[int]
+    rows: List[FileRow]
+    subdirs: List[str]
+    # القائمة مأخوذة من الملف السابق - список взят из прежнего манифеста
+    reused: bool = False
+
+
+def scan_directory(folder: str) -> DirScan:
+    """
+    فحص مجلد واحد عبر os.scandir - Обход одной папки через os.scandir
+    """
+    rows: List[FileRow] = []
+    subdirs: List[str] = []
+    try:
+        # زمن التعديل قبل القراءة: أي تغيير أثناء الفحص يظهر في التشغيل التالي
+        # Время изменения до чтения: правка во время обхода видна в следующем запуске
+        mtime_ns = os.stat(folder).st_mtime_ns
+        with os.scandir(folder) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError as e:
+        print(f"تحذير: لا يمكن قراءة المجلد {folder}: {e}")
+        return DirScan(folder, None, rows, subdirs)
+
+    for entry in entries:
+        try:
+            # مثل os.walk: الروابط الرمزية للمجلدات لا تُفحص ولا تُعد ملفات
+            # Как os.walk: ссылки на папки не обходятся и не считаются файлами
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+                continue
+            stat = entry.stat()
+            rows.append((entry.name, entry.path, stat.st_size, stat.st_mtime_ns))
+        except OSError as e:
+            print(f"تحذير: لا يمكن الوصول إلى الملف {entry.path}: {e}")
+    return DirScan(folder, mtime_ns, rows, subdirs)
+
+
+def walk_directories(source_folder: str, workers: int,
+                    scan: Callable[[str], DirScan] = scan_directory) -> Iterator[DirScan]:
+    """
+    فحص شجرة المجلدات، المجلدات الفرعية بالتوازي فور اكتشافها
+    Обход дерева папок, вложенные папки параллельно по мере обнаружения
+    """
+    if workers <= 1:
+        queue = deque([source_folder])
+        while queue:
+            result = scan(queue.popleft())
+            queue.extend(result.subdirs)
+            yield result
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(scan, source_folder)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    pending.update(pool.submit(scan, subdir) for subdir in result.subdirs)
+                    yield result
+        finally:
+            # Обход прерван (отмена, ошибка): не ждать папок из очереди
+            # توقف الفحص (إلغاء، خطأ): عدم انتظار المجلدات في الطابور
+            for future in pending:
+                future.cancel()
+
+
+def iter_file_batches(source_folder: str,
+                      workers: int = DEFAULT_SCAN_WORKERS) -> Iterator[List[FileRow]]:
+    """
+    ملفات المجلد على دفعات، مجلد واحد لكل دفعة
+    Файлы папки пакетами, по одной папке на пакет
+
+    المجلدات الفرعية تُفحص بالتوازي فور اكتشافها، لذا ترتيب المجلدات غير ثابت؛
+    الملفات داخل كل مجلد مرتبة بالاسم.
+    Вложенные папки обходятся параллельно по мере обнаружения, поэтому порядок
+    папок не фиксирован; файлы внутри папки отсортированы по имени.
+
+    Args:
+        source_folder (str): مسار مجلد المصدر - Путь к исходной папке
+        workers (int): عدد الخيوط (1 = بدون توازٍ) - Число потоков (1 = без параллелизма)
+    """
+    for result in walk_directories(source_folder, workers):
+        if result.rows:
+            yield result.rows
+
+
+class OperationCancelled(Exception):
+    """
+    Операция отменена пользователем - تم إلغاء العملية من قبل المستخدم
+    """
+
+    def __init__(self, stats: Optional["CopyStats"] = None):
+        super().__init__("Операция отменена")
+        self.stats = stats
+
+
+class CopyProgress(NamedTuple):
+    """
+    Снимок хода копирования - لقطة لتقدم النسخ
+    """
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    elapsed: float
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class CopyStats:
+    """
+    Счетчики копирования (потокобезопасные) - عدادات النسخ
+    """
+
+    def __init__(self, files_total: int = 0, bytes_total: int = 0,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.files_done = 0
+        self.bytes_done = 0
+        self.outcomes: Dict[str, int] = {}
+        self._clock = clock
+        self._started = clock()
+        self._finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, size: int, outcome: str = COPIED) -> None:
+        with self._lock:
+            self.files_done += 1
+            self.bytes_done += size
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def finish(self) -> None:
+        self._finished = self._clock()
+
+    def resume(self) -> None:
+        """Продолжение после finish (следующий этап) - المتابعة بعد finish"""
+        self._finished = None
+
+    def snapshot(self) -> CopyProgress:
+        """Текущее состояние - الحالة الحالية"""
+        end = self._finished if self._finished is not None else self._clock()
+        with self._lock:
+            return CopyProgress(self.files_done, self.files_total, self.bytes_done,
+                                self.bytes_total, end - self._started)
+
+    def summary(self) -> str:
+        """Строка итогов со скоростью - سطر الملخص مع السرعة"""
+        progress = self.snapshot()
+        with self._lock:
+            outcomes = ", ".join(f"{key}={value}" for key, value in sorted(self.outcomes.items()))
+        return (f"{progress.files_done} файлов, {progress.bytes_done / 2**20:.1f} МБ "
+                f"за {progress.elapsed:.2f} с: {progress.files_per_second:.0f} файлов/с, "
+                f"{progress.bytes_per_second / 2**20:.1f} МБ/с ({outcomes})")
+
+
+def _temp_path(dst: str, kind: str) -> str:
+    """
+    Временное имя рядом с целью; остаток прерванного запуска удаляется
+    اسم مؤقت بجوار الهدف؛ بقايا التشغيل المقطوع تُحذف
+    """
+    tmp_path = f"{dst}.{threading.get_ident()}.{kind}"
+    try:
+        os.unlink(tmp_path)
+    except FileNotFoundError:
+        pass
+    return tmp_path
+
+
+def _copy_file_range(src: str, dst: str) -> bool:
+    """
+    Копирование внутри ядра; False, если ФС его не поддерживает
+    النسخ داخل النواة؛ False إذا كان نظام الملفات لا يدعمه
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        copied = 0
+        while True:
+            try:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_CHUNK)
+            except OSError as e:
+                # Откат возможен только до первого скопированного байта
+                # الرجوع ممكن فقط قبل نسخ أول بايت
+                if copied == 0 and e.errno in _FALLBACK_ERRNOS:
+                    return False
+                raise
+            if n == 0:
+                return True
+            copied += n
+
+
+def fast_copy(src: str, dst: str) -> str:
+    """
+    Копирование файла с метаданными (как shutil.copy2) самым быстрым способом
+    نسخ ملف مع البيانات الوصفية (مثل shutil.copy2) بأسرع طريقة متاحة
+
+    Копия пишется во временный файл и заменяет цель: цель может быть жесткой
+    ссылкой на источник (прежний запуск hardlink или dedup), и запись в нее
+    поверх испортила бы источник.
+    النسخة تُكتب في ملف مؤقت ثم تستبدل الهدف: قد يكون الهدف رابطاً صلباً
+    للمصدر، والكتابة فوقه كانت ستفسد المصدر.
+    """
+    tmp_path = _temp_path(dst, "copy")
+    try:
+        if not _copy_file_range(src, tmp_path):
+            # shutil.copyfile на Linux использует sendfile
+            # shutil.copyfile يستخدم sendfile على Linux
+            shutil.copyfile(src, tmp_path)
+        # Время изменения ставится до замены: оборванная копия не выглядит целой
+        # زمن التعديل يُضبط قبل الاستبدال: النسخة المنقطعة لا تبدو كاملة
+        shutil.copystat(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return COPIED
+
+
+def hardlink_file(src: str, dst: str) -> str:
+    """
+    Жесткая ссылка вместо копии (копия, если ссылка невозможна)
+    رابط صلب بدلاً من النسخ (نسخ إذا تعذر الرابط)
+
+    Цель и источник становятся одним файлом: изменение одного меняет другой.
+    الهدف والمصدر يصبحان ملفاً واحداً: تعديل أحدهما يغير الآخر.
+    """
+    try:
+        if os.path.samestat(os.stat(src), os.stat(dst)):
+            return LINKED
+    except OSError:
+        pass
+    # Ссылка под временным именем и замена: существующая цель не мешает
+    # رابط باسم مؤقت ثم استبدال: الهدف الموجود لا يعيق العملية
+    tmp_path = _temp_path(dst, "link")
+    try:
+        os.link(src, tmp_path)
+    except OSError as e:
+        if e.errno not in _LINK_FALLBACK_ERRNOS:
+            raise
+        fast_copy(src, dst)
+        return FELL_BACK
+    try:
+        os.replace(tmp_path, dst)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
+    return LINKED
+
+
+def reflink_file(src: str, dst: str) -> str:
+    """
+    Клонирование файла (общие блоки до первой записи), иначе копия
+    استنساخ الملف (كتل مشتركة حتى أول كتابة)، وإلا النسخ
+
+    Клон создается под временным именем и заменяет цель, как в fast_copy:
+    цель может быть жесткой ссылкой на источник.
+    الاستنساخ يُنشأ باسم مؤقت ثم يستبدل الهدف كما في fast_copy.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        fast_copy(src, dst)
+        return FELL_BACK
+    tmp_path = _temp_path(dst, "clone")
+    try:
+        with open(src, "rb") as fsrc, open(tmp_path, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                cloned = True
+            except OSError as e:
+                if e.errno not in _FALLBACK_ERRNOS:
+                    raise
+                cloned = False
+        if cloned:
+            shutil.copystat(src, tmp_path)
+            os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    if not cloned:
+        fast_copy(src, dst)
+        return FELL_BACK
+    return CLONED
+
+
+_COPY_FUNCTIONS: Dict[str, Callable[[str, str], str]] = {
+    COPY: fast_copy,
+    HARDLINK: hardlink_file,
+    REFLINK: reflink_file,
+}
+
+
+def get_copy_function(strategy: str) -> Callable[[str, str], str]:
+    """
+    Функция копирования для стратегии - دالة النسخ للاستراتيجية
+
+    Raises:
+        ValueError: Неизвестная стратегия - استراتيجية غير معروفة
+    """
+    try:
+        return _COPY_FUNCTIONS[strategy]
+    except KeyError:
+        raise ValueError(f"Неизвестная стратегия копирования: {strategy}. "
+                         f"Доступны: {', '.join(COPY_STRATEGIES)}") from None
+
+
+def is_unchanged(task: CopyTask) -> bool:
+    """
+    Цель уже совпадает с источником по размеру и времени изменения
+    الهدف يطابق المصدر في الحجم وزمن التعديل
+
+    Время сравнивается с точностью до секунды, как в rsync: не все ФС
+    хранят наносекунды.
+    يُقارن الزمن بدقة ثانية كما في rsync: ليست كل أنظمة الملفات تحفظ النانوثانية.
+    """
+    src, dst, size, mtime_ns = task
+    try:
+        dst_stat = os.stat(dst)
+        if dst_stat.st_size != size:
+            return False
+        if mtime_ns is None:
+            mtime_ns = os.stat(src).st_mtime_ns
+    except OSError:
+        return False
+    return dst_stat.st_mtime_ns // 10**9 == mtime_ns // 10**9
+
+
+def link_duplicate(original_dst: str, dst: str) -> str:
+    """
+    Дубликат как жесткая ссылка на уже скопированный оригинал в цели
+    النسخة المكررة كرابط صلب إلى الأصل المنسوخ في الهدف
+    """
+    return DEDUPLICATED if hardlink_file(original_dst, dst) == LINKED else FELL_BACK
+
+
+def plan_copy(source_folder: str, dest_folder: str, workers: int = DEFAULT_COPY_WORKERS,
+              cancel_event: Optional[threading.Event] = None
+              ) -> Tuple[List[str], List[CopyTask]]:
+    """
+    Список целевых папок и файлов для копирования
+    قائمة المجلدات الهدف والملفات المطلوب نسخها
+
+    Как и прежний обход os.walk, создаются только папки, в которых есть файлы.
+    مثل os.walk السابق، تُنشأ فقط المجلدات التي تحتوي على ملفات.
+
+    Raises:
+        FileNotFoundError: Исходной папки нет - المجلد المصدر غير موجود
+        OperationCancelled: Событие отмены установлено - تم ضبط حدث الإلغاء
+    """
+    if not os.path.isdir(source_folder):
+        raise FileNotFoundError(f"Исходная папка не найдена: {source_folder}")
+
+    dirs: List[str] = []
+    tasks: List[CopyTask] = []
+    for rows in iter_file_batches(source_folder, workers):
+        if cancel_event is not None and cancel_event.is_set():
+            raise OperationCancelled(CopyStats())
+        rel_dir = os.path.relpath(os.path.dirname(rows[0][1]), source_folder)
+        dest_dir = os.path.normpath(os.path.join(dest_folder, rel_dir))
+        dirs.append(dest_dir)
+        for name, path, size, mtime_ns in rows:
+            tasks.append((path, os.path.join(dest_dir, name), size, mtime_ns))
+    return dirs, tasks
+
+
+def run_copy_tasks(tasks: List[CopyTask], workers: int = DEFAULT_COPY_WORKERS,
+                   copy_func: Callable[[str, str], Optional[str]] = fast_copy,
+                   progress: Optional[Callable[[CopyProgress], None]] = None,
+                   cancel_event: Optional[threading.Event] = None,
+                   stats: Optional[CopyStats] = None,
+                   skip_unchanged: bool = False) -> CopyStats:
+    """
+    Копирование списка файлов в пуле потоков - نسخ قائمة الملفات في مجموعة خيوط
+
+    Первая ошибка останавливает копирование и передается вызывающему.
+    أول خطأ يوقف النسخ ويُمرر إلى المستدعي.
+
+    Args:
+        tasks (List[CopyTask]): Задачи копирования - مهام النسخ
+        workers (int): Число потоков - عدد الخيوط
+        copy_func (Callable): Функция копирования одного файла, возвращает результат
+                              (COPIED, LINKED, ...) - دالة نسخ ملف واحد
+        progress (Callable): Вызывается в потоке вызывающего с CopyProgress
+                             يُستدعى في خيط المستدعي مع CopyProgress
+        cancel_event (threading.Event): Событие отмены - حدث الإلغاء
+        skip_unchanged (bool): Пропускать совпадающие файлы - تخطي الملفات المطابقة
+
+    Raises:
+        OperationCancelled: Событие отмены установлено - تم ضبط حدث الإلغاء
+    """
+    if stats is None:
+        stats = CopyStats(len(tasks), sum(task[2] for task in tasks))
+    else:
+        stats.resume()
+    cancel_event = cancel_event or threading.Event()
+    # Остановка после ошибки, отдельно от отмены пользователем
+    # التوقف بعد خطأ، منفصل عن إلغاء المستخدم
+    stop = threading.Event()
+    last_report = 0.0
+
+    def copy_one(task: CopyTask) -> None:
+        if stop.is_set() or cancel_event.is_set():
+            return
+        if skip_unchanged and is_unchanged(task):
+            stats.add(task[2], SKIPPED)
+            return
+        stats.add(task[2], copy_func(task[0], task[1]) or COPIED)
+
+    def report(force: bool = False) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if progress is not None and (force or now - last_report >= PROGRESS_INTERVAL):
+            last_report = now
+            progress(stats.snapshot())
+
+    # Ограниченное число задач в очереди: миллион файлов не создает миллион futures
+    # عدد محدود من المهام في الطابور: مليون ملف لا ينشئ مليون future
+    pending = set()
+    task_iter = iter(tasks)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        try:
+            while True:
+                while len(pending) < workers * 4 and not cancel_event.is_set():
+                    task = next(task_iter, None)
+                    if task is None:
+                        break
+                    pending.add(pool.submit(copy_one, task))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                report()
+        except BaseException:
+            stop.set()
+            for future in pending:
+                future.cancel()
+            raise
+
+    stats.finish()
+    report(force=True)
+    if cancel_event.is_set() and stats.files_done < stats.files_total:
+        raise OperationCancelled(stats)
+    return stats
+
+
+def copy_tree(source_folder: str, dest_folder: str, workers: int = DEFAULT_COPY_WORKERS,
+              progress: Optional[Callable[[CopyProgress], None]] = None,
+              cancel_event: Optional[threading.Event] = None,
+              copy_func: Optional[Callable[[str, str], Optional[str]]] = None,
+              strategy: str = COPY, skip_unchanged: bool = False,
+              duplicates: Optional[Dict[str, str]] = None) -> CopyStats:
+    """
+    Параллельное копирование дерева папок - النسخ المتوازي لشجرة المجلدات
+
+    Args:
+        source_folder (str): Исходная папка - المجلد المصدر
+        dest_folder (str): Целевая папка - المجلد الهدف
+        workers (int): Потоков обхода и копирования - خيوط الفحص والنسخ
+        progress (Callable): Получает CopyProgress - يستقبل CopyProgress
+        cancel_event (threading.Event): Событие отмены - حدث الإلغاء
+        copy_func (Callable): Своя функция копирования вместо стратегии - دالة نسخ مخصصة
+        strategy (str): copy, hardlink или reflink - استراتيجية النسخ
+        skip_unchanged (bool): Пропускать файлы, уже совпадающие в цели
+                               تخطي الملفات المطابقة في الهدف
+        duplicates (Dict[str, str]): Исходный дубликат -> исходный оригинал;
+                                     дубликаты не копируются, а связываются
+                                     النسخة المكررة -> الأصل؛ المكررات تُربط ولا تُنسخ
+
+    Returns:
+        CopyStats: Итоги копирования - نتائج النسخ
+    """
+    copy_func = copy_func or get_copy_function(strategy)
+    dirs, tasks = plan_copy(source_folder, dest_folder, workers, cancel_event)
+    # Все папки создаются заранее: потокам не нужны exists/makedirs на каждый файл
+    # كل المجلدات تُنشأ مسبقاً: الخيوط لا تحتاج exists/makedirs لكل ملف
+    for folder in dirs:
+        os.makedirs(folder, exist_ok=True)
+    if not duplicates:
+        return run_copy_tasks(tasks, workers, copy_func, progress, cancel_event,
+                              skip_unchanged=skip_unchanged)
+
+    # Сначала оригиналы, затем ссылки на их копии в цели
+    # الأصول أولاً، ثم الروابط إلى نسخها في الهدف
+    stats = CopyStats(len(tasks), sum(task[2] for task in tasks))
+    dest_of = {task[0]: task[1] for task in tasks}
+    unique_tasks: List[CopyTask] = []
+    link_tasks: List[CopyTask] = []
+    for task in tasks:
+        # Оригинал мог исчезнуть после поиска дубликатов: тогда обычная копия
+        # قد يختفي الأصل بعد البحث عن التكرار: عندها نسخ عادي
+        original = duplicates.get(task[0])
+        if original in dest_of:
+            link_tasks.append((dest_of[original], task[1], task[2], None))
+        else:
+            unique_tasks.append(task)
+    run_copy_tasks(unique_tasks, workers, copy_func, progress, cancel_event, stats,
+                   skip_unchanged=skip_unchanged)
+    return run_copy_tasks(link_tasks, workers, link_duplicate, progress, cancel_event,
+                          stats)
@@ -0,0 +1,259 @@
+""" HTTP-кэш страниц поиска с условными запросами. ذاكرة HTTP مؤقتة لصفحات البحث
+ مع طلبات شرطية.
+
+Тело ответа хранится на диске вместе с ETag и Last-Modified. Пока запись
+моложе TTL, страница отдается без обращения к сети. Более старая запись
+проверяется условным запросом (If-None-Match / If-Modified-Since): ответ 304
+продлевает запись, 200 заменяет ее. Давно не использованные записи и самые
+старые записи сверх лимита размера удаляются при сохранении новых.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+# Время жизни записи без проверки (сек) مدة صلاحية السجل بدون تحقق (ثانية)
+DEFAULT_TTL = 15 * 60
+DEFAULT_HTTP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "job_analytics",
+                                      "http_cache")
+# Лимиты кэша: общий размер и время с последнего использования записи
+# حدود الذاكرة المؤقتة: الحجم الكلي والمدة منذ آخر استخدام للسجل
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+MAX_ENTRY_AGE = 7 * 24 * 3600
+# Очистка при первом сохранении и затем через столько сохранений
+# التنظيف عند أول حفظ ثم بعد هذا العدد من عمليات الحفظ
+PRUNE_EVERY = 200
+
+
+class HttpCache:
+    """
+    Дисковый HTTP-кэш для GET-запросов - ذاكرة HTTP مؤقتة على القرص لطلبات GET
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = MAX_CACHE_BYTES, max_age: float = MAX_ENTRY_AGE):
+        """
+        Args:
+            cache_dir (str): Папка кэша (по умолчанию http_cache в
+                             JOB_ANALYTICS_CACHE_DIR или ~/.cache/job_analytics)
+                             مجلد الذاكرة المؤقتة
+            ttl (float): Секунды, в течение которых запись отдается без сети
+                         الثواني التي يُستخدم فيها السجل بدون شبكة
+            max_bytes (int): Предельный размер кэша - الحجم الأقصى للذاكرة المؤقتة
+            max_age (float): Секунд с последнего использования записи
+                             ثواني منذ آخر استخدام للسجل
+        """
+        env_dir = os.environ.get("JOB_ANALYTICS_CACHE_DIR")
+        self.cache_dir = (cache_dir or (env_dir and os.path.join(env_dir, "http_cache"))
+                          or DEFAULT_HTTP_CACHE_DIR)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._stores = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _entry_paths(self, url: str) -> Dict[str, str]:
+        key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return {"meta": base + ".json", "body": base + ".body"}
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _load_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        paths = self._entry_paths(url)
+        try:
+            with open(paths["meta"], "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("url") != url:
+                return None
+            with open(paths["body"], "rb") as f:
+                meta["body"] = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        if "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        paths = self._entry_paths(url)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        # Сначала тело, затем метаданные: запись не ссылается на неполное тело
+        # الجسم أولاً ثم البيانات الوصفية: السجل لا يشير إلى جسم ناقص
+        for path, data in ((paths["body"], response.content),
+                           (paths["meta"], json.dumps(meta).encode("utf-8"))):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            prune = self._stores % PRUNE_EVERY == 0
+            self._stores += 1
+        if prune:
+            self.prune()
+
+    def _touch(self, url: str, entry: Dict[str, Any]) -> None:
+        meta = {key: value for key, value in entry.items() if key != "body"}
+        meta["stored_at"] = time.time()
+        path = self._entry_paths(url)["meta"]
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str, session: Optional[requests.Session] = None,
+            timeout=None) -> bytes:
+        """
+        Тело страницы из кэша или из сети - محتوى الصفحة من الذاكرة المؤقتة أو الشبكة
+
+        Args:
+            url (str): Адрес страницы - رابط الصفحة
+            session (requests.Session): Сессия для запросов - جلسة الطلبات
+            timeout: Таймаут сетевого запроса - مهلة طلب الشبكة
+
+        Raises:
+            requests.HTTPError: Ответ 4xx/5xx (не кэшируется) - استجابة 4xx/5xx
+
+        Returns:
+            bytes: Тело ответа - محتوى الاستجابة
+        """
+        client = session if session is not None else requests
+        entry = self._load_entry(url)
+
+        if entry is not None and time.time() - entry["stored_at"] < self.ttl:
+            self._count("hits")
+            # mtime метаданных - время последнего использования для prune()
+            # mtime للبيانات الوصفية هو زمن آخر استخدام لـ prune()
+            try:
+                os.utime(self._entry_paths(url)["meta"])
+            except OSError:
+                pass
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = client.get(url, headers=headers, timeout=timeout)
+        if headers and response.status_code == 304:
+            # Страница не изменилась: продлить запись الصفحة لم تتغير: تمديد السجل
+            self._count("revalidated")
+            self._touch(url, entry)
+            return entry["body"]
+
+        self._count("misses")
+        response.raise_for_status()
+        if response.status_code == 200:
+            self._store(url, response)
+        return response.content
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Статистика попаданий и промахов - إحصاءات الإصابات والإخفاقات
+        """
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                # 304 тоже экономит загрузку тела 304 يوفر تحميل المحتوى أيضاً
+                "hit_ratio": (self.hits + self.revalidated) / total if total else 0.0,
+            }
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(время использования, размер, база пути) записей - سجلات الذاكرة"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            base = os.path.join(self.cache_dir, name[:-len(".json")])
+            try:
+                used = os.stat(base + ".json").st_mtime
+                size = os.path.getsize(base + ".json")
+                if os.path.exists(base + ".body"):
+                    size += os.path.getsize(base + ".body")
+            except OSError:
+                continue
+            entries.append((used, size, base))
+        return entries
+
+    @staticmethod
+    def _remove_entry(base: str) -> None:
+        # Сначала метаданные: запись без них не читается
+        # البيانات الوصفية أولاً: السجل بدونها لا يُقرأ
+        for ext in (".json", ".body"):
+            try:
+                os.remove(base + ext)
+            except FileNotFoundError:
+                pass
+
+    def prune(self) -> int:
+        """
+        Удаление записей старше max_age и самых давно использованных
+        записей сверх max_bytes
+        حذف السجلات الأقدم من max_age والأقدم استخداماً فوق max_bytes
+
+        Returns:
+            int: Сколько записей удалено - عدد السجلات المحذوفة
+        """
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        removed = 0
+        expire_before = time.time() - self.max_age
+        kept = []
+        for used, size, base in self._entries():
+            if used < expire_before:
+                self._remove_entry(base)
+                removed += 1
+            else:
+                kept.append((used, size, base))
+
+        total = sum(size for _, size, _ in kept)
+        kept.sort()
+        # Самая свежая запись остается, даже если одна превышает лимит
+        # السجل الأحدث يبقى حتى لو تجاوز الحد وحده
+        while total > self.max_bytes and len(kept) > 1:
+            _, size, base = kept.pop(0)
+            self._remove_entry(base)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Очистка кэша - مسح الذاكرة المؤقتة"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((".json", ".body", ".tmp")):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+_default_http_cache: Optional[HttpCache] = None
+
+
+def get_default_http_cache() -> HttpCache:
+    """Общий HTTP-кэш процесса - ذاكرة HTTP المؤقتة المشتركة للعملية"""
+    global _default_http_cache
+    if _default_http_cache is None:
+        _default_http_cache = HttpCache()
+    return _default_http_cache
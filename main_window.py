@@ -11,15 +11,36 @@ Simplified main interface with 3 tabs
 
 import sys
 import os
-from PySide6.QtWidgets import *
-from PySide6.QtCore import QThread, Signal, Qt
-from PySide6.QtGui import QPixmap
+import threading
+from typing import Any, Callable
 
-from data_utils import get_data_by_date
-from annotation import create_annotation_file
-from reorganize_dataset import reorganize_dataset
-from web_scraping import scrape_wuzzuf_jobs, save_jobs_to_csv
-from data_analysis import analyze_job_data_with_charts
+from startup_profiling import lazy_callable, preload_modules, profiler, report_requested
+
+with profiler.measure("PySide6"):
+    from PySide6.QtWidgets import *
+    from PySide6.QtCore import QThread, QTimer, Signal, Qt
+    from PySide6.QtGui import QPixmap
+
+with profiler.measure("reorganize_dataset"):
+    from file_operations import OperationCancelled
+    from reorganize_dataset import reorganize_dataset
+
+# Модули с pandas, matplotlib и requests загружаются при первом действии вкладки
+# или в фоне после первой отрисовки окна
+# Modules pulling pandas, matplotlib and requests load on the tab's first action
+# or in the background after the window is first painted
+# الوحدات الثقيلة تُحمّل عند أول إجراء في التبويب أو في الخلفية بعد أول رسم للنافذة
+get_data_by_date = lazy_callable("data_utils", "get_data_by_date")
+create_annotation_file = lazy_callable("annotation", "create_annotation_file")
+scrape_wuzzuf_jobs = lazy_callable("web_scraping", "scrape_wuzzuf_jobs")
+scrape_wuzzuf_batch = lazy_callable("web_scraping", "scrape_wuzzuf_batch")
+save_jobs_to_csv = lazy_callable("web_scraping", "save_jobs_to_csv")
+run_async_scrape = lazy_callable("async_scraping", "run_async_scrape")
+get_default_http_cache = lazy_callable("http_cache", "get_default_http_cache")
+analyze_job_data_with_charts = lazy_callable("data_analysis", "analyze_job_data_with_charts")
+
+PRELOAD_MODULES = ("web_scraping", "async_scraping", "http_cache",
+                   "annotation", "data_utils", "data_analysis")
 
 
 class WebScrapingThread(QThread):
@@ -32,8 +53,11 @@ class WebScrapingThread(QThread):
     finished = Signal(bool)
     progress = Signal(str)
     data_ready = Signal(list)
+    # Строки очередной страницы асинхронного движка
+    # صفوف الصفحة التالية من المحرك غير المتزامن
+    rows_ready = Signal(list)
     
-    def __init__(self, search_query: str, max_pages: int):
+    def __init__(self, search_query: str, max_pages: int, backend: str = "sync"):
         """
         Инициализация потока веб-скрапинга
         Initialization of web scraping thread
@@ -47,11 +71,19 @@ class WebScrapingThread(QThread):
             max_pages: Максимальное количество страниц для скрапинга
             max_pages: Maximum number of pages to scrape
             max_pages: الحد الأقصى لعدد الصفحات لاستخراج البيانات
+            
+            backend: "sync" (scrape_wuzzuf_jobs) или "async" (asyncio-движок)
+            backend: "sync" (scrape_wuzzuf_jobs) or "async" (asyncio engine)
+            backend: "sync" أو "async" (محرك asyncio)
         """
         super().__init__()
         self.search_query = search_query
         self.max_pages = max_pages
-    
+        self.backend = backend
+        # Кэш создается в потоке, чтобы импорт requests не задерживал GUI
+        # الذاكرة المؤقتة تُنشأ داخل الثريد حتى لا يؤخر استيراد requests الواجهة
+        self.http_cache = None
+
     def run(self):
         """
         Основное выполнение потока
@@ -60,7 +92,22 @@ class WebScrapingThread(QThread):
         """
         try:
             self.progress.emit("Начало извлечения данных...")
-            success, data_lists = scrape_wuzzuf_jobs(self.search_query, self.max_pages)
+            # Повторные запросы в течение TTL не обращаются к сети
+            # الطلبات المتكررة خلال مدة الصلاحية لا تستخدم الشبكة
+            if self.http_cache is None:
+                self.http_cache = get_default_http_cache()
+            # Несколько запросов через запятую - عدة استعلامات مفصولة بفواصل
+            queries = [query.strip() for query in self.search_query.split(",") if query.strip()]
+            if len(queries) > 1:
+                success, data_lists = scrape_wuzzuf_batch(queries, self.max_pages,
+                                                          http_cache=self.http_cache)
+            elif self.backend == "async":
+                success, data_lists = run_async_scrape(
+                    self.search_query, self.max_pages, on_page=self.on_page_done,
+                    http_cache=self.http_cache)
+            else:
+                success, data_lists = scrape_wuzzuf_jobs(self.search_query, self.max_pages,
+                                                         http_cache=self.http_cache)
             if success:
                 self.data_ready.emit(data_lists)
                 self.finished.emit(True)
@@ -69,6 +116,131 @@ class WebScrapingThread(QThread):
         except Exception as e:
             self.progress.emit(f"Ошибка: {str(e)}")
             self.finished.emit(False)
+    
+    def on_page_done(self, page_num: int, pages_done: int, pages_total: int, page_data: list):
+        """
+        Строки новой страницы асинхронного движка
+        Rows of a new page from the async engine
+        صفوف صفحة جديدة من المحرك غير المتزامن
+        """
+        self.progress.emit(f"Страница {page_num + 1} извлечена ({pages_done}/{pages_total})")
+        self.rows_ready.emit(page_data)
+
+
+class FileOperationThread(QThread):
+    """
+    Базовый поток для долгих операций с файлами (можно отменить)
+    Base thread for long-running file operations (cancellable)
+    ثريد أساسي لعمليات الملفات الطويلة (قابل للإلغاء)
+    """
+
+    finished = Signal(bool)
+    progress = Signal(str)
+    # Файлов готово, файлов всего (0 - неизвестно), байт готово, байт всего
+    # الملفات المنجزة، إجمالي الملفات (0 - غير معروف)، البايتات المنجزة، إجمالي البايتات
+    file_progress = Signal(int, int, object, object)
+
+    def __init__(self, source_folder: str, operation: Callable[[], Any]):
+        """
+        Инициализация потока операции с файлами
+        Initialization of file operation thread
+        تهيئة ثريد عملية الملفات
+
+        Args:
+            source_folder: Исходная папка
+            source_folder: Source folder
+            source_folder: المجلد المصدر
+
+            operation: Тело операции; результат сохраняется в self.result
+            operation: Operation body; its return value is stored in self.result
+            operation: جسم العملية؛ نتيجتها تُحفظ في self.result
+        """
+        super().__init__()
+        self.source_folder = source_folder
+        self.operation = operation
+        self.cancel_event = threading.Event()
+        self.cancelled = False
+        self.error = None
+        self.result = None
+
+    def cancel(self):
+        """
+        Запросить отмену: операция остановится на ближайшей проверке
+        Request cancellation: the operation stops at its next check
+        طلب الإلغاء: تتوقف العملية عند أقرب فحص
+        """
+        self.cancel_event.set()
+
+    def run(self):
+        """
+        Основное выполнение потока
+        Main thread execution
+        التنفيذ الرئيسي للثريد
+        """
+        try:
+            self.result = self.operation()
+            self.finished.emit(True)
+        except OperationCancelled:
+            self.cancelled = True
+            self.progress.emit("Операция отменена")
+            self.finished.emit(False)
+        except Exception as e:
+            self.error = e
+            self.progress.emit(f"Ошибка: {str(e)}")
+            self.finished.emit(False)
+
+
+class AnnotationThread(FileOperationThread):
+    """
+    Поток создания файла аннотации
+    Annotation file creation thread
+    ثريد إنشاء ملف التعليقات التوضيحية
+    """
+
+    def __init__(self, source_folder: str, save_path: str):
+        super().__init__(source_folder, self.annotate)
+        self.save_path = save_path
+
+    def annotate(self):
+        self.progress.emit("Сканирование папки...")
+        return create_annotation_file(self.source_folder, self.save_path,
+                                      progress=self.on_progress,
+                                      cancel_event=self.cancel_event)
+
+    def on_progress(self, stats: dict):
+        """
+        Промежуточная статистика сканирования (общее число файлов заранее неизвестно)
+        Scan statistics so far (the total file count is not known in advance)
+        إحصاءات المسح الجزئية (العدد الكلي للملفات غير معروف مسبقًا)
+        """
+        self.file_progress.emit(stats.get("files", 0), 0, stats.get("bytes", 0), 0)
+
+
+class ReorganizeThread(FileOperationThread):
+    """
+    Поток реорганизации набора данных
+    Dataset reorganization thread
+    ثريد إعادة تنظيم مجموعة البيانات
+    """
+
+    def __init__(self, source_folder: str, dest_folder: str):
+        super().__init__(source_folder, self.reorganize)
+        self.dest_folder = dest_folder
+
+    def reorganize(self):
+        self.progress.emit("Копирование файлов...")
+        return reorganize_dataset(self.source_folder, self.dest_folder,
+                                  progress=self.on_progress,
+                                  cancel_event=self.cancel_event)
+
+    def on_progress(self, progress):
+        """
+        Прогресс копирования (CopyProgress)
+        Copy progress (CopyProgress)
+        تقدم النسخ (CopyProgress)
+        """
+        self.file_progress.emit(progress.files_done, progress.files_total,
+                                progress.bytes_done, progress.bytes_total)
 
 
 class ChartWindow(QMainWindow):
@@ -156,18 +328,55 @@ class MainWindow(QMainWindow):
     النافذة الرئيسية للتطبيق
     """
     
-    def __init__(self):
+    def __init__(self, preload: bool = True):
         """
         Инициализация главного окна
         Main window initialization
         تهيئة النافذة الرئيسية
+
+        Args:
+            preload: Загрузить тяжелые модули в фоне после первой отрисовки
+            preload: Load heavy modules in the background after the first paint
+            preload: تحميل الوحدات الثقيلة في الخلفية بعد أول رسم
         """
         super().__init__()
         self.setWindowTitle("Лабораторная работа 5 - Интегрированное приложение")
         self.setMinimumSize(900, 600)
         self.source_folder = ""
         self.scraped_data = None
+        self.preload = preload
+        self.preload_thread = None
+        self.file_thread = None
+        self._first_paint_done = False
         self.setup_ui()
+        profiler.mark("main window created")
+
+    def paintEvent(self, event):
+        """
+        Отметка первой отрисовки и запуск фоновой загрузки модулей
+        Marks the first paint and starts background module preloading
+        تسجيل أول رسم وبدء التحميل في الخلفية
+        """
+        super().paintEvent(event)
+        if self._first_paint_done:
+            return
+        self._first_paint_done = True
+        profiler.mark("first paint")
+        if self.preload:
+            # После возврата в цикл событий, чтобы не задерживать отрисовку
+            # After returning to the event loop so painting is not delayed
+            # بعد العودة إلى حلقة الأحداث حتى لا يتأخر الرسم
+            QTimer.singleShot(0, self.start_preload)
+
+    def start_preload(self) -> threading.Thread:
+        """
+        Фоновый импорт модулей вкладок
+        Background import of the tabs' modules
+        استيراد وحدات التبويبات في الخلفية
+        """
+        if self.preload_thread is None:
+            self.preload_thread = preload_modules(PRELOAD_MODULES)
+        return self.preload_thread
 
     def setup_ui(self):
         """
@@ -231,11 +440,25 @@ class MainWindow(QMainWindow):
         # Кнопки управления
         # Control buttons
         # أزرار التحكم
-        btn1 = QPushButton("Создать файл аннотации")
-        btn1.clicked.connect(self.create_annotation)
+        self.annotation_btn = QPushButton("Создать файл аннотации")
+        self.annotation_btn.clicked.connect(self.create_annotation)
         
-        btn2 = QPushButton("Создать новый Dataset")
-        btn2.clicked.connect(self.reorganize_dataset)
+        self.reorganize_btn = QPushButton("Создать новый Dataset")
+        self.reorganize_btn.clicked.connect(self.reorganize_dataset)
+
+        # Прогресс операции с файлами
+        # File operation progress
+        # تقدم عملية الملفات
+        progress_layout = QHBoxLayout()
+        self.file_progress_bar = QProgressBar()
+        self.file_progress_bar.setVisible(False)
+        self.file_status_label = QLabel("")
+        self.cancel_file_btn = QPushButton("Отменить")
+        self.cancel_file_btn.setEnabled(False)
+        self.cancel_file_btn.clicked.connect(self.cancel_file_operation)
+        progress_layout.addWidget(self.file_progress_bar)
+        progress_layout.addWidget(self.file_status_label)
+        progress_layout.addWidget(self.cancel_file_btn)
 
         # Поиск по дате
         # Search by date
@@ -255,8 +478,9 @@ class MainWindow(QMainWindow):
         self.table = QTableWidget()
 
         layout.addLayout(folder_layout)
-        layout.addWidget(btn1)
-        layout.addWidget(btn2)
+        layout.addWidget(self.annotation_btn)
+        layout.addWidget(self.reorganize_btn)
+        layout.addLayout(progress_layout)
         layout.addLayout(date_layout)
         layout.addWidget(QLabel("Отображение данных:"))
         layout.addWidget(self.table)
@@ -280,7 +504,7 @@ class MainWindow(QMainWindow):
         input_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setText("python")
-        self.search_input.setPlaceholderText("Введите поисковый запрос")
+        self.search_input.setPlaceholderText("Введите поисковый запрос (несколько - через запятую)")
         self.pages_input = QLineEdit()
         self.pages_input.setText("2")
         self.pages_input.setPlaceholderText("Количество страниц")
@@ -302,8 +526,14 @@ class MainWindow(QMainWindow):
         self.save_btn.setEnabled(False)
         self.save_btn.setStyleSheet("QPushButton { background-color: #27ae60; color: white; font-weight: bold; padding: 10px; }")
         
+        # Асинхронный режим: страницы загружаются параллельно и показываются по мере готовности
+        # Async mode: pages load in parallel and appear as they complete
+        # الوضع غير المتزامن: تحميل الصفحات بالتوازي وعرضها عند اكتمالها
+        self.async_checkbox = QCheckBox("Асинхронный режим")
+        
         btn_layout.addWidget(self.scrape_btn)
         btn_layout.addWidget(self.save_btn)
+        btn_layout.addWidget(self.async_checkbox)
 
         # Результаты
         # Results
@@ -407,11 +637,25 @@ class MainWindow(QMainWindow):
         )
         
         if save_path:
-            try:
-                create_annotation_file(self.source_folder, save_path)
-                self.show_info(f"Файл аннотации успешно создан:\n{save_path}")
-            except Exception as e:
-                self.show_error(f"Не удалось создать файл:\n{str(e)}")
+            self.start_file_operation(AnnotationThread(self.source_folder, save_path),
+                                      self.on_annotation_finished)
+
+    def on_annotation_finished(self, success):
+        """
+        Обработка завершения потока аннотации
+        Handle annotation thread completion
+        معالجة انتهاء ثريد التعليقات التوضيحية
+
+        Args:
+            success: Успешность выполнения
+            success: Success status
+            success: حالة النجاح
+        """
+        thread = self.finish_file_operation()
+        if success:
+            self.show_info(f"Файл аннотации успешно создан:\n{thread.save_path}")
+        elif thread.error is not None:
+            self.show_error(f"Не удалось создать файл:\n{str(thread.error)}")
 
     def reorganize_dataset(self):
         """
@@ -429,11 +673,105 @@ class MainWindow(QMainWindow):
         )
         
         if dest_folder:
-            try:
-                reorganize_dataset(self.source_folder, dest_folder)
-                self.show_info("Новый набор данных успешно создан")
-            except Exception as e:
-                self.show_error(f"Не удалось создать набор данных:\n{str(e)}")
+            self.start_file_operation(ReorganizeThread(self.source_folder, dest_folder),
+                                      self.on_reorganize_finished)
+
+    def on_reorganize_finished(self, success):
+        """
+        Обработка завершения потока реорганизации
+        Handle reorganization thread completion
+        معالجة انتهاء ثريد إعادة التنظيم
+
+        Args:
+            success: Успешность выполнения
+            success: Success status
+            success: حالة النجاح
+        """
+        thread = self.finish_file_operation()
+        if success:
+            if thread.result.csv_file is None:
+                QMessageBox.warning(self, "Предупреждение",
+                                    "CSV-файл не найден в исходной папке.")
+            self.show_info("Новый набор данных успешно создан")
+        elif thread.error is not None:
+            self.show_error(f"Не удалось создать набор данных:\n{str(thread.error)}")
+
+    def start_file_operation(self, thread, on_finished):
+        """
+        Запуск операции с файлами в отдельном потоке
+        Start a file operation in a worker thread
+        تشغيل عملية الملفات في ثريد منفصل
+
+        Args:
+            thread: Поток FileOperationThread
+            thread: FileOperationThread instance
+            thread: ثريد FileOperationThread
+
+            on_finished: Обработчик завершения
+            on_finished: Completion handler
+            on_finished: معالج الانتهاء
+        """
+        self.annotation_btn.setEnabled(False)
+        self.reorganize_btn.setEnabled(False)
+        self.cancel_file_btn.setEnabled(True)
+        self.file_progress_bar.setRange(0, 0)
+        self.file_progress_bar.setVisible(True)
+
+        self.file_thread = thread
+        thread.progress.connect(self.file_status_label.setText)
+        thread.file_progress.connect(self.on_file_progress)
+        thread.finished.connect(on_finished)
+        thread.start()
+
+    def finish_file_operation(self):
+        """
+        Восстановление интерфейса после операции с файлами
+        Restore the interface after a file operation
+        استعادة الواجهة بعد عملية الملفات
+        """
+        thread = self.file_thread
+        thread.wait()
+        self.annotation_btn.setEnabled(True)
+        self.reorganize_btn.setEnabled(True)
+        self.cancel_file_btn.setEnabled(False)
+        self.file_progress_bar.setVisible(False)
+        if thread.cancelled:
+            self.file_status_label.setText("Операция отменена")
+        elif thread.error is None:
+            self.file_status_label.setText("Готово")
+        return thread
+
+    def on_file_progress(self, files_done, files_total, bytes_done, bytes_total):
+        """
+        Обновление прогресса операции с файлами
+        Update file operation progress
+        تحديث تقدم عملية الملفات
+        """
+        megabytes = bytes_done / (1024 * 1024)
+        if files_total:
+            # Процент по байтам, а для пустых файлов - по количеству
+            # النسبة حسب البايتات، وللملفات الفارغة حسب العدد
+            if bytes_total:
+                percent = int(bytes_done * 100 / bytes_total)
+            else:
+                percent = int(files_done * 100 / files_total)
+            self.file_progress_bar.setRange(0, 100)
+            self.file_progress_bar.setValue(percent)
+            self.file_status_label.setText(
+                f"Файлов: {files_done}/{files_total} ({megabytes:.1f} МБ)")
+        else:
+            self.file_status_label.setText(f"Файлов: {files_done} ({megabytes:.1f} МБ)")
+
+    def cancel_file_operation(self):
+        """
+        Отмена текущей операции с файлами
+        Cancel the running file operation
+        إلغاء عملية الملفات الجارية
+        """
+        if self.file_thread is not None and self.file_thread.isRunning():
+            self.file_thread.cancel()
+            self.cancel_file_btn.setEnabled(False)
+            self.file_status_label.setText("Отмена...")
 
     def search_by_date(self):
         """
@@ -520,8 +858,15 @@ class MainWindow(QMainWindow):
         self.scrape_log.clear()
         self.scrape_log.append("Начало процесса извлечения")
 
-        self.scraping_thread = WebScrapingThread(search, pages)
+        if self.async_checkbox.isChecked():
+            self.scraping_thread = WebScrapingThread(search, pages, backend="async")
+            # Страницы добавляются в таблицу по мере загрузки
+            # الصفحات تُضاف إلى الجدول أثناء التحميل
+            self.results_table.setRowCount(0)
+        else:
+            self.scraping_thread = WebScrapingThread(search, pages)
         self.scraping_thread.progress.connect(self.scrape_log.append)
+        self.scraping_thread.rows_ready.connect(self.append_scraped_rows)
         self.scraping_thread.data_ready.connect(self.on_scraping_done)
         self.scraping_thread.finished.connect(self.on_scraping_finished)
         self.scraping_thread.start()
@@ -569,7 +914,8 @@ class MainWindow(QMainWindow):
             data: Scraped data
             data: البيانات المستخرجة
         """
-        job_titles, companies, dates, locations, skills, links = data
+        # Пакетный режим добавляет столбец запросов الوضع الدفعي يضيف عمود الاستعلامات
+        job_titles, companies, dates, locations, skills, links = data[:6]
         row_count = len(job_titles)
         
         self.results_table.setRowCount(row_count)
@@ -585,6 +931,25 @@ class MainWindow(QMainWindow):
         self.results_table.resizeColumnsToContents()
         self.scrape_log.append(f"Отображено {row_count} записей в таблице")
 
+    def append_scraped_rows(self, data):
+        """
+        Добавление строк одной страницы в конец таблицы
+        Append the rows of one page to the table
+        إضافة صفوف صفحة واحدة إلى نهاية الجدول
+        """
+        job_titles, companies, dates, locations, skills, links = data[:6]
+        start = self.results_table.rowCount()
+        self.results_table.setRowCount(start + len(job_titles))
+
+        for offset in range(len(job_titles)):
+            i = start + offset
+            self.results_table.setItem(i, 0, QTableWidgetItem(job_titles[offset]))
+            self.results_table.setItem(i, 1, QTableWidgetItem(companies[offset]))
+            self.results_table.setItem(i, 2, QTableWidgetItem(locations[offset]))
+            self.results_table.setItem(i, 3, QTableWidgetItem(skills[offset]))
+            self.results_table.setItem(i, 4, QTableWidgetItem(links[offset]))
+            self.results_table.setItem(i, 5, QTableWidgetItem(dates[offset]))
+
     def save_data(self):
         """
         Сохранение извлеченных данных в CSV
@@ -688,6 +1053,17 @@ class MainWindow(QMainWindow):
 
     # ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ / HELPER METHODS / الطرق المساعدة
 
+    def closeEvent(self, event):
+        """
+        Отмена операции с файлами при закрытии окна
+        Cancel the file operation when the window closes
+        إلغاء عملية الملفات عند إغلاق النافذة
+        """
+        if self.file_thread is not None and self.file_thread.isRunning():
+            self.file_thread.cancel()
+            self.file_thread.wait()
+        super().closeEvent(event)
+
     def show_error(self, message):
         """
         Показать сообщение об ошибке
@@ -722,5 +1098,10 @@ if __name__ == "__main__":
     
     window = MainWindow()
     window.show()
-    
-    sys.exit(app.exec())
\ No newline at end of file
+
+    exit_code = app.exec()
+    # Отчет: --profile-startup или JOB_ANALYTICS_STARTUP_REPORT=1
+    # التقرير: --profile-startup أو JOB_ANALYTICS_STARTUP_REPORT=1
+    if report_requested():
+        print(profiler.report())
+    sys.exit(exit_code)
\ No newline at end of file
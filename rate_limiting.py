@@ -0,0 +1,295 @@
+""" Темп, повторы и адаптивный параллелизм для скрапинга. التحكم بالسرعة وإعادة
+ المحاولة والتوازي التكيفي للاستخراج.
+
+TokenBucket задает средний темп запросов, RequestScheduler добавляет
+таймауты и повторы с экспоненциальной задержкой и случайным разбросом, а
+AdaptiveConcurrency меняет число одновременных запросов по принципу AIMD:
+рост на единицу, пока задержка и доля ошибок в норме, и уменьшение вдвое,
+когда они растут.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+
+import requests
+
+# Статусы, после которых запрос стоит повторить الحالات التي تستحق إعادة المحاولة
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Таймаут (соединение, чтение) в секундах مهلة (الاتصال، القراءة) بالثواني
+DEFAULT_TIMEOUT: Tuple[float, float] = (5.0, 30.0)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class TokenBucket:
+    """
+    Ведро токенов: не больше rate запросов в секунду в среднем
+    دلو الرموز: لا أكثر من rate طلب في الثانية في المتوسط
+    """
+
+    def __init__(self, rate: Optional[float], capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate (float): Токенов в секунду (None = без ограничения) - رموز في الثانية
+            capacity (float): Допустимый всплеск - الحد الأقصى للدفعة
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Дождаться токена - انتظار رمز
+
+        Returns:
+            float: Время ожидания в секундах - زمن الانتظار بالثواني
+        """
+        if not self.rate:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class AdaptiveConcurrency:
+    """
+    Лимит одновременных запросов по AIMD - حد الطلبات المتزامنة بطريقة AIMD
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 32,
+                 target_latency: float = 2.0, max_error_rate: float = 0.1,
+                 smoothing: float = 0.2, cooldown: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            initial (int): Начальный лимит - الحد الابتدائي
+            minimum (int): Нижняя граница - الحد الأدنى
+            maximum (int): Верхняя граница - الحد الأقصى
+            target_latency (float): Допустимая задержка ответа (сек) - زمن الاستجابة المقبول
+            max_error_rate (float): Допустимая доля ошибок - نسبة الأخطاء المقبولة
+            smoothing (float): Вес нового измерения в скользящем среднем - وزن القياس الجديد
+            cooldown (float): Мин. интервал между уменьшениями (сек) - الفاصل بين التخفيضات
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.smoothing = smoothing
+        self.cooldown = cooldown
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Занять место среди одновременных запросов - حجز مكان بين الطلبات المتزامنة
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, latency: float, ok: bool) -> None:
+        """
+        Учесть результат запроса и пересчитать лимит - تسجيل نتيجة الطلب وإعادة حساب الحد
+        """
+        with self._condition:
+            alpha = self.smoothing
+            self.latency += alpha * (latency - self.latency)
+            self.error_rate += alpha * ((0.0 if ok else 1.0) - self.error_rate)
+
+            overloaded = (not ok or self.latency > self.target_latency
+                          or self.error_rate > self.max_error_rate)
+            if overloaded:
+                now = self._clock()
+                # Одна волна ошибок уменьшает лимит один раз
+                # موجة أخطاء واحدة تخفض الحد مرة واحدة
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(float(self.minimum), self.limit / 2)
+                    self._last_decrease = now
+            else:
+                # +1 примерно за каждые limit успешных ответов
+                # زيادة بمقدار 1 تقريباً لكل limit استجابة ناجحة
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class RequestScheduler:
+    """
+    GET-запросы с темпом, таймаутом, повторами и адаптивным параллелизмом
+    طلبات GET مع التحكم بالسرعة والمهلة وإعادة المحاولة والتوازي التكيفي
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: float = 1.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 timeout: Timeout = DEFAULT_TIMEOUT,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 retry_statuses=RETRY_STATUSES,
+                 sleep: Callable[[float], None] = time.sleep,
+                 rng: Callable[[], float] = random.random):
+        """
+        Args:
+            rate (float): Запросов в секунду (None = без ограничения) - طلبات في الثانية
+            burst (float): Допустимый всплеск запросов - الحد الأقصى للدفعة
+            max_retries (int): Повторов после первой попытки - عدد إعادة المحاولات
+            backoff_base (float): Базовая задержка повтора (сек) - التأخير الأساسي
+            backoff_max (float): Максимальная задержка повтора (сек) - أقصى تأخير
+            timeout: Таймаут запроса, число или (соединение, чтение) - مهلة الطلب
+            concurrency (AdaptiveConcurrency): Адаптивный лимит - الحد التكيفي
+        """
+        self.bucket = TokenBucket(rate, burst, sleep=sleep)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.retry_statuses = retry_statuses
+        self._sleep = sleep
+        self._rng = rng
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Задержка перед повтором: экспонента с полным разбросом
+        التأخير قبل إعادة المحاولة: أسي مع تشتت كامل
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = ceiling * self._rng()
+        if retry_after is not None:
+            # Сервер сам указал паузу الخادم حدد فترة الانتظار
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    @staticmethod
+    def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, url: str, session: Optional[requests.Session] = None,
+            **kwargs) -> requests.Response:
+        """
+        Выполнить GET с повторами - تنفيذ GET مع إعادة المحاولة
+
+        Ответы 3xx (например, 304 для HTTP-кэша) возвращаются как есть.
+        استجابات 3xx (مثل 304 لذاكرة HTTP) تُعاد كما هي.
+
+        Raises:
+            requests.RequestException: Все попытки исчерпаны - استنفاد كل المحاولات
+            requests.HTTPError: Ответ 4xx/5xx, который не повторяется
+                                استجابة 4xx/5xx لا تُعاد محاولتها
+        """
+        client = session if session is not None else requests
+        kwargs["timeout"] = kwargs.get("timeout") or self.timeout
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            response, error = None, None
+            with self.concurrency.slot():
+                start = time.monotonic()
+                try:
+                    response = client.get(url, **kwargs)
+                except requests.RequestException as e:
+                    error = e
+                latency = time.monotonic() - start
+            self._count("requests")
+
+            if error is None and response.status_code not in self.retry_statuses:
+                # Ошибка клиента - не перегрузка сервера: лимит не снижается
+                # خطأ العميل ليس حملاً زائداً على الخادم: الحد لا يُخفض
+                self.concurrency.record(latency, ok=True)
+                if response.status_code >= 400:
+                    self._count("failures")
+                    response.raise_for_status()
+                return response
+
+            self.concurrency.record(latency, ok=False)
+            if attempt == self.max_retries:
+                self._count("failures")
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response
+
+            self._count("retries")
+            self._sleep(self.backoff_delay(attempt, self._retry_after(response)))
+
+    def bind(self, session: Optional[requests.Session]) -> "BoundScheduler":
+        """
+        Клиент с методом get(), привязанный к сессии - عميل مرتبط بالجلسة
+        """
+        return BoundScheduler(self, session)
+
+    def stats(self) -> Dict[str, float]:
+        """Счетчики запросов и текущий лимит - عدادات الطلبات والحد الحالي"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "concurrency": self.concurrency.limit,
+            }
+
+
+class BoundScheduler:
+    """
+    Планировщик с сессией, совместимый по get() с requests.Session
+    مجدول مرتبط بجلسة ومتوافق مع get() في requests.Session
+    """
+
+    def __init__(self, scheduler: RequestScheduler, session: Optional[requests.Session]):
+        self.scheduler = scheduler
+        self.session = session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.scheduler.get(url, self.session, **kwargs)
@@ -2,16 +2,47 @@
     إعادة تنظيم البيانات في مجلد جديد ونسخ ملف CSV الأصلي."""
 
 import os
-import shutil
-from PySide6.QtWidgets import QMessageBox
+import threading
+from typing import Callable, NamedTuple, Optional
 
+from dedup import DuplicateReport, find_duplicates
+from file_operations import (COPY, DEFAULT_COPY_WORKERS, CopyProgress, CopyStats,
+                             OperationCancelled, copy_tree)
 
-def reorganize_dataset(source_folder: str, dest_folder: str):
+
+class ReorganizeResult(NamedTuple):
+    """
+    Итог реорганизации - نتيجة إعادة التنظيم
+    """
+    stats: CopyStats
+    # Исходный CSV-файл или None, если его нет (предупредить пользователя)
+    # ملف CSV الأصلي أو None إذا لم يوجد (لتحذير المستخدم)
+    csv_file: Optional[str]
+    # Найденные дубликаты (режим dedup) - التكرارات المكتشفة (وضع dedup)
+    duplicates: Optional[DuplicateReport] = None
+
+
+def reorganize_dataset(source_folder: str, dest_folder: str,
+                       workers: int = DEFAULT_COPY_WORKERS,
+                       progress: Optional[Callable[[CopyProgress], None]] = None,
+                       cancel_event: Optional[threading.Event] = None,
+                       strategy: str = COPY, skip_unchanged: bool = False,
+                       dedup: bool = False) -> ReorganizeResult:
 
     # Реорганизует файлы из исходной папки в целевую папку. يعيد تنظيم الملفات من المجلد المصدر إلى المجلد الوجهة.
     # А также копирует исходный CSV-файл, чтобы не потерять данные даты. ويقوم بنسخ ملف CSV الأصلي أيضًا حتى لا تضيع بيانات التاريخ.
     # Путь к исходной папке  مسار المجلد المصدر
     # Путь к новой целевой папке مسار المجلد الوجهة الجديد
+    # Потоков копирования عدد خيوط النسخ
+    # progress получает CopyProgress (файлы, байты, скорость) يستقبل progress تقدم النسخ
+    # cancel_event прерывает копирование (OperationCancelled) يوقف cancel_event النسخ
+    # strategy: copy, hardlink или reflink الاستراتيجية: نسخ أو رابط صلب أو استنساخ
+    # skip_unchanged пропускает файлы, уже совпадающие в цели (повторный запуск
+    # после сбоя) يتخطى الملفات المطابقة في الوجهة (إعادة التشغيل بعد فشل)
+    # dedup: одинаковые файлы копируются один раз, остальные - жесткие ссылки
+    # на копию dedup: الملفات المتطابقة تُنسخ مرة واحدة والبقية روابط صلبة
+    # Ошибки передаются вызывающему: сообщения пользователю показывает интерфейс
+    # الأخطاء تُمرر إلى المستدعي: الواجهة هي التي تعرض الرسائل للمستخدم
 
     try:
         # Создать целевую папку, если она не существует إنشاء مجلد الوجهة إذا
@@ -21,67 +52,65 @@ def reorganize_dataset(source_folder: str, dest_folder: str):
             # تم إنشاء المجلد الوجهة:
             print(f"Целевая папка создана: {dest_folder}")
 
-        # Копировать все файлы из источника в назначение (кроме CSV временно)
-        # نسخ جميع الملفات من المصدر إلى الوجهة (باستثناء CSV مؤقتًا)
-        copied_count = 0
-        for root, _, files in os.walk(source_folder):
-            for file in files:
-                src_file = os.path.join(root, file)
-                rel_path = os.path.relpath(root, source_folder)
-                dest_path = os.path.join(dest_folder, rel_path)
-
-                # Создать подпапку, если она не существует إنشاء المجلد الفرعي
-                # إذا لم يكن موجودًا
-                if not os.path.exists(dest_path):
-                    os.makedirs(dest_path)
-
-                # Копировать файл نسخ الملف
-                dest_file = os.path.join(dest_path, file)
-                shutil.copy2(src_file, dest_file)
-                copied_count += 1
+        report = None
+        duplicates = None
+        if dedup:
+            # البحث عن الملفات المتطابقة
+            report = find_duplicates(source_folder, workers, cancel_event=cancel_event)
+            duplicates = report.duplicate_map()
+            print(f"Дубликаты: {report.summary()}")
+
+        # Копировать все файлы из источника в назначение: папки создаются
+        # заранее, файлы копируются параллельно
+        # نسخ جميع الملفات من المصدر إلى الوجهة: المجلدات تُنشأ مسبقًا
+        # والملفات تُنسخ بالتوازي
+        stats = copy_tree(source_folder, dest_folder, workers, progress, cancel_event,
+                          strategy=strategy, skip_unchanged=skip_unchanged,
+                          duplicates=duplicates)
 
         # تم نسخ {} ملفًا من {} إلى {}
         print(
-            f"Скопировано {copied_count} файлов из {source_folder} в {dest_folder}")
+            f"Скопировано {stats.files_done} файлов из {source_folder} в {dest_folder}")
+        print(f"Скорость копирования: {stats.summary()}")
 
-        # Копировать исходный CSV-файл из исходной папки в целевую نسخ ملف CSV
-        # الأصلي من المجلد المصدر إلى الوجهة
-        csv_copied = False
-        for file in os.listdir(source_folder):
+        # Исходный CSV-файл обрабатывается вместе с остальными файлами
+        # (копия, ссылка или пропуск при skip_unchanged): проверить, что в
+        # целевой папке лежит файл того же размера
+        # ملف CSV الأصلي يُعالج مع باقي الملفات: التحقق من وجود ملف بنفس الحجم
+        # في الوجهة
+        src_csv = None
+        for file in sorted(os.listdir(source_folder)):
             if file.lower().endswith(".csv"):
                 src_csv = os.path.join(source_folder, file)
                 dest_csv = os.path.join(dest_folder, file)
-                shutil.copy2(src_csv, dest_csv)
-                csv_copied = True
-                # تم نسخ ملف CSV
-                print(f"CSV-файл скопирован: {src_csv} → {dest_csv}")
+                if (os.path.isfile(dest_csv)
+                        and os.path.getsize(dest_csv) == os.path.getsize(src_csv)):
+                    # ملف CSV موجود في الوجهة
+                    print(f"CSV-файл в целевой папке: {dest_csv}")
+                else:
+                    # ملف CSV غير موجود في الوجهة أو يختلف حجمه
+                    print(f"Предупреждение: CSV-файл {src_csv} отсутствует в целевой "
+                          f"папке или отличается по размеру: {dest_csv}")
                 break
 
-        if not csv_copied:
+        if src_csv is None:
             # لم يتم العثور على ملف CSV في المجلد المصدر.
             print("CSV-файл не найден в исходной папке.")
-            try:
-                # تحذير", "لم يتم العثور على ملف CSV في المجلد المصدر.
-                QMessageBox.warning(
-                    None,
-                    "Предупреждение",
-                    "CSV-файл не найден в исходной папке.")
-            except Exception:
-                pass
 
         # تمت إعادة تنظيم البيانات بنجاح.
         print("Данные успешно реорганизованы.")
-        try:
-            # نجاح", "تم إنشاء الـ Dataset الجديد ونسخ ملف CSV بنجاح."
-            QMessageBox.information(
-                None, "Новый набор данных создан и CSV-файл успешно скопирован.")
-        except Exception:
-            pass
+        return ReorganizeResult(stats, src_csv, report)
+
+    except OperationCancelled as e:
+        # تم إلغاء العملية: تم نسخ {} من {} ملفًا
+        if e.stats is None:
+            print("Операция отменена")
+        else:
+            print(f"Операция отменена: скопировано {e.stats.files_done} "
+                  f"из {e.stats.files_total} файлов")
+        raise
 
     except Exception as e:
         # خطأ أثناء إعادة تنظيم البيانات:
         print(f"Ошибка при реорганизации данных: {e}")
-        try:
-            QMessageBox.critical(None, "Ошибка", str(e))
-        except Exception:
-            pass
+        raise
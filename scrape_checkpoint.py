@@ -0,0 +1,175 @@
+""" Контрольные точки скрапинга на диске. نقاط حفظ الاستخراج على القرص.
+
+Каждая загруженная страница сохраняется дважды: исходный HTML и разобранные
+записи (JSON), с ключом (запрос, адрес поиска, номер страницы). Повторный
+запуск после сбоя берет готовые страницы из хранилища и скачивает только
+недостающие. Если сменился парсер, записи заново разбираются из HTML без
+обращения к сети. Страницы старше max_age считаются устаревшими (вакансии
+меняются) и загружаются заново.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# Версия формата записей: увеличить при изменении JobRecord
+# إصدار تنسيق السجلات: يجب زيادته عند تغيير JobRecord
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "job_analytics",
+                                      "scrape_checkpoints")
+# Сохраненная страница действительна сутки с момента загрузки
+# الصفحة المحفوظة صالحة يوماً واحداً منذ تحميلها
+DEFAULT_MAX_AGE = 24 * 3600
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Запись через временный файл: оборванная запись не портит страницу
+    # الكتابة عبر ملف مؤقت: الانقطاع لا يفسد الصفحة
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ScrapeCheckpoint:
+    """
+    Хранилище загруженных страниц - مخزن الصفحات المحملة
+    """
+
+    def __init__(self, checkpoint_dir: Optional[str] = None,
+                 max_age: Optional[float] = DEFAULT_MAX_AGE):
+        """
+        Args:
+            checkpoint_dir (str): Папка хранилища (по умолчанию scrape_checkpoints
+                                  в JOB_ANALYTICS_CACHE_DIR или ~/.cache/job_analytics)
+                                  مجلد المخزن
+            max_age (float): Секунд с загрузки страницы, после которых она
+                             загружается заново (None - без ограничения)
+                             ثواني منذ تحميل الصفحة قبل إعادة تحميلها
+        """
+        env_dir = os.environ.get("JOB_ANALYTICS_CACHE_DIR")
+        self.checkpoint_dir = (checkpoint_dir
+                               or (env_dir and os.path.join(env_dir, "scrape_checkpoints"))
+                               or DEFAULT_CHECKPOINT_DIR)
+        self.max_age = max_age
+        # Страницы, взятые из хранилища / загруженные из сети; счетчики
+        # обновляются из потоков загрузки
+        # الصفحات المأخوذة من المخزن / المحملة من الشبكة؛ تُحدث من خيوط التحميل
+        self.resumed = 0
+        self.fetched = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _is_fresh(self, html_path: str, json_path: str) -> bool:
+        # Время загрузки - mtime HTML (JSON перезаписывается при новом разборе)
+        # زمن التحميل هو mtime لملف HTML (JSON يُعاد كتابته عند إعادة التحليل)
+        path = html_path if os.path.exists(html_path) else json_path
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return False
+        return self.max_age is None or time.time() - mtime <= self.max_age
+
+    def _query_dir(self, search_query: str, base_url: str) -> str:
+        key = hashlib.blake2b(f"{base_url}\n{search_query}".encode("utf-8"),
+                              digest_size=12).hexdigest()
+        return os.path.join(self.checkpoint_dir, key)
+
+    def _page_paths(self, search_query: str, base_url: str, page_num: int) -> Tuple[str, str]:
+        base = os.path.join(self._query_dir(search_query, base_url), f"page_{page_num:05d}")
+        return base + ".html", base + ".json"
+
+    def save_html(self, search_query: str, base_url: str, page_num: int, content: bytes) -> None:
+        """
+        Сохранение исходного HTML страницы - حفظ HTML الأصلي للصفحة
+        """
+        os.makedirs(self._query_dir(search_query, base_url), exist_ok=True)
+        html_path, _ = self._page_paths(search_query, base_url, page_num)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        _write_atomic(html_path, content)
+        self._count("fetched")
+
+    def save_records(self, search_query: str, base_url: str, page_num: int, parser: str,
+                     page_limit: Optional[int], records: List, skipped: int) -> None:
+        """
+        Сохранение разобранных записей страницы - حفظ السجلات المحللة للصفحة
+        """
+        os.makedirs(self._query_dir(search_query, base_url), exist_ok=True)
+        _, json_path = self._page_paths(search_query, base_url, page_num)
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "parser": parser,
+            "page_limit": page_limit,
+            "skipped": skipped,
+            "records": [list(record) for record in records],
+        }
+        _write_atomic(json_path, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def load_page(self, search_query: str, base_url: str, page_num: int, parser: str,
+                  parse_func: Callable, record_type: Callable) -> Optional[Tuple]:
+        """
+        Страница из хранилища или None - الصفحة من المخزن أو None
+
+        Args:
+            parser (str): Имя текущего парсера - اسم المحلل الحالي
+            parse_func (Callable): Парсер для повторного разбора HTML - محلل لإعادة التحليل
+            record_type (Callable): Класс записи (JobRecord) - صنف السجل
+
+        Returns:
+            Optional[Tuple]: (page_limit, records, skipped) - (حد الصفحات، السجلات، المتخطاة)
+        """
+        html_path, json_path = self._page_paths(search_query, base_url, page_num)
+        if not self._is_fresh(html_path, json_path):
+            return None
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") == CHECKPOINT_VERSION and payload.get("parser") == parser:
+                self._count("resumed")
+                records = [record_type(*row) for row in payload["records"]]
+                return payload["page_limit"], records, payload["skipped"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        # Записей нет или они от другого парсера: разобрать сохраненный HTML
+        # لا توجد سجلات أو من محلل آخر: تحليل HTML المحفوظ
+        if not os.path.exists(html_path):
+            return None
+        with open(html_path, "rb") as f:
+            result = parse_func(f.read())
+        self.save_records(search_query, base_url, page_num, parser, *result)
+        self._count("resumed")
+        return result
+
+    def completed_pages(self, search_query: str, base_url: str) -> List[int]:
+        """
+        Номера сохраненных действительных страниц запроса
+        أرقام الصفحات المحفوظة الصالحة للاستعلام
+        """
+        query_dir = self._query_dir(search_query, base_url)
+        if not os.path.isdir(query_dir):
+            return []
+        pages = set()
+        for name in os.listdir(query_dir):
+            if name.startswith("page_") and name.endswith((".html", ".json")):
+                pages.add(int(name[5:10]))
+        return sorted(page for page in pages
+                      if self._is_fresh(*self._page_paths(search_query, base_url, page)))
+
+    def clear_query(self, search_query: str, base_url: str) -> None:
+        """
+        Удаление страниц одного запроса - حذف صفحات استعلام واحد
+        """
+        shutil.rmtree(self._query_dir(search_query, base_url), ignore_errors=True)
+
+    def clear(self) -> None:
+        """Очистка хранилища - مسح المخزن"""
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
@@ -0,0 +1,203 @@
+""" Токенизатор столбца skills и инвертированный индекс навыков.
+ محلل عمود المهارات وفهرس مقلوب للمهارات.
+
+Столбец skills, записанный scrape_wuzzuf_jobs, - это одна строка вида
+"Full TimeOn-siteExperienced · 3 - 5 Yrs of Exp · Python · Django".
+Флаги типа работы склеены в первом сегменте, затем идут опыт и навыки.
+Индекс хранит для каждого навыка сжатый список номеров строк (дельта +
+varint), поэтому запросы AND/OR и топ-k не требуют повторного разбора строк.
+"""
+
+import heapq
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Флаги типа работы, формата и уровня, которые сайт склеивает без разделителя
+# أنواع العمل ومستوى الخبرة التي يلصقها الموقع بدون فاصل
+JOB_FLAGS = [
+    "Full Time", "Part Time", "Freelance / Project", "Internship",
+    "Shift Based", "Volunteering", "Work From Home",
+    "On-site", "Remote", "Hybrid",
+    "Entry Level", "Experienced", "Senior Management", "Manager",
+    "Student", "Not specified",
+]
+
+# Разделители навыков: "·" (cp1251/latin-1), "�" после неверной декодировки,
+# "∑" после старого чтения в macroman فواصل المهارات
+_SEPARATOR_RE = re.compile(r"\s*[·�•∑|]\s*")
+_FLAGS_RE = re.compile(
+    "|".join(re.escape(flag) for flag in sorted(JOB_FLAGS, key=len, reverse=True)),
+    re.IGNORECASE)
+_EXPERIENCE_RE = re.compile(r"^\d+\s*(?:-\s*\d+|\+)?\s*yrs?\s+of\s+exp", re.IGNORECASE)
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Нормализация навыка: нижний регистр и одиночные пробелы - توحيد اسم المهارة
+    """
+    return _SPACES_RE.sub(" ", str(skill)).strip().lower()
+
+
+def split_skills_text(text: Optional[str]) -> Tuple[List[str], List[str]]:
+    """
+    Разбор строки skills на флаги работы и навыки - تقسيم نص المهارات
+
+    Args:
+        text (str): Значение столбца skills - قيمة عمود المهارات
+
+    Returns:
+        Tuple[List[str], List[str]]: (флаги, навыки) без повторов - (الأعلام، المهارات)
+    """
+    if text is None or not isinstance(text, str):
+        return [], []
+
+    segments = _SEPARATOR_RE.split(text.strip().strip('"'))
+    flags: List[str] = []
+    if segments:
+        # Первый сегмент: снять склеенные флаги с начала строки
+        # المقطع الأول: إزالة الأعلام الملتصقة من بداية النص
+        head = segments[0].strip().strip('"')
+        match = _FLAGS_RE.match(head)
+        while match:
+            flags.append(normalize_skill(match.group(0)))
+            head = head[match.end():].lstrip()
+            match = _FLAGS_RE.match(head)
+        segments[0] = head
+
+    skills: List[str] = []
+    seen = set()
+    for segment in segments:
+        skill = normalize_skill(segment)
+        if not skill or _EXPERIENCE_RE.match(skill) or skill in seen:
+            continue
+        seen.add(skill)
+        skills.append(skill)
+    return flags, skills
+
+
+def tokenize_skills(text: Optional[str]) -> List[str]:
+    """
+    Список нормализованных навыков строки - قائمة المهارات الموحدة
+    """
+    return split_skills_text(text)[1]
+
+
+def encode_postings(row_ids: Iterable[int]) -> bytes:
+    """
+    Сжатие возрастающего списка номеров строк (дельта + varint)
+    ضغط قائمة أرقام الصفوف المتزايدة
+    """
+    out = bytearray()
+    previous = 0
+    for row_id in row_ids:
+        delta = row_id - previous
+        previous = row_id
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> np.ndarray:
+    """
+    Распаковка списка номеров строк - فك ضغط قائمة أرقام الصفوف
+    """
+    row_ids = []
+    value = 0
+    shift = 0
+    current = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        current += value
+        row_ids.append(current)
+        value = 0
+        shift = 0
+    return np.array(row_ids, dtype=np.int64)
+
+
+class SkillIndex:
+    """
+    Инвертированный индекс: навык -> сжатый список строк
+    فهرس مقلوب: المهارة -> قائمة مضغوطة بأرقام الصفوف
+    """
+
+    def __init__(self, skills_texts: Iterable[Optional[str]]):
+        """
+        Args:
+            skills_texts: Значения столбца skills по порядку строк - قيم عمود المهارات
+        """
+        postings: Dict[str, List[int]] = {}
+        self.num_rows = 0
+        for row_id, text in enumerate(skills_texts):
+            self.num_rows += 1
+            for skill in tokenize_skills(text):
+                postings.setdefault(skill, []).append(row_id)
+
+        self._postings: Dict[str, bytes] = {
+            skill: encode_postings(ids) for skill, ids in postings.items()}
+        # Частоты считаются один раз при построении تُحسب التكرارات مرة واحدة
+        self._counts: Dict[str, int] = {
+            skill: len(ids) for skill, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def __contains__(self, skill: str) -> bool:
+        return normalize_skill(skill) in self._postings
+
+    def postings(self, skill: str) -> np.ndarray:
+        """
+        Номера строк с навыком - أرقام الصفوف التي تحتوي على المهارة
+        """
+        data = self._postings.get(normalize_skill(skill))
+        if data is None:
+            return np.empty(0, dtype=np.int64)
+        return decode_postings(data)
+
+    def count(self, skill: str) -> int:
+        """Число строк с навыком - عدد الصفوف التي تحتوي على المهارة"""
+        return self._counts.get(normalize_skill(skill), 0)
+
+    def query_all(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Строки, содержащие все навыки (AND) - الصفوف التي تحتوي على كل المهارات
+        """
+        names = [normalize_skill(skill) for skill in skills]
+        if not names:
+            return np.empty(0, dtype=np.int64)
+        # Пересечение начинается с самого короткого списка
+        # التقاطع يبدأ من أقصر قائمة
+        names.sort(key=lambda name: self._counts.get(name, 0))
+        result = self.postings(names[0])
+        for name in names[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, self.postings(name), assume_unique=True)
+        return result
+
+    def query_any(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Строки, содержащие хотя бы один навык (OR) - الصفوف التي تحتوي على أي مهارة
+        """
+        lists = [self.postings(skill) for skill in skills]
+        if not lists:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(lists))
+
+    def top_skills(self, k: int = 10) -> List[Tuple[str, int]]:
+        """
+        k самых частых навыков - أكثر k مهارات تكرارًا
+        """
+        # При равной частоте - по алфавиту عند التساوي - أبجديًا
+        return heapq.nsmallest(k, self._counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def postings_nbytes(self) -> int:
+        """Размер сжатых списков в байтах - حجم القوائم المضغوطة بالبايت"""
+        return sum(len(data) for data in self._postings.values())
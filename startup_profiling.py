@@ -0,0 +1,163 @@
+""" Профилирование запуска и отложенный импорт модулей. قياس زمن بدء التشغيل
+ والاستيراد المؤجل للوحدات.
+
+StartupProfiler отмечает время импорта каждого модуля и этапы запуска
+(окно создано, первая отрисовка) относительно момента загрузки этого модуля.
+lazy_callable откладывает импорт тяжелого модуля (pandas, matplotlib,
+requests) до первого вызова функции, а preload_modules загружает их в
+фоновом потоке после появления окна.
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Печатать отчет о запуске, если переменная установлена
+# طباعة تقرير بدء التشغيل إذا كان المتغير مضبوطًا
+STARTUP_REPORT_ENV = "JOB_ANALYTICS_STARTUP_REPORT"
+
+
+class StartupProfiler:
+    """
+    Время импорта модулей и этапов запуска - زمن استيراد الوحدات ومراحل التشغيل
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.origin = clock()
+        self.imports: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Замер блока импорта: with profiler.measure("PySide6.QtWidgets"): ...
+        قياس كتلة استيراد
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.imports.setdefault(name, self._clock() - start)
+
+    def import_module(self, name: str):
+        """
+        Импорт модуля с замером (повторный импорт не учитывается)
+        استيراد وحدة مع قياس الزمن
+        """
+        if name in sys.modules:
+            return sys.modules[name]
+        with self.measure(name):
+            return importlib.import_module(name)
+
+    def mark(self, label: str) -> float:
+        """
+        Отметка этапа запуска (первая отметка сохраняется) - تسجيل مرحلة التشغيل
+
+        Returns:
+            float: Секунды от начала - الثواني منذ البداية
+        """
+        elapsed = self._clock() - self.origin
+        with self._lock:
+            return self.marks.setdefault(label, elapsed)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Результаты в секундах - النتائج بالثواني"""
+        with self._lock:
+            return {"imports": dict(self.imports), "marks": dict(self.marks)}
+
+    def report(self) -> str:
+        """
+        Текстовый отчет: импорты по убыванию времени, затем этапы
+        تقرير نصي: الاستيرادات حسب الزمن ثم المراحل
+        """
+        data = self.as_dict()
+        lines = ["Startup profile (ms):"]
+        imports: List[Tuple[str, float]] = sorted(
+            data["imports"].items(), key=lambda item: item[1], reverse=True)
+        for name, seconds in imports:
+            lines.append(f"  import {name:<28} {seconds * 1000:8.1f}")
+        for label, seconds in sorted(data["marks"].items(), key=lambda item: item[1]):
+            lines.append(f"  {label:<35} {seconds * 1000:8.1f}")
+        return "\n".join(lines)
+
+
+profiler = StartupProfiler()
+
+
+class LazyCallable:
+    """
+    Функция модуля, импортируемого при первом вызове
+    دالة من وحدة تُستورد عند أول استدعاء
+    """
+
+    def __init__(self, module_name: str, attr: str,
+                 startup_profiler: Optional[StartupProfiler] = None):
+        self.module_name = module_name
+        self.attr = attr
+        self._profiler = startup_profiler or profiler
+        self._target: Optional[Callable] = None
+        self.__name__ = attr
+        self.__doc__ = f"Lazy {module_name}.{attr}"
+
+    def resolve(self) -> Callable:
+        """Импортировать модуль и вернуть функцию - استيراد الوحدة وإرجاع الدالة"""
+        if self._target is None:
+            module = self._profiler.import_module(self.module_name)
+            self._target = getattr(module, self.attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self.module_name}.{self.attr}>"
+
+
+def lazy_callable(module_name: str, attr: str) -> LazyCallable:
+    """
+    Отложенная ссылка на функцию модуля - مرجع مؤجل لدالة وحدة
+    """
+    return LazyCallable(module_name, attr)
+
+
+def preload_modules(module_names: Iterable[str],
+                    startup_profiler: Optional[StartupProfiler] = None) -> threading.Thread:
+    """
+    Фоновый импорт модулей - استيراد الوحدات في الخلفية
+
+    Ошибки импорта не прерывают работу: модуль загрузится при первом вызове
+    и покажет ошибку там. أخطاء الاستيراد لا توقف العمل.
+
+    Returns:
+        threading.Thread: Запущенный поток - الخيط الذي تم تشغيله
+    """
+    active = startup_profiler or profiler
+    names = list(module_names)
+
+    def run() -> None:
+        for name in names:
+            try:
+                active.import_module(name)
+            except Exception as e:
+                print(f"Фоновая загрузка {name} не удалась: {e}")
+        active.mark("background preload done")
+
+    thread = threading.Thread(target=run, name="module-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def report_requested(argv: Optional[List[str]] = None) -> bool:
+    """
+    Нужен ли отчет о запуске (флаг --profile-startup или переменная окружения)
+    هل تقرير بدء التشغيل مطلوب
+    """
+    argv = sys.argv if argv is None else argv
+    return "--profile-startup" in argv or bool(os.environ.get(STARTUP_REPORT_ENV))
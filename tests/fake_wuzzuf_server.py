@@ -0,0 +1,95 @@
+"""Local stand-in for Wuzzuf search pages used by scraping tests
+خادم محلي بديل لصفحات بحث Wuzzuf لاختبارات الاستخراج"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def make_results_page(query: str, page_num: int, total_jobs: int, per_page: int = 30,
+                      link_prefix: str = None) -> str:
+    """إنشاء صفحة نتائج بحث بنفس بنية Wuzzuf (link_prefix مشترك = روابط مكررة بين الاستعلامات)"""
+    link_prefix = link_prefix or query
+    first = page_num * per_page
+    cards = []
+    for n in range(first, min(first + per_page, total_jobs)):
+        posted_class = "css-eg55jf" if n % 2 == 0 else "css-1jldrig"
+        cards.append(
+            '<div class="css-1gatmva">'
+            f'<h2 class="css-193uk2c"><a href="/jobs/p/{link_prefix}-{n}">{query} job {n}</a></h2>'
+            f'<a class="css-ipsyv7">Company {n} -</a>'
+            f'<span class="css-16x61xq">City {n}, Egypt </span>'
+            f'<div class="css-1rhj4yg">Full TimeOn-siteExperienced · Python · Skill {n}</div>'
+            f'<div class="{posted_class}">{n % 7 + 1} days ago</div>'
+            '</div>'
+        )
+    return (f"<html><body><span><strong>{total_jobs}</strong> Jobs Found</span>"
+            f"{''.join(cards)}</body></html>")
+
+
+class FakeWuzzufServer:
+    """خادم HTTP محلي في ثريد منفصل يسجل الطلبات والاتصالات"""
+
+    def __init__(self, total_jobs: int = 95, delay: float = 0.0, per_page: int = 30):
+        self.total_jobs = total_jobs
+        self.delay = delay
+        self.per_page = per_page
+        self.requests = []
+        self.client_ports = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/search/jobs/"
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """معالجة طلب صفحة نتائج (يمكن تخصيصها في الاختبارات)"""
+        params = parse_qs(urlsplit(handler.path).query)
+        query = params.get("q", [""])[0]
+        page_num = int(params.get("start", ["0"])[0])
+        body = make_results_page(query, page_num, self.total_jobs, self.per_page).encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(self.path)
+                    server.client_ports.add(self.client_address[1])
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    if server.delay:
+                        time.sleep(server.delay)
+                    server.handle(self)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -1,5 +1,7 @@
 """Unit tests for annotation.py module using unittest"""
 
+import hashlib
+import json
 import os
 import unittest
 import pandas as pd
@@ -9,7 +11,8 @@ import sys
 
 # إضافة المسار الحالي لاستيراد annotation
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from annotation import create_annotation_file
+from annotation import (create_annotation_file, dir_index_path, hash_cache_path,
+                        iter_file_batches)
 
 
 class TestAnnotationFile(unittest.TestCase):
@@ -150,6 +153,260 @@ class TestAnnotationFile(unittest.TestCase):
         df = pd.read_csv(output_path)
         self.assertIn("nested_file.txt", df['filename'].values)
 
+    def test_parallel_scan_matches_os_walk(self):
+        """Parallel scandir scan lists the same files and sizes as os.walk"""
+        # Arrange: شجرة مجلدات واسعة وعميقة
+        for i in range(6):
+            for j in range(4):
+                folder = os.path.join(self.source_dir, f"class_{i}", f"part_{j}")
+                os.makedirs(folder)
+                for k in range(5):
+                    with open(os.path.join(folder, f"img_{k}.jpg"), 'wb') as f:
+                        f.write(b"x" * (i + j + k + 1))
+        expected = set()
+        for root, _, filenames in os.walk(self.source_dir):
+            for name in filenames:
+                path = os.path.join(root, name)
+                expected.add((name, path, os.path.getsize(path)))
+
+        for workers in (1, 4):
+            output_path = os.path.join(self.test_dir, f"annotation_{workers}.csv")
+
+            # Act
+            create_annotation_file(self.source_dir, output_path, workers=workers)
+
+            # Assert
+            df = pd.read_csv(output_path, encoding='utf-8-sig')
+            self.assertEqual(list(df.columns), ['filename', 'path', 'size_bytes'])
+            rows = set(zip(df['filename'], df['path'], df['size_bytes']))
+            self.assertEqual(rows, expected)
+            self.assertEqual(len(df), len(expected))
+
+    def test_iter_file_batches_one_folder_per_batch(self):
+        """Every batch holds the files of one folder, sorted by name"""
+        nested_dir = os.path.join(self.source_dir, "subfolder")
+        os.makedirs(nested_dir)
+        for name in ("b.txt", "a.txt"):
+            with open(os.path.join(nested_dir, name), 'w') as f:
+                f.write("data")
+
+        batches = list(iter_file_batches(self.source_dir, workers=2))
+
+        self.assertEqual(len(batches), 2)
+        for batch in batches:
+            self.assertEqual(len({os.path.dirname(row[1]) for row in batch}), 1)
+            self.assertEqual([row[0] for row in batch], sorted(row[0] for row in batch))
+
+    def test_empty_folder_leaves_no_output(self):
+        """Empty folder: no annotation or temporary file is left behind"""
+        empty_dir = os.path.join(self.test_dir, "empty_dir")
+        os.makedirs(os.path.join(empty_dir, "nested_empty"))
+        output_path = os.path.join(self.test_dir, "annotation.csv")
+
+        with self.assertRaises(RuntimeError):
+            create_annotation_file(empty_dir, output_path)
+
+        self.assertFalse(os.path.exists(output_path))
+        self.assertFalse(os.path.exists(output_path + ".tmp"))
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlinked_folder_not_followed(self):
+        """Like os.walk, links to folders are neither followed nor listed"""
+        outside = os.path.join(self.test_dir, "outside")
+        os.makedirs(outside)
+        with open(os.path.join(outside, "outside.txt"), 'w') as f:
+            f.write("outside")
+        os.symlink(outside, os.path.join(self.source_dir, "linked"))
+        output_path = os.path.join(self.test_dir, "annotation.csv")
+
+        create_annotation_file(self.source_dir, output_path)
+
+        df = pd.read_csv(output_path)
+        self.assertNotIn("outside.txt", df['filename'].values)
+        self.assertNotIn("linked", df['filename'].values)
+
+
+class TestIncrementalAnnotation(unittest.TestCase):
+    """Incremental mode: reuse unchanged folders and mark changes"""
+
+    OLD_NS = 1_600_000_000 * 10**9
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.test_dir, "dataset")
+        self.output_path = os.path.join(self.test_dir, "annotation.csv")
+        for folder, names in (("cats", ["c1.jpg", "c2.jpg"]),
+                              ("dogs", ["d1.jpg", "d2.jpg"]),
+                              (os.path.join("dogs", "puppies"), ["p1.jpg"])):
+            os.makedirs(os.path.join(self.source_dir, folder))
+            for name in names:
+                self._write(os.path.join(folder, name), b"data")
+        with open(os.path.join(self.source_dir, "labels.txt"), 'w') as f:
+            f.write("cats,dogs")
+        # أزمنة قديمة: المجلدات ليست "حديثة التعديل" عند الفحص
+        self._age_tree(self.OLD_NS)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, relative, data):
+        with open(os.path.join(self.source_dir, relative), 'wb') as f:
+            f.write(data)
+
+    def _age_tree(self, ns, files=True):
+        for root, _, filenames in os.walk(self.source_dir):
+            for name in filenames if files else ():
+                os.utime(os.path.join(root, name), ns=(ns, ns))
+            os.utime(root, ns=(ns, ns))
+
+    def _statuses(self):
+        df = pd.read_csv(self.output_path, encoding='utf-8-sig')
+        return {os.path.relpath(path, self.source_dir): status
+                for path, status in zip(df['path'], df['status'])}
+
+    def test_file_mtimes_are_kept_in_sidecar(self):
+        create_annotation_file(self.source_dir, self.output_path, hash_files=True,
+                               hash_workers=1)
+        df = pd.read_csv(self.output_path, encoding='utf-8-sig')
+        self.assertEqual(list(df.columns), ['filename', 'path', 'size_bytes', 'hash'])
+        with open(dir_index_path(self.output_path), encoding='utf-8') as f:
+            dirs = json.load(f)["dirs"]
+        self.assertEqual(dirs[os.path.join(self.source_dir, "cats")]["files"]["c1.jpg"],
+                         self.OLD_NS)
+
+        # تعديل بنفس الحجم يُكشف بزمن التعديل من الملف الجانبي
+        self._write(os.path.join("cats", "c1.jpg"), b"DATA")
+        stats = create_annotation_file(self.source_dir, self.output_path, incremental=True,
+                                       verify_files=True)
+        self.assertEqual(stats["modified"], 1)
+        self.assertEqual(self._statuses()[os.path.join("cats", "c1.jpg")], "modified")
+
+    def test_incremental_marks_changes(self):
+        create_annotation_file(self.source_dir, self.output_path)
+
+        # Act: إضافة ملف وحذف آخر وتعديل ثالث
+        self._write(os.path.join("cats", "c3.jpg"), b"new")
+        os.remove(os.path.join(self.source_dir, "dogs", "d1.jpg"))
+        self._write(os.path.join("dogs", "d2.jpg"), b"bigger data")
+        self._age_tree(self.OLD_NS + 10**9, files=False)
+        stats = create_annotation_file(self.source_dir, self.output_path, incremental=True)
+
+        # Assert
+        statuses = self._statuses()
+        self.assertEqual(statuses[os.path.join("cats", "c3.jpg")], "added")
+        self.assertEqual(statuses[os.path.join("dogs", "d1.jpg")], "removed")
+        self.assertEqual(statuses[os.path.join("dogs", "d2.jpg")], "modified")
+        self.assertEqual(statuses[os.path.join("cats", "c1.jpg")], "unchanged")
+        self.assertEqual((stats["added"], stats["removed"], stats["modified"]), (1, 1, 1))
+        self.assertEqual(stats["files"], 6)
+
+        # الملفات المحذوفة لا تنتقل إلى التشغيل التالي
+        stats = create_annotation_file(self.source_dir, self.output_path, incremental=True)
+        self.assertNotIn(os.path.join("dogs", "d1.jpg"), self._statuses())
+        self.assertEqual(stats["unchanged"], 6)
+        self.assertEqual(stats["scanned_dirs"], 0)
+        self.assertEqual(stats["reused_dirs"], 4)
+
+    def test_only_changed_folders_are_rescanned(self):
+        create_annotation_file(self.source_dir, self.output_path)
+
+        self._write(os.path.join("dogs", "puppies", "p2.jpg"), b"new")
+        os.utime(os.path.join(self.source_dir, "dogs", "puppies"),
+                 ns=(self.OLD_NS + 10**9, self.OLD_NS + 10**9))
+        stats = create_annotation_file(self.source_dir, self.output_path,
+                                       incremental=True, workers=1)
+
+        self.assertEqual(stats["scanned_dirs"], 1)
+        self.assertEqual(stats["reused_dirs"], 3)
+        self.assertEqual(self._statuses()[os.path.join("dogs", "puppies", "p2.jpg")], "added")
+
+    def test_verify_files_detects_in_place_edits(self):
+        create_annotation_file(self.source_dir, self.output_path)
+
+        # تعديل المحتوى في المكان لا يغير زمن المجلد
+        cats_dir = os.path.join(self.source_dir, "cats")
+        self._write(os.path.join("cats", "c1.jpg"), b"edited in place")
+        os.utime(cats_dir, ns=(self.OLD_NS, self.OLD_NS))
+
+        stats = create_annotation_file(self.source_dir, self.output_path, incremental=True)
+        self.assertEqual(stats["modified"], 0)
+
+        stats = create_annotation_file(self.source_dir, self.output_path,
+                                       incremental=True, verify_files=True)
+        self.assertEqual(stats["modified"], 1)
+        self.assertEqual(self._statuses()[os.path.join("cats", "c1.jpg")], "modified")
+
+    def test_recently_modified_folders_are_rescanned(self):
+        """Folders touched just before the scan are never trusted by mtime"""
+        os.utime(os.path.join(self.source_dir, "cats"))
+        create_annotation_file(self.source_dir, self.output_path)
+
+        stats = create_annotation_file(self.source_dir, self.output_path, incremental=True)
+
+        self.assertEqual(stats["scanned_dirs"], 1)
+        self.assertEqual(stats["reused_dirs"], 3)
+
+    def test_without_previous_manifest_everything_is_added(self):
+        stats = create_annotation_file(self.source_dir, self.output_path, incremental=True)
+
+        self.assertEqual(stats["added"], 6)
+        self.assertEqual(set(self._statuses().values()), {"added"})
+
+    def test_edited_manifest_invalidates_folder_index(self):
+        create_annotation_file(self.source_dir, self.output_path)
+        self.assertTrue(os.path.exists(dir_index_path(self.output_path)))
+
+        # ملف annotation عُدل يدوياً: الملف الجانبي لم يعد صالحاً
+        os.utime(self.output_path, ns=(self.OLD_NS, self.OLD_NS))
+        stats = create_annotation_file(self.source_dir, self.output_path, incremental=True)
+
+        self.assertEqual(stats["reused_dirs"], 0)
+        self.assertEqual(stats["unchanged"], 6)
+
+    def _hashes(self):
+        df = pd.read_csv(self.output_path, encoding='utf-8-sig', keep_default_na=False)
+        return {os.path.relpath(path, self.source_dir): digest
+                for path, digest in zip(df['path'], df['hash'])}
+
+    def test_hash_column_matches_content(self):
+        stats = create_annotation_file(self.source_dir, self.output_path,
+                                       hash_files=True, hash_workers=1)
+
+        hashes = self._hashes()
+        self.assertEqual(len(hashes), 6)
+        self.assertEqual(hashes[os.path.join("cats", "c1.jpg")],
+                         hashlib.blake2b(b"data", digest_size=16).hexdigest())
+        self.assertEqual(stats["hashed"], 6)
+
+    def test_hash_cache_rehashes_only_changed_files(self):
+        create_annotation_file(self.source_dir, self.output_path, hash_files=True,
+                               hash_workers=2)
+        self.assertTrue(os.path.exists(hash_cache_path(self.output_path)))
+
+        self._write(os.path.join("dogs", "d2.jpg"), b"other")
+        os.utime(os.path.join(self.source_dir, "dogs", "d2.jpg"),
+                 ns=(self.OLD_NS + 10**9, self.OLD_NS + 10**9))
+        stats = create_annotation_file(self.source_dir, self.output_path, hash_files=True,
+                                       hash_workers=2)
+
+        self.assertEqual((stats["hashed"], stats["hash_cache_hits"]), (1, 5))
+        self.assertEqual(self._hashes()[os.path.join("dogs", "d2.jpg")],
+                         hashlib.blake2b(b"other", digest_size=16).hexdigest())
+
+    def test_incremental_with_hash_leaves_removed_hash_empty(self):
+        create_annotation_file(self.source_dir, self.output_path, hash_files=True,
+                               hash_workers=1)
+
+        os.remove(os.path.join(self.source_dir, "dogs", "d1.jpg"))
+        self._age_tree(self.OLD_NS + 10**9, files=False)
+        create_annotation_file(self.source_dir, self.output_path, incremental=True,
+                               hash_files=True, hash_workers=1)
+
+        hashes = self._hashes()
+        self.assertEqual(hashes[os.path.join("dogs", "d1.jpg")], "")
+        self.assertEqual(self._statuses()[os.path.join("dogs", "d1.jpg")], "removed")
+        self.assertTrue(hashes[os.path.join("dogs", "d2.jpg")])
+
 
 def test_permission_handling():
     """Test that function handles permission errors gracefully"""
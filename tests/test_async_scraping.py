@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_scraping import run_async_scrape
+from web_scraping import scrape_wuzzuf_jobs
+from tests.fake_wuzzuf_server import FakeWuzzufServer
+
+
+class TestAsyncScraping(unittest.TestCase):
+    """اختبارات محرك الاستخراج غير المتزامن مع خادم محلي"""
+
+    def test_matches_sync_output(self):
+        with FakeWuzzufServer(total_jobs=95) as server:
+            ok_sync, sync_data = scrape_wuzzuf_jobs("python", 10, base_url=server.base_url)
+            ok_async, async_data = run_async_scrape("python", 10, concurrency=4,
+                                                    base_url=server.base_url)
+
+        self.assertTrue(ok_sync)
+        self.assertTrue(ok_async)
+        self.assertEqual(len(async_data), 6)
+        self.assertEqual(len(async_data[0]), 95)
+        # نفس الترتيب ونفس الأعمدة كما في الوضع المتزامن
+        self.assertEqual(async_data, sync_data)
+
+    def test_per_page_callbacks(self):
+        calls = []
+        pages = {}
+
+        def on_page(page_num, pages_done, pages_total, page_data):
+            calls.append((page_num, pages_done, pages_total, len(page_data[0])))
+            pages[page_num] = page_data
+
+        with FakeWuzzufServer(total_jobs=300, delay=0.02) as server:
+            success, data = run_async_scrape("python", 5, concurrency=5, on_page=on_page,
+                                             base_url=server.base_url)
+            self.assertGreater(server.max_in_flight, 1)
+
+        self.assertTrue(success)
+        self.assertEqual(len(data[0]), 150)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(calls[0], (0, 1, 5, 30))
+        self.assertEqual(sorted(call[0] for call in calls), [0, 1, 2, 3, 4])
+        # كل استدعاء يحمل صفوف الصفحة الجديدة فقط
+        self.assertEqual([call[1] for call in calls], [1, 2, 3, 4, 5])
+        self.assertEqual([call[3] for call in calls], [30] * 5)
+        self.assertEqual([row for page in sorted(pages) for row in pages[page][0]], data[0])
+
+    def test_failure_returns_empty(self):
+        success, data = run_async_scrape("python", 3, concurrency=2,
+                                         base_url="http://127.0.0.1:9/search/jobs/")
+        self.assertFalse(success)
+        self.assertEqual(data, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_DIR)
+
+import cli
+from tests.fake_wuzzuf_server import FakeWuzzufServer
+
+
+def run_cli(*args, env=None):
+    """تشغيل سطر الأوامر في عملية منفصلة"""
+    return subprocess.run([sys.executable, os.path.join(PROJECT_DIR, "cli.py"), *args],
+                          capture_output=True, text=True, env=env, cwd=PROJECT_DIR, timeout=120)
+
+
+class TestCli(unittest.TestCase):
+    """اختبارات واجهة سطر الأوامر"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.env = dict(os.environ, JOB_ANALYTICS_CACHE_DIR=os.path.join(self.test_dir, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_import_is_light(self):
+        code = ("import sys; sys.path.insert(0, '.'); import cli; cli.build_parser(); "
+                "heavy = [m for m in ('PySide6', 'pandas', 'requests', 'matplotlib') "
+                "if m in sys.modules]; print(heavy)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=PROJECT_DIR, timeout=60)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_help_lists_subcommands(self):
+        result = run_cli("--help")
+        self.assertEqual(result.returncode, 0)
+        for command in ("scrape", "annotate", "reorganize", "duplicates", "search-by-date",
+                        "analyze"):
+            self.assertIn(command, result.stdout)
+
+    def test_scrape_to_csv(self):
+        output = os.path.join(self.test_dir, "jobs.csv")
+        with FakeWuzzufServer(total_jobs=45) as server:
+            code = cli.main(["scrape", "python", "--pages", "3", "--output", output,
+                             "--base-url", server.base_url, "--no-cache"])
+        self.assertEqual(code, 0)
+        with open(output, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 46)
+
+    def test_resume_with_several_queries_is_rejected(self):
+        result = run_cli("scrape", "python", "django", "--resume", env=self.env)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("--resume", result.stderr)
+
+    def test_reorganize_without_qt(self):
+        source = os.path.join(self.test_dir, "source")
+        dest = os.path.join(self.test_dir, "dest")
+        os.makedirs(os.path.join(source, "sub"))
+        for name in ("data.csv", os.path.join("sub", "a.txt")):
+            with open(os.path.join(source, name), "w") as f:
+                f.write("x")
+
+        code = ("import sys; sys.path.insert(0, '.'); import cli; "
+                f"rc = cli.main(['reorganize', {source!r}, {dest!r}]); "
+                "print(rc, 'PySide6' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=PROJECT_DIR, timeout=60)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "0 False")
+        self.assertTrue(os.path.exists(os.path.join(dest, "sub", "a.txt")))
+
+    def test_reorganize_errors_return_1(self):
+        from file_operations import OperationCancelled
+
+        source = os.path.join(self.test_dir, "source")
+        os.makedirs(source)
+        for error in (RuntimeError("worker failed"), OperationCancelled()):
+            with patch("reorganize_dataset.reorganize_dataset", side_effect=error):
+                code = cli.main(["reorganize", source, os.path.join(self.test_dir, "dest")])
+            self.assertEqual(code, 1)
+
+    def test_annotate(self):
+        save_path = os.path.join(self.test_dir, "annotation.csv")
+        self.assertEqual(cli.main(["annotate", PROJECT_DIR + "/tests/fixtures", save_path]), 0)
+        self.assertTrue(os.path.exists(save_path))
+        self.assertEqual(cli.main(["annotate", os.path.join(self.test_dir, "missing"),
+                                   save_path]), 1)
+
+    def test_duplicates_report(self):
+        source = os.path.join(self.test_dir, "source")
+        os.makedirs(source)
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            with open(os.path.join(source, name), "w") as f:
+                f.write("same" if name != "c.jpg" else "diff")
+        report = os.path.join(self.test_dir, "duplicates.csv")
+
+        self.assertEqual(cli.main(["duplicates", source, "--report", report,
+                                   "--hash-workers", "1"]), 0)
+        with open(report, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(sorted(os.path.basename(row["path"]) for row in rows),
+                         ["a.jpg", "b.jpg"])
+
+    def test_search_by_date(self):
+        csv_path = os.path.join(self.test_dir, "jobs.csv")
+        pd.DataFrame({
+            'job_title': ['Developer', 'Analyst'],
+            'company_name': ['Company A', 'Company B'],
+            'date': ['1 days ago', '3 days ago'],
+            'location': ['Cairo', 'Giza'],
+            'skills': ['Python', 'SQL'],
+            'links': ['link1', 'link2'],
+        }).to_csv(csv_path, index=False, sep=';')
+        output = os.path.join(self.test_dir, "found.csv")
+
+        yesterday = (datetime.now() - timedelta(days=1)).strftime('%d/%m/%Y')
+        result = run_cli("search-by-date", yesterday, "--csv", csv_path,
+                         "--output", output, env=self.env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        found = pd.read_csv(output)
+        self.assertEqual(found['job_title'].tolist(), ['Developer'])
+
+    def test_analyze_missing_file(self):
+        result = run_cli("analyze", os.path.join(self.test_dir, "missing.csv"), env=self.env)
+        self.assertEqual(result.returncode, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -45,6 +45,18 @@ class TestDataAnalysis(unittest.TestCase):
         self.assertIsNotNone(analyzer.df)
         self.assertEqual(len(analyzer.df), 4)
 
+    def test_load_data_compact(self):
+        analyzer = DataAnalyzer()
+        self.assertTrue(analyzer.load_data(self.temp_file.name, compact=True))
+        
+        self.assertNotEqual(analyzer.df['location'].dtype, object)
+        report = analyzer.memory_report()
+        self.assertIn('TOTAL', report.index)
+        self.assertLess(report.loc['TOTAL', 'after_bytes'], report.loc['TOTAL', 'before_bytes'])
+        
+        analyzer.clean_data()
+        self.assertEqual(len(analyzer.df), 4)
+
     def test_load_data_file_not_found(self):
         analyzer = DataAnalyzer()
         success = analyzer.load_data("nonexistent.csv")
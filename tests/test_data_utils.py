@@ -3,12 +3,18 @@ import unittest
 import os
 import sys
 import pandas as pd
+import shutil
 import tempfile
 from datetime import datetime
+from unittest.mock import patch
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_utils import read_dataset, clean_dataset, convert_date, process_dataset, get_data_by_date
+from data_utils import (read_dataset, clean_dataset, convert_date, convert_dates, process_dataset,
+                        get_data_by_date, get_dataset_index, iter_clean_chunks,
+                        estimate_chunksize, compact_dataframe, memory_report,
+                        detect_encoding)
+from dataset_cache import DatasetCache
 
 
 class TestDataUtils(unittest.TestCase):
@@ -27,10 +33,17 @@ class TestDataUtils(unittest.TestCase):
         self.temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
         self.df.to_csv(self.temp_file.name, index=False, sep=';')
         self.temp_file.close()
+
+        # الذاكرة المؤقتة في مجلد مؤقت بدلاً من ~/.cache/job_analytics
+        self.cache_dir = tempfile.mkdtemp()
+        cache_patcher = patch("dataset_cache._default_cache", DatasetCache(self.cache_dir))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
     
     def tearDown(self):
         if os.path.exists(self.temp_file.name):
             os.unlink(self.temp_file.name)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
 
     def test_read_dataset(self):
         df = read_dataset(self.temp_file.name)
@@ -55,6 +68,21 @@ class TestDataUtils(unittest.TestCase):
         result = convert_date('')
         self.assertEqual(result, 'not date')
 
+    def test_convert_dates_matches_convert_date(self):
+        # التحويل المتجه يعطي نفس نتيجة convert_date
+        values = pd.Series(['2 days ago', '3 weeks ago', '1 month ago', '2 years ago',
+                            '2 days ago', '', None, 'not date', 'invalid date'])
+        result = convert_dates(values, as_string=True)
+        self.assertEqual(result.tolist(), [convert_date(v) for v in values])
+
+    def test_convert_dates_datetime64(self):
+        now = datetime(2024, 3, 31, 15, 30)
+        result = convert_dates(pd.Series(['1 day ago', '1 month ago', 'not date']), now=now)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result))
+        self.assertEqual(result[0], pd.Timestamp(2024, 3, 30))
+        self.assertEqual(result[1], pd.Timestamp(2024, 2, 29))
+        self.assertTrue(pd.isna(result[2]))
+
     def test_process_dataset(self):
         df = process_dataset(self.temp_file.name)
         self.assertIsInstance(df, pd.DataFrame)
@@ -76,6 +104,94 @@ class TestDataUtils(unittest.TestCase):
         result = get_data_by_date('2024-01-01', self.temp_file.name)
         self.assertIsNone(result)
 
+    def test_get_dataset_index_is_reused(self):
+        # الفهرس يُبنى مرة واحدة لنفس الملف
+        first = get_dataset_index(self.temp_file.name)
+        second = get_dataset_index(self.temp_file.name)
+        self.assertIs(first, second)
+        self.assertEqual(len(first.lookup('not date')), 3)
+
+    def test_iter_clean_chunks_drops_cross_chunk_duplicates(self):
+        # التكرارات بين الدفعات تُحذف عبر بصمات الصفوف
+        df = pd.concat([self.df, self.df.iloc[[0]]], ignore_index=True)
+        df.to_csv(self.temp_file.name, index=False, sep=';')
+
+        chunks = list(iter_clean_chunks(self.temp_file.name, chunksize=1))
+        combined = pd.concat(chunks)
+        self.assertEqual(len(combined), 3)
+        self.assertEqual(combined['job_title'].tolist(), ['Developer', 'Analyst', 'Engineer'])
+
+    def test_get_data_by_date_stream_matches_in_memory(self):
+        df = self.df.copy()
+        df['date'] = ['2 days ago', '3 days ago', '2 days ago']
+        df = pd.concat([df, df.iloc[[0]]], ignore_index=True)
+        df.to_csv(self.temp_file.name, index=False, sep=';')
+        target = convert_date('2 days ago')
+
+        streamed = get_data_by_date(target, self.temp_file.name, stream=True, chunksize=1)
+        in_memory = get_data_by_date(target, self.temp_file.name, use_cache=False)
+        self.assertEqual(streamed['job_title'].tolist(), in_memory['job_title'].tolist())
+        self.assertEqual(streamed['date'].tolist(), [target, target])
+        self.assertIsNone(get_data_by_date('01/01/2000', self.temp_file.name, stream=True))
+
+    def test_estimate_chunksize(self):
+        self.assertGreaterEqual(estimate_chunksize(self.temp_file.name, memory_budget=1), 1)
+        self.assertGreater(estimate_chunksize(self.temp_file.name), 1000)
+
+    def test_compact_dataframe(self):
+        # الأعمدة المتكررة تتحول إلى category
+        df = pd.DataFrame({
+            'company_name': ['Company A', 'Company B'] * 50,
+            'links': [f'link{i}' for i in range(100)],
+            'count': range(100),
+        })
+        compact = compact_dataframe(df)
+        self.assertIsInstance(compact['company_name'].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(compact['links'].dtype, pd.CategoricalDtype)
+        self.assertEqual(compact['count'].dtype, df['count'].dtype)
+        self.assertEqual(compact['links'].tolist(), df['links'].tolist())
+
+        report = memory_report(df, compact)
+        self.assertEqual(list(report.columns), ['before_bytes', 'after_bytes', 'ratio'])
+        self.assertLess(report.loc['company_name', 'after_bytes'],
+                        report.loc['company_name', 'before_bytes'])
+        self.assertEqual(report.loc['TOTAL', 'before_bytes'],
+                         report.drop(index='TOTAL')['before_bytes'].sum())
+
+    def test_read_dataset_compact(self):
+        df = read_dataset(self.temp_file.name, compact=True)
+        self.assertEqual(len(df), 3)
+        self.assertEqual(len(process_dataset(self.temp_file.name)), 3)
+
+    def write_bytes(self, content: bytes):
+        with open(self.temp_file.name, 'wb') as f:
+            f.write(content)
+
+    def test_detect_encoding(self):
+        self.assertEqual(detect_encoding(self.temp_file.name), 'utf-8')
+
+        self.write_bytes('job_title;date\nРазработчик;2 days ago\n'.encode('cp1251'))
+        self.assertEqual(detect_encoding(self.temp_file.name), 'cp1251')
+        self.assertEqual(read_dataset(self.temp_file.name)['job_title'][0], 'Разработчик')
+
+        self.write_bytes(b'\xef\xbb\xbfjob_title;date\nDev;1 day ago\n')
+        self.assertEqual(detect_encoding(self.temp_file.name), 'utf-8-sig')
+        self.assertEqual(list(read_dataset(self.temp_file.name).columns), ['job_title', 'date'])
+
+    def test_detect_encoding_is_cached(self):
+        detect_encoding(self.temp_file.name)
+        with patch('builtins.open', side_effect=AssertionError('file re-read')):
+            self.assertEqual(detect_encoding(self.temp_file.name), 'utf-8')
+
+    def test_read_dataset_falls_back_after_prefix(self):
+        # البداية UTF-8 صالحة لكن باقي الملف بترميز آخر
+        content = 'job_title;date\n' + 'Dev;1 day ago\n' * 10
+        self.write_bytes(content.encode('ascii') + 'Инженер;2 days ago\n'.encode('cp1251'))
+        with patch('data_utils.ENCODING_SNIFF_BYTES', 16):
+            df = read_dataset(self.temp_file.name)
+            self.assertEqual(detect_encoding(self.temp_file.name), 'cp1251')
+        self.assertEqual(df['job_title'].iloc[-1], 'Инженер')
+
     def test_read_dataset_file_not_found(self):
         with self.assertRaises(Exception):
             read_dataset("nonexistent.csv")
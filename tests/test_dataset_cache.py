@@ -0,0 +1,98 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset_cache import DatasetCache
+from data_utils import process_dataset
+
+
+class TestDatasetCache(unittest.TestCase):
+    """اختبارات الذاكرة المؤقتة للبيانات المعالجة"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = DatasetCache(os.path.join(self.test_dir, "cache"))
+        self.csv_path = os.path.join(self.test_dir, "jobs.csv")
+        self.write_csv(['2 days ago', '3 days ago'])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write_csv(self, dates):
+        df = pd.DataFrame({
+            'job_title': ['Developer'] * len(dates),
+            'date': dates,
+            'links': [f'link{i}' for i in range(len(dates))]
+        })
+        df.to_csv(self.csv_path, index=False, sep=';')
+
+    def test_second_load_is_cache_hit(self):
+        processor = MagicMock(side_effect=process_dataset)
+
+        first = self.cache.get_or_process(self.csv_path, processor)
+        second = self.cache.get_or_process(self.csv_path, processor)
+
+        self.assertEqual(processor.call_count, 1)
+        self.assertEqual(self.cache.hits, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_changed_file_invalidates_entry(self):
+        self.cache.get_or_process(self.csv_path, process_dataset)
+        self.write_csv(['2 days ago', '3 days ago', '4 days ago'])
+
+        self.assertIsNone(self.cache.load(self.csv_path))
+        df = self.cache.get_or_process(self.csv_path, process_dataset)
+        self.assertEqual(len(df), 3)
+
+    def test_touched_file_with_same_content_is_hit(self):
+        self.cache.get_or_process(self.csv_path, process_dataset)
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertIsNotNone(self.cache.load(self.csv_path))
+
+    def test_clear(self):
+        self.cache.get_or_process(self.csv_path, process_dataset)
+        self.cache.clear()
+        self.assertIsNone(self.cache.load(self.csv_path))
+
+    def test_prune_drops_deleted_old_and_oversized_entries(self):
+        other_paths = []
+        for name in ("a.csv", "b.csv", "c.csv"):
+            path = os.path.join(self.test_dir, name)
+            shutil.copy(self.csv_path, path)
+            self.cache.get_or_process(path, process_dataset)
+            other_paths.append(path)
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 6)
+
+        # الملف المصدر حُذف والمدخل الثاني قديم
+        os.remove(other_paths[0])
+        meta = self.cache._entry_paths(other_paths[1])["meta"]
+        old = os.stat(meta).st_mtime - self.cache.max_age - 60
+        os.utime(meta, (old, old))
+        self.assertEqual(self.cache.prune(), 2)
+        self.assertIsNone(self.cache.load(other_paths[1]))
+
+        # حد الحجم يبقي المدخل الأحدث استخداماً فقط
+        self.cache.get_or_process(self.csv_path, process_dataset)
+        self.cache.max_bytes = 1
+        self.cache.prune()
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 2)
+        self.assertIsNotNone(self.cache.load(self.csv_path))
+        self.assertIsNone(self.cache.load(other_paths[2]))
+
+    def test_default_dir_follows_environment(self):
+        cache_dir = os.path.join(self.test_dir, "env-cache")
+        with patch.dict(os.environ, {"JOB_ANALYTICS_CACHE_DIR": cache_dir}):
+            self.assertEqual(DatasetCache().cache_dir, cache_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
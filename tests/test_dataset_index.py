@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset_index import DatasetIndex, normalize_date_key
+
+
+class TestDatasetIndex(unittest.TestCase):
+    """اختبارات فهرس التواريخ"""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'job_title': ['Job 1', 'Job 2', 'Job 3', 'Job 4', 'Job 5'],
+            'date': ['02/01/2024', '01/01/2024', 'not date', '02/01/2024', '15/02/2024'],
+        })
+        self.index = DatasetIndex(self.df)
+
+    def test_lookup_exact_date(self):
+        result = self.index.select('02/01/2024')
+        self.assertEqual(result['job_title'].tolist(), ['Job 1', 'Job 4'])
+
+    def test_lookup_normalizes_input(self):
+        self.assertEqual(len(self.index.lookup('2/1/2024')), 2)
+        self.assertEqual(len(self.index.lookup(datetime(2024, 1, 2, 18, 0))), 2)
+        self.assertIn('NOT DATE', self.index)
+
+    def test_lookup_missing_date(self):
+        self.assertIsNone(self.index.select('03/03/2023'))
+
+    def test_between_keeps_row_order(self):
+        result = self.index.between('01/01/2024', '02/01/2024')
+        self.assertEqual(result['job_title'].tolist(), ['Job 1', 'Job 2', 'Job 4'])
+
+        everything = self.index.between('01/01/2000', '01/01/2030')
+        self.assertEqual(len(everything), 4)
+
+    def test_between_invalid_range(self):
+        with self.assertRaises(ValueError):
+            self.index.between('not date', '01/01/2024')
+
+    def test_datetime_column(self):
+        df = self.df.copy()
+        df['date'] = pd.to_datetime(df['date'], format='%d/%m/%Y', errors='coerce')
+        index = DatasetIndex(df)
+        self.assertEqual(len(index.lookup('02/01/2024')), 2)
+
+    def test_missing_column(self):
+        with self.assertRaises(ValueError):
+            DatasetIndex(pd.DataFrame({'job_title': ['Job']}))
+
+    def test_normalize_date_key(self):
+        self.assertEqual(normalize_date_key('05/03/2024'), pd.Timestamp(2024, 3, 5))
+        self.assertEqual(normalize_date_key(' No date '), 'no date')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import find_duplicates, write_duplicate_report
+from file_operations import OperationCancelled
+
+
+class TestFindDuplicates(unittest.TestCase):
+    """البحث عن الملفات المتطابقة: الحجم ثم التجزئة الجزئية ثم الكاملة"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.test_dir, "dataset")
+        head = b"H" * 100
+        self.files = {
+            # مجموعة صغيرة: التجزئة الجزئية تغطي الملف كله
+            os.path.join("cats", "a.jpg"): b"small image",
+            os.path.join("dogs", "a_copy.jpg"): b"small image",
+            # نفس الحجم ونفس البداية، النهاية مختلفة: تفصلها التجزئة الكاملة فقط
+            os.path.join("cats", "big1.jpg"): head + b"tail-1",
+            os.path.join("cats", "big2.jpg"): head + b"tail-2",
+            os.path.join("dogs", "big1_copy.jpg"): head + b"tail-1",
+            # نفس الحجم وبداية مختلفة: تفصلها التجزئة الجزئية
+            os.path.join("dogs", "other.jpg"): b"X" * 106,
+            # حجم فريد
+            "labels.csv": b"name,label\ncat,1\n",
+            # الملفات الفارغة لا تُعد مكررة
+            "empty1.txt": b"",
+            "empty2.txt": b"",
+        }
+        for relative, data in self.files.items():
+            path = os.path.join(self.source_dir, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _path(self, relative):
+        return os.path.join(self.source_dir, relative)
+
+    def test_groups_and_stages(self):
+        report = find_duplicates(self.source_dir, workers=2, hash_workers=1, partial_size=50)
+
+        groups = sorted(group.paths for group in report.groups)
+        self.assertEqual(groups, [
+            [self._path(os.path.join("cats", "a.jpg")),
+             self._path(os.path.join("dogs", "a_copy.jpg"))],
+            [self._path(os.path.join("cats", "big1.jpg")),
+             self._path(os.path.join("dogs", "big1_copy.jpg"))],
+        ])
+        self.assertEqual(report.files_scanned, len(self.files))
+        # الحجم يستبعد labels.csv والملفات الفارغة؛ الجزئية تستبعد other.jpg
+        self.assertEqual(report.partial_hashed, 6)
+        self.assertEqual(report.full_hashed, 3)
+        self.assertEqual(report.duplicate_files, 2)
+        self.assertEqual(report.wasted_bytes, len(b"small image") + 106)
+        self.assertEqual(report.duplicate_map()[self._path(os.path.join("dogs", "a_copy.jpg"))],
+                         self._path(os.path.join("cats", "a.jpg")))
+
+    def test_process_pool_gives_same_groups(self):
+        serial = find_duplicates(self.source_dir, hash_workers=1, partial_size=50)
+        parallel = find_duplicates(self.source_dir, hash_workers=2, partial_size=50)
+
+        self.assertEqual(serial.groups, parallel.groups)
+
+    def test_report_csv(self):
+        report = find_duplicates(self.source_dir, hash_workers=1)
+        report_path = os.path.join(self.test_dir, "duplicates.csv")
+
+        write_duplicate_report(report, report_path)
+
+        with open(report_path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row["group"] for row in rows}, {"1", "2"})
+        for row in rows:
+            self.assertEqual(row["original"], min(r["path"] for r in rows
+                                                  if r["group"] == row["group"]))
+
+    def test_missing_folder_and_cancel(self):
+        with self.assertRaises(FileNotFoundError):
+            find_duplicates(os.path.join(self.test_dir, "missing"))
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with self.assertRaises(OperationCancelled):
+            find_duplicates(self.source_dir, cancel_event=cancel_event)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ import os
 import sys
 import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 import pandas as pd
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
@@ -59,6 +59,7 @@ class TestEndToEndWorkflows(unittest.TestCase):
         
         # تنفيذ السيناريو
         self.window.create_annotation()
+        self.window.file_thread.wait(5000)
         
         # التحقق من النتائج
         mock_create.assert_called_once()
@@ -80,9 +81,11 @@ class TestEndToEndWorkflows(unittest.TestCase):
         
         # تنفيذ السيناريو
         self.window.reorganize_dataset()
+        self.window.file_thread.wait(5000)
         
         # التحقق من النتائج
-        mock_reorganize.assert_called_once_with(source_dir, dest_dir)
+        mock_reorganize.assert_called_once_with(source_dir, dest_dir,
+                                                progress=ANY, cancel_event=ANY)
     
     @patch('main_window.WebScrapingThread')
     def test_e2e_scraping_workflow(self, mock_thread_class):
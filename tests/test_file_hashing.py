@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_hashing
+from file_hashing import FileHasher, HashCache, cache_key, hash_file
+
+
+def blake(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class TestFileHashing(unittest.TestCase):
+    """تجزئة الملفات وذاكرة التجزئات"""
+
+    OLD_NS = 1_600_000_000 * 10**9
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.files = {}
+        for i in range(20):
+            path = os.path.join(self.test_dir, f"file_{i}.bin")
+            data = bytes([i]) * (i * 1000)
+            with open(path, "wb") as f:
+                f.write(data)
+            os.utime(path, ns=(self.OLD_NS, self.OLD_NS))
+            self.files[path] = data
+        self.paths = sorted(self.files)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_hash_file_small_and_mmap(self):
+        path = self.paths[5]
+        self.assertEqual(hash_file(path), blake(self.files[path]))
+
+        with patch.object(file_hashing, "MMAP_THRESHOLD", 1):
+            self.assertEqual(hash_file(path), blake(self.files[path]))
+        # ملف فارغ لا يُقرأ عبر mmap
+        self.assertEqual(hash_file(self.paths[0]), blake(b""))
+
+    def test_partial_hash_reads_only_the_prefix(self):
+        path = self.paths[5]
+        self.assertEqual(hash_file(path, limit=100), blake(self.files[path][:100]))
+        self.assertEqual(hash_file(path, limit=10**6), blake(self.files[path]))
+
+        cache = HashCache()
+        hasher = FileHasher(workers=1, cache=cache, limit=100)
+        _, digests = next(hasher.iter_hashed([[path]], lambda item: item))
+        self.assertEqual(digests, [blake(self.files[path][:100])])
+        # التجزئات الجزئية لا تُخزن
+        self.assertEqual(cache.used, {})
+
+    def test_items_keep_order_across_processes(self):
+        items = [self.paths[i:i + 3] for i in range(0, len(self.paths), 3)]
+
+        with patch.object(file_hashing, "HASH_JOB_FILES", 4):
+            hasher = FileHasher(workers=2)
+            results = list(hasher.iter_hashed(items, lambda item: item))
+
+        self.assertEqual([item for item, _ in results], items)
+        for item, digests in results:
+            self.assertEqual(digests, [blake(self.files[path]) for path in item])
+        self.assertEqual(hasher.hashed, len(self.paths))
+
+    def test_cache_round_trip(self):
+        cache_path = os.path.join(self.test_dir, "hashes.json")
+        hasher = FileHasher(workers=1, cache=HashCache(cache_path))
+        list(hasher.iter_hashed([self.paths], lambda item: item))
+        hasher.cache.save()
+
+        hasher = FileHasher(workers=1, cache=HashCache(cache_path))
+        _, digests = next(hasher.iter_hashed([self.paths], lambda item: item))
+
+        self.assertEqual((hasher.hashed, hasher.cache_hits), (0, len(self.paths)))
+        self.assertEqual(digests[3], blake(self.files[self.paths[3]]))
+
+    def test_cache_ignores_other_algorithm(self):
+        cache_path = os.path.join(self.test_dir, "hashes.json")
+        key = cache_key(os.stat(self.paths[1]))
+        with open(cache_path, "w") as f:
+            json.dump({"version": 1, "algorithm": "md5", "digest_size": 16,
+                       "hashes": {key: "0" * 32}}, f)
+
+        self.assertIsNone(HashCache(cache_path).get(key))
+
+    def test_recent_and_missing_files(self):
+        fresh = self.paths[2]
+        os.utime(fresh)
+        missing = os.path.join(self.test_dir, "missing.bin")
+
+        cache = HashCache()
+        hasher = FileHasher(workers=1, cache=cache)
+        _, digests = next(hasher.iter_hashed([[fresh, missing, self.paths[3]]],
+                                             lambda item: item))
+
+        self.assertEqual(digests[0], blake(self.files[fresh]))
+        self.assertEqual(digests[1], "")
+        # الملف الحديث جداً لا يُخزن - Слишком свежий файл не кэшируется
+        self.assertEqual(set(cache.used), {cache_key(os.stat(self.paths[3]))})
+
+
+if __name__ == "__main__":
+    unittest.main()
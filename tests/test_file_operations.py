@@ -0,0 +1,260 @@
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_operations
+from file_operations import (CLONED, COPIED, DEDUPLICATED, FELL_BACK, LINKED, SKIPPED,
+                             CopyStats, OperationCancelled, copy_tree, fast_copy,
+                             get_copy_function, hardlink_file, plan_copy, run_copy_tasks)
+
+
+class CopyTreeTestCase(unittest.TestCase):
+    """شجرة مصدر مشتركة للاختبارات"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.test_dir, "source")
+        self.dest_dir = os.path.join(self.test_dir, "dest")
+        self.files = {}
+        for i in range(4):
+            for j in range(5):
+                relative = os.path.join(f"class_{i}", f"img_{j}.jpg")
+                self.files[relative] = bytes([i, j]) * (100 * (j + 1))
+        self.files["labels.csv"] = b"name,label\n"
+        for relative, data in self.files.items():
+            path = os.path.join(self.source_dir, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        # مجلد فارغ لا يُنسخ، مثل os.walk السابق
+        os.makedirs(os.path.join(self.source_dir, "empty"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+
+class TestCopyTree(CopyTreeTestCase):
+
+    def test_copy_tree_copies_contents_and_metadata(self):
+        old_time = 1_600_000_000
+        source_file = os.path.join(self.source_dir, "class_1", "img_2.jpg")
+        os.utime(source_file, (old_time, old_time))
+
+        stats = copy_tree(self.source_dir, self.dest_dir, workers=4)
+
+        for relative, data in self.files.items():
+            with open(os.path.join(self.dest_dir, relative), "rb") as f:
+                self.assertEqual(f.read(), data, relative)
+        self.assertEqual(os.stat(os.path.join(self.dest_dir, "class_1", "img_2.jpg")).st_mtime,
+                         old_time)
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, "empty")))
+        self.assertEqual(stats.files_done, len(self.files))
+        self.assertEqual(stats.bytes_done, sum(len(data) for data in self.files.values()))
+        self.assertIn("файлов/с", stats.summary())
+
+    def test_progress_reports_totals(self):
+        reports = []
+
+        copy_tree(self.source_dir, self.dest_dir, workers=2, progress=reports.append)
+
+        final = reports[-1]
+        self.assertEqual(final.files_done, final.files_total)
+        self.assertEqual(final.files_total, len(self.files))
+        self.assertEqual(final.bytes_done, final.bytes_total)
+        self.assertGreaterEqual(final.files_per_second, 0)
+
+    def test_cancel_stops_copying(self):
+        cancel_event = threading.Event()
+        copied = []
+
+        def copy_and_cancel(src, dst):
+            fast_copy(src, dst)
+            copied.append(dst)
+            cancel_event.set()
+
+        with self.assertRaises(OperationCancelled) as context:
+            copy_tree(self.source_dir, self.dest_dir, workers=1,
+                      cancel_event=cancel_event, copy_func=copy_and_cancel)
+
+        self.assertLess(len(copied), len(self.files))
+        self.assertEqual(context.exception.stats.files_done, len(copied))
+
+    def test_first_error_is_raised(self):
+        def failing_copy(src, dst):
+            if src.endswith("img_3.jpg"):
+                raise PermissionError(errno.EACCES, "denied", src)
+            fast_copy(src, dst)
+
+        with self.assertRaises(PermissionError):
+            copy_tree(self.source_dir, self.dest_dir, workers=3, copy_func=failing_copy)
+
+    def test_missing_source(self):
+        with self.assertRaises(FileNotFoundError):
+            plan_copy(os.path.join(self.test_dir, "missing"), self.dest_dir)
+
+    def test_plan_creates_folders_once(self):
+        dirs, tasks = plan_copy(self.source_dir, self.dest_dir)
+
+        self.assertEqual(len(dirs), len(set(dirs)))
+        self.assertEqual(len(dirs), 5)
+        self.assertEqual(len(tasks), len(self.files))
+
+    def test_fast_copy_falls_back_without_copy_file_range(self):
+        src = os.path.join(self.source_dir, "labels.csv")
+        dst = os.path.join(self.test_dir, "labels_copy.csv")
+        error = OSError(errno.EXDEV, "cross-device")
+
+        with patch.object(file_operations.os, "copy_file_range", side_effect=error, create=True):
+            fast_copy(src, dst)
+
+        with open(dst, "rb") as f:
+            self.assertEqual(f.read(), self.files["labels.csv"])
+
+    def test_run_copy_tasks_with_explicit_stats(self):
+        src = os.path.join(self.source_dir, "labels.csv")
+        dst = os.path.join(self.test_dir, "one.csv")
+        stats = CopyStats(files_total=1, bytes_total=11)
+
+        result = run_copy_tasks([(src, dst, 11, None)], workers=1, stats=stats)
+
+        self.assertIs(result, stats)
+        self.assertEqual(stats.snapshot().files_done, 1)
+
+
+class TestCopyStrategies(CopyTreeTestCase):
+    """Hardlink/reflink strategies and rsync-like skipping"""
+
+    def _assert_dest_matches(self):
+        for relative, data in self.files.items():
+            with open(os.path.join(self.dest_dir, relative), "rb") as f:
+                self.assertEqual(f.read(), data, relative)
+
+    def test_hardlink_shares_inodes(self):
+        stats = copy_tree(self.source_dir, self.dest_dir, strategy="hardlink")
+
+        for relative in self.files:
+            self.assertTrue(os.path.samefile(os.path.join(self.source_dir, relative),
+                                             os.path.join(self.dest_dir, relative)))
+        self.assertEqual(stats.outcomes, {LINKED: len(self.files)})
+
+        # إعادة التشغيل فوق روابط موجودة لا تفشل
+        stats = copy_tree(self.source_dir, self.dest_dir, strategy="hardlink")
+        self.assertEqual(stats.outcomes, {LINKED: len(self.files)})
+        self.assertEqual(os.listdir(os.path.join(self.dest_dir, "class_0")),
+                         os.listdir(os.path.join(self.source_dir, "class_0")))
+
+    def test_hardlink_replaces_leftover_temp_link(self):
+        src = os.path.join(self.source_dir, "labels.csv")
+        dst = os.path.join(self.test_dir, "labels_link.csv")
+        # ملف مؤقت متبقٍ من تشغيل مقطوع بنفس الاسم
+        leftover = f"{dst}.{threading.get_ident()}.link"
+        with open(leftover, "wb") as f:
+            f.write(b"stale")
+
+        self.assertEqual(hardlink_file(src, dst), LINKED)
+        self.assertTrue(os.path.samefile(src, dst))
+        self.assertFalse(os.path.exists(leftover))
+
+    def test_hardlink_falls_back_across_devices(self):
+        src = os.path.join(self.source_dir, "labels.csv")
+        dst = os.path.join(self.test_dir, "labels_link.csv")
+
+        with patch.object(file_operations.os, "link",
+                          side_effect=OSError(errno.EXDEV, "cross-device")):
+            self.assertEqual(hardlink_file(src, dst), FELL_BACK)
+
+        self.assertFalse(os.path.samefile(src, dst))
+        with open(dst, "rb") as f:
+            self.assertEqual(f.read(), self.files["labels.csv"])
+
+    def test_reflink_over_hardlink_keeps_source(self):
+        copy_tree(self.source_dir, self.dest_dir, strategy="hardlink")
+        stats = copy_tree(self.source_dir, self.dest_dir, strategy="reflink")
+
+        for relative, data in self.files.items():
+            with open(os.path.join(self.source_dir, relative), "rb") as f:
+                self.assertEqual(f.read(), data, relative)
+            self.assertFalse(os.path.samefile(os.path.join(self.source_dir, relative),
+                                              os.path.join(self.dest_dir, relative)))
+        self._assert_dest_matches()
+        self.assertEqual(sum(stats.outcomes.values()), len(self.files))
+
+    def test_reflink_clones_or_copies(self):
+        stats = copy_tree(self.source_dir, self.dest_dir, strategy="reflink")
+
+        self._assert_dest_matches()
+        self.assertEqual(sum(stats.outcomes.values()), len(self.files))
+        self.assertTrue(set(stats.outcomes) <= {CLONED, FELL_BACK})
+
+    def test_skip_unchanged_copies_only_remaining_files(self):
+        copy_tree(self.source_dir, self.dest_dir)
+
+        # ملف عُدل في المصدر، ملف حُذف من الوجهة، ونسخة منقطعة
+        with open(os.path.join(self.source_dir, "class_0", "img_0.jpg"), "wb") as f:
+            f.write(b"changed")
+        self.files[os.path.join("class_0", "img_0.jpg")] = b"changed"
+        os.remove(os.path.join(self.dest_dir, "class_1", "img_1.jpg"))
+        with open(os.path.join(self.dest_dir, "class_2", "img_2.jpg"), "r+b") as f:
+            f.truncate(10)
+
+        copied = []
+
+        def tracking_copy(src, dst):
+            copied.append(os.path.relpath(src, self.source_dir))
+            return fast_copy(src, dst)
+
+        stats = copy_tree(self.source_dir, self.dest_dir, copy_func=tracking_copy,
+                          skip_unchanged=True)
+
+        self.assertEqual(sorted(copied), sorted([os.path.join("class_0", "img_0.jpg"),
+                                                 os.path.join("class_1", "img_1.jpg"),
+                                                 os.path.join("class_2", "img_2.jpg")]))
+        self.assertEqual(stats.outcomes, {COPIED: 3, SKIPPED: len(self.files) - 3})
+        self._assert_dest_matches()
+
+    def test_same_size_but_newer_source_is_copied(self):
+        copy_tree(self.source_dir, self.dest_dir)
+        src = os.path.join(self.source_dir, "labels.csv")
+        with open(src, "wb") as f:
+            f.write(b"name,LABEL\n")
+        os.utime(src, (2_000_000_000, 2_000_000_000))
+
+        stats = copy_tree(self.source_dir, self.dest_dir, skip_unchanged=True)
+
+        self.assertEqual(stats.outcomes[COPIED], 1)
+        with open(os.path.join(self.dest_dir, "labels.csv"), "rb") as f:
+            self.assertEqual(f.read(), b"name,LABEL\n")
+
+    def test_duplicates_are_linked_to_the_copied_original(self):
+        original = os.path.join(self.source_dir, "class_0", "img_0.jpg")
+        duplicate = os.path.join(self.source_dir, "class_3", "img_0.jpg")
+        with open(duplicate, "wb") as f:
+            f.write(self.files[os.path.join("class_0", "img_0.jpg")])
+        self.files[os.path.join("class_3", "img_0.jpg")] = self.files[
+            os.path.join("class_0", "img_0.jpg")]
+
+        stats = copy_tree(self.source_dir, self.dest_dir, workers=2,
+                          duplicates={duplicate: original})
+
+        self._assert_dest_matches()
+        self.assertTrue(os.path.samefile(os.path.join(self.dest_dir, "class_0", "img_0.jpg"),
+                                         os.path.join(self.dest_dir, "class_3", "img_0.jpg")))
+        self.assertFalse(os.path.samefile(original,
+                                          os.path.join(self.dest_dir, "class_0", "img_0.jpg")))
+        self.assertEqual(stats.outcomes, {COPIED: len(self.files) - 1, DEDUPLICATED: 1})
+        self.assertEqual(stats.files_done, stats.files_total)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            get_copy_function("teleport")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ import os
 import sys
 import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 import pandas as pd
 from PySide6.QtWidgets import QApplication
 
@@ -32,8 +32,10 @@ class TestGUIIntegration(unittest.TestCase):
         mock_dialog.return_value = ("/test/annotation.csv", "")
         
         self.window.create_annotation()
+        self.window.file_thread.wait(5000)
         
-        mock_create.assert_called_once_with("/test/source", "/test/annotation.csv")
+        mock_create.assert_called_once_with("/test/source", "/test/annotation.csv",
+                                            progress=ANY, cancel_event=ANY)
     
     @patch('main_window.reorganize_dataset')
     @patch('main_window.QFileDialog.getExistingDirectory')
@@ -43,8 +45,10 @@ class TestGUIIntegration(unittest.TestCase):
         mock_dialog.return_value = "/test/dest"
         
         self.window.reorganize_dataset()
+        self.window.file_thread.wait(5000)
         
-        mock_reorganize.assert_called_once_with("/test/source", "/test/dest")
+        mock_reorganize.assert_called_once_with("/test/source", "/test/dest",
+                                                progress=ANY, cancel_event=ANY)
     
     @patch('main_window.save_jobs_to_csv')
     @patch('main_window.QFileDialog.getSaveFileName')
@@ -0,0 +1,176 @@
+import os
+import sys
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_cache import HttpCache
+from web_scraping import scrape_wuzzuf_jobs, create_session
+from tests.fake_wuzzuf_server import FakeWuzzufServer, make_results_page
+
+
+class ConditionalServer(FakeWuzzufServer):
+    """خادم يدعم ETag و Last-Modified ويرد 304 عند عدم التغيير"""
+
+    def __init__(self, use_etag=True, **kwargs):
+        super().__init__(**kwargs)
+        self.use_etag = use_etag
+        self.version = 1
+        self.not_modified = 0
+
+    def handle(self, handler):
+        params = parse_qs(urlsplit(handler.path).query)
+        page_num = int(params.get("start", ["0"])[0])
+        etag = f'"v{self.version}-{page_num}"'
+        last_modified = f"Mon, 0{self.version} Jan 2024 00:00:00 GMT"
+        if self.use_etag:
+            fresh = handler.headers.get("If-None-Match") == etag
+        else:
+            fresh = handler.headers.get("If-Modified-Since") == last_modified
+        if fresh:
+            self.not_modified += 1
+            handler.send_response(304)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        body = make_results_page(params.get("q", [""])[0], page_num, self.total_jobs)
+        body = body.replace("</body>", f"<!-- v{self.version} --></body>").encode("utf-8")
+        handler.send_response(200)
+        if self.use_etag:
+            handler.send_header("ETag", etag)
+        else:
+            handler.send_header("Last-Modified", last_modified)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+class TestHttpCache(unittest.TestCase):
+    """اختبارات ذاكرة HTTP المؤقتة"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_fresh_entries_skip_network(self):
+        cache = HttpCache(self.test_dir, ttl=60)
+        with ConditionalServer(total_jobs=90) as server:
+            ok_first, first = scrape_wuzzuf_jobs("python", 3, base_url=server.base_url,
+                                                 http_cache=cache)
+            ok_second, second = scrape_wuzzuf_jobs("python", 3, base_url=server.base_url,
+                                                   http_cache=cache)
+            self.assertEqual(len(server.requests), 3)
+
+        self.assertTrue(ok_first and ok_second)
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats(), {"hits": 3, "revalidated": 0, "misses": 3,
+                                         "hit_ratio": 0.5})
+
+    def test_expired_entries_revalidate_with_etag(self):
+        cache = HttpCache(self.test_dir, ttl=0)
+        url_query = "python"
+        with ConditionalServer(total_jobs=60) as server:
+            session = create_session(2)
+            scrape_wuzzuf_jobs(url_query, 2, base_url=server.base_url, http_cache=cache,
+                               workers=2, session=session)
+            ok, data = scrape_wuzzuf_jobs(url_query, 2, base_url=server.base_url,
+                                          http_cache=cache, workers=2, session=session)
+            session.close()
+            self.assertEqual(server.not_modified, 2)
+
+        self.assertTrue(ok)
+        self.assertEqual(len(data[0]), 60)
+        self.assertEqual(cache.revalidated, 2)
+        self.assertEqual(cache.misses, 2)
+
+    def test_last_modified_and_changed_page(self):
+        cache = HttpCache(self.test_dir, ttl=0)
+        with ConditionalServer(use_etag=False) as server:
+            url = server.base_url + "?a=hpb&q=python&start=0"
+            first = cache.get(url)
+            self.assertEqual(cache.get(url), first)
+            self.assertEqual(server.not_modified, 1)
+
+            # الصفحة تغيرت: يجب استبدال السجل
+            server.version = 2
+            changed = cache.get(url)
+            self.assertIn(b"<!-- v2 -->", changed)
+            self.assertIn(b"<!-- v2 -->", cache.get(url))
+            self.assertEqual(server.not_modified, 2)
+
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.revalidated, 2)
+
+    def test_ttl_expiry_and_clear(self):
+        cache = HttpCache(self.test_dir, ttl=0.2)
+        with ConditionalServer() as server:
+            url = server.base_url + "?a=hpb&q=python&start=0"
+            cache.get(url)
+            cache.get(url)
+            self.assertEqual(len(server.requests), 1)
+            time.sleep(0.25)
+            cache.get(url)
+            self.assertEqual(len(server.requests), 2)
+
+            cache.clear()
+            cache.get(url)
+            self.assertEqual(len(server.requests), 3)
+
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_error_responses_not_stored(self):
+        cache = HttpCache(self.test_dir, ttl=60)
+
+        class BrokenServer(FakeWuzzufServer):
+            def handle(self, handler):
+                handler.send_response(503)
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+
+        with BrokenServer() as server:
+            url = server.base_url + "?a=hpb&q=python&start=0"
+            for _ in range(2):
+                with self.assertRaises(requests.HTTPError):
+                    cache.get(url)
+            self.assertEqual(len(server.requests), 2)
+        self.assertEqual(cache.hits, 0)
+
+    def test_prune_drops_old_and_oversized_entries(self):
+        cache = HttpCache(self.test_dir, ttl=60)
+        with FakeWuzzufServer(total_jobs=300) as server:
+            urls = [server.base_url + f"?a=hpb&q=python&start={page}" for page in range(4)]
+            for url in urls:
+                cache.get(url)
+
+        # السجل الأول لم يُستخدم منذ أكثر من max_age
+        meta = cache._entry_paths(urls[0])["meta"]
+        old = time.time() - cache.max_age - 60
+        os.utime(meta, (old, old))
+        self.assertEqual(cache.prune(), 1)
+        self.assertFalse(os.path.exists(cache._entry_paths(urls[0])["body"]))
+
+        # حد الحجم يبقي السجل الأحدث استخداماً فقط
+        os.utime(cache._entry_paths(urls[3])["meta"], (old + 120, old + 120))
+        cache.max_bytes = 1
+        self.assertEqual(cache.prune(), 2)
+        self.assertEqual(sorted(os.listdir(self.test_dir)),
+                         sorted(os.path.basename(path)
+                                for path in cache._entry_paths(urls[2]).values()))
+
+    def test_default_dir_follows_environment(self):
+        with patch.dict(os.environ, {"JOB_ANALYTICS_CACHE_DIR": self.test_dir}):
+            self.assertEqual(HttpCache().cache_dir, os.path.join(self.test_dir, "http_cache"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import os
 import sys
 import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 from PySide6.QtTest import QTest
@@ -10,7 +10,9 @@ from PySide6.QtTest import QTest
 # إضافة المسار للأدوات
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main_window import MainWindow, ChartWindow, WebScrapingThread
+from main_window import (MainWindow, ChartWindow, WebScrapingThread, AnnotationThread,
+                         FileOperationThread, ReorganizeThread)
+from file_operations import OperationCancelled
 
 
 # تطبيق QApplication كمتغير عام
@@ -111,8 +113,10 @@ class TestMainWindow(unittest.TestCase):
         mock_dialog.return_value = ("/test/annotation.csv", "")
         
         self.window.create_annotation()
+        self.window.file_thread.wait(5000)
         
-        mock_create.assert_called_once_with("/test/folder", "/test/annotation.csv")
+        mock_create.assert_called_once_with("/test/folder", "/test/annotation.csv",
+                                            progress=ANY, cancel_event=ANY)
     
     @patch('main_window.QMessageBox.critical')
     def test_create_annotation_without_folder(self, mock_critical):
@@ -131,8 +135,10 @@ class TestMainWindow(unittest.TestCase):
         mock_dialog.return_value = "/dest/folder"
         
         self.window.reorganize_dataset()
+        self.window.file_thread.wait(5000)
         
-        mock_reorganize.assert_called_once_with("/source/folder", "/dest/folder")
+        mock_reorganize.assert_called_once_with("/source/folder", "/dest/folder",
+                                                progress=ANY, cancel_event=ANY)
     
     @patch('main_window.QMessageBox.critical')
     def test_search_by_date_validation(self, mock_critical):
@@ -206,6 +212,18 @@ class TestMainWindow(unittest.TestCase):
         self.assertEqual(self.window.results_table.columnCount(), 6)
         self.assertTrue(self.window.save_btn.isEnabled())
     
+    def test_append_scraped_rows(self):
+        """اختبار إضافة صفوف الصفحات الجديدة دون إعادة رسم الجدول"""
+        self.window.results_table.setRowCount(0)
+        self.window.append_scraped_rows([["Job1"], ["Company1"], ["Date1"], ["Location1"],
+                                         ["Skills1"], ["Link1"]])
+        self.window.append_scraped_rows([["Job2"], ["Company2"], ["Date2"], ["Location2"],
+                                         ["Skills2"], ["Link2"]])
+        
+        self.assertEqual(self.window.results_table.rowCount(), 2)
+        self.assertEqual(self.window.results_table.item(0, 0).text(), "Job1")
+        self.assertEqual(self.window.results_table.item(1, 4).text(), "Link2")
+    
     @patch('main_window.save_jobs_to_csv')
     @patch('main_window.QFileDialog.getSaveFileName')
     def test_save_data(self, mock_dialog, mock_save):
@@ -342,11 +360,55 @@ class TestWebScrapingThread(unittest.TestCase):
             
             thread.run()
             
-            mock_scrape.assert_called_once_with("python", 2)
+            mock_scrape.assert_called_once_with("python", 2, http_cache=ANY)
             progress_mock.emit.assert_called_once_with("Начало извлечения данных...")
             data_ready_mock.emit.assert_called_once_with(test_data)
             finished_mock.emit.assert_called_once_with(True)
     
+    @patch('main_window.run_async_scrape')
+    def test_thread_run_async_backend(self, mock_async):
+        """اختبار تشغيل thread بالمحرك غير المتزامن مع نتائج جزئية"""
+        page_data = [["Job1"], ["Company1"], ["Date1"], ["Location1"], ["Skills1"], ["Link1"]]
+        
+        def fake_scrape(search_query, max_pages, on_page=None, http_cache=None):
+            on_page(0, 1, 2, page_data)
+            on_page(1, 2, 2, page_data)
+            return True, page_data
+        
+        mock_async.side_effect = fake_scrape
+        thread = WebScrapingThread("python", 2, backend="async")
+        
+        with patch.object(thread, 'progress') as progress_mock, \
+             patch.object(thread, 'data_ready') as data_ready_mock, \
+             patch.object(thread, 'rows_ready') as rows_ready_mock, \
+             patch.object(thread, 'finished') as finished_mock:
+            
+            thread.run()
+            
+            progress_mock.emit.assert_any_call("Страница 2 извлечена (2/2)")
+            self.assertEqual(progress_mock.emit.call_count, 3)
+            # الصفحات تُرسل كصفوف جديدة والنتيجة الكاملة مرة واحدة في النهاية
+            self.assertEqual(rows_ready_mock.emit.call_count, 2)
+            data_ready_mock.emit.assert_called_once_with(page_data)
+            finished_mock.emit.assert_called_once_with(True)
+    
+    @patch('main_window.scrape_wuzzuf_batch')
+    def test_thread_run_batch_queries(self, mock_batch):
+        """اختبار تشغيل thread بعدة استعلامات مفصولة بفواصل"""
+        test_data = [["Job1"], ["Company1"], ["Date1"], ["Location1"], ["Skills1"], ["Link1"],
+                     ["python|django"]]
+        mock_batch.return_value = (True, test_data)
+        
+        thread = WebScrapingThread("python, django ,", 2)
+        
+        with patch.object(thread, 'data_ready') as data_ready_mock, \
+             patch.object(thread, 'finished') as finished_mock:
+            thread.run()
+            
+            mock_batch.assert_called_once_with(["python", "django"], 2, http_cache=ANY)
+            data_ready_mock.emit.assert_called_once_with(test_data)
+            finished_mock.emit.assert_called_once_with(True)
+    
     @patch('main_window.scrape_wuzzuf_jobs')
     def test_thread_run_failure(self, mock_scrape):
         """اختبار تشغيل thread مع فشل"""
@@ -374,5 +436,113 @@ class TestWebScrapingThread(unittest.TestCase):
             finished_mock.emit.assert_called_once_with(False)
 
 
+class TestFileOperationThreads(unittest.TestCase):
+    """اختبارات threads عمليات الملفات"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = get_qapplication()
+    
+    @patch('main_window.create_annotation_file')
+    def test_annotation_thread_reports_progress(self, mock_create):
+        """اختبار تمرير تقدم المسح من thread التعليقات"""
+        def fake_create(source, save, progress=None, cancel_event=None):
+            progress({"files": 3, "bytes": 300})
+            return {"files": 3}
+        
+        mock_create.side_effect = fake_create
+        thread = AnnotationThread("/test/source", "/test/annotation.csv")
+        
+        with patch.object(thread, 'file_progress') as file_progress_mock, \
+             patch.object(thread, 'finished') as finished_mock:
+            thread.run()
+            
+            mock_create.assert_called_once_with("/test/source", "/test/annotation.csv",
+                                                progress=ANY, cancel_event=thread.cancel_event)
+            file_progress_mock.emit.assert_called_once_with(3, 0, 300, 0)
+            finished_mock.emit.assert_called_once_with(True)
+            self.assertEqual(thread.result, {"files": 3})
+    
+    @patch('main_window.reorganize_dataset')
+    def test_reorganize_thread_cancelled(self, mock_reorganize):
+        """اختبار إلغاء thread إعادة التنظيم"""
+        def fake_reorganize(source, dest, progress=None, cancel_event=None):
+            if cancel_event.is_set():
+                raise OperationCancelled()
+        
+        mock_reorganize.side_effect = fake_reorganize
+        thread = ReorganizeThread("/source", "/dest")
+        thread.cancel()
+        
+        with patch.object(thread, 'finished') as finished_mock:
+            thread.run()
+            
+            finished_mock.emit.assert_called_once_with(False)
+            self.assertTrue(thread.cancelled)
+            self.assertIsNone(thread.error)
+    
+    @patch('main_window.reorganize_dataset')
+    def test_reorganize_thread_error(self, mock_reorganize):
+        """اختبار خطأ في thread إعادة التنظيم"""
+        mock_reorganize.side_effect = FileNotFoundError("missing")
+        thread = ReorganizeThread("/source", "/dest")
+        
+        with patch.object(thread, 'progress') as progress_mock, \
+             patch.object(thread, 'finished') as finished_mock:
+            thread.run()
+            
+            progress_mock.emit.assert_called_with("Ошибка: missing")
+            finished_mock.emit.assert_called_once_with(False)
+            self.assertIsInstance(thread.error, FileNotFoundError)
+    
+    def test_file_operation_thread_runs_operation(self):
+        """اختبار تمرير العملية إلى الثريد الأساسي"""
+        thread = FileOperationThread("/source", lambda: 42)
+        with patch.object(thread, 'finished') as finished_mock:
+            thread.run()
+            finished_mock.emit.assert_called_once_with(True)
+        self.assertEqual(thread.result, 42)
+    
+    def test_reorganize_thread_copies_files(self):
+        """اختبار thread إعادة التنظيم على مجلدات حقيقية"""
+        with tempfile.TemporaryDirectory() as test_dir:
+            source = os.path.join(test_dir, "source")
+            dest = os.path.join(test_dir, "dest")
+            os.makedirs(os.path.join(source, "class_a"))
+            for name in ("data.csv", os.path.join("class_a", "img.jpg")):
+                with open(os.path.join(source, name), "w") as f:
+                    f.write("content")
+            
+            thread = ReorganizeThread(source, dest)
+            reports = []
+            with patch.object(thread, 'file_progress') as file_progress_mock:
+                file_progress_mock.emit.side_effect = lambda *args: reports.append(args)
+                thread.run()
+            
+            self.assertTrue(os.path.exists(os.path.join(dest, "class_a", "img.jpg")))
+            self.assertEqual(thread.result.stats.files_done, 2)
+            self.assertEqual(reports[-1][:2], (2, 2))
+    
+    @patch('main_window.QMessageBox.information')
+    @patch('main_window.QFileDialog.getExistingDirectory')
+    @patch('main_window.reorganize_dataset')
+    def test_window_restores_buttons_after_finish(self, mock_reorganize, mock_dialog,
+                                                  mock_info):
+        """اختبار إعادة تفعيل الأزرار بعد انتهاء العملية"""
+        window = MainWindow(preload=False)
+        window.source_folder = "/source/folder"
+        mock_dialog.return_value = "/dest/folder"
+        
+        window.reorganize_dataset()
+        self.assertFalse(window.reorganize_btn.isEnabled())
+        window.file_thread.wait(5000)
+        QTest.qWait(50)
+        
+        self.assertTrue(window.reorganize_btn.isEnabled())
+        self.assertFalse(window.cancel_file_btn.isEnabled())
+        mock_info.assert_called_once_with(window, "Информация", "Новый набор данных успешно создан")
+        window.close()
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
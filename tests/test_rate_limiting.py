@@ -0,0 +1,183 @@
+import os
+import sys
+import threading
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiting import AdaptiveConcurrency, RequestScheduler, TokenBucket
+from web_scraping import scrape_wuzzuf_jobs
+from tests.fake_wuzzuf_server import FakeWuzzufServer
+
+
+class FakeClock:
+    """ساعة وهمية للاختبارات"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ThrottlingServer(FakeWuzzufServer):
+    """خادم يرد 429 ثم 503 على أول طلبات كل صفحة"""
+
+    def __init__(self, failures_per_page=2, retry_after=None, **kwargs):
+        super().__init__(**kwargs)
+        self.failures_per_page = failures_per_page
+        self.retry_after = retry_after
+        self.attempts = {}
+
+    def handle(self, handler):
+        page_num = int(parse_qs(urlsplit(handler.path).query).get("start", ["0"])[0])
+        with self._lock:
+            attempt = self.attempts.get(page_num, 0)
+            self.attempts[page_num] = attempt + 1
+        if attempt < self.failures_per_page:
+            handler.send_response(429 if attempt == 0 else 503)
+            if self.retry_after is not None:
+                handler.send_header("Retry-After", str(self.retry_after))
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        super().handle(handler)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """اختبارات دلو الرموز"""
+
+    def test_rate_and_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0.0)
+        # بعد استهلاك الدفعة: رمز كل نصف ثانية
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_unlimited(self):
+        bucket = TokenBucket(rate=None)
+        self.assertEqual(sum(bucket.acquire() for _ in range(100)), 0.0)
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    """اختبارات التوازي التكيفي"""
+
+    def test_additive_increase(self):
+        limiter = AdaptiveConcurrency(initial=2, maximum=4, target_latency=1.0)
+        for _ in range(20):
+            limiter.record(0.1, ok=True)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_multiplicative_decrease_with_cooldown(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrency(initial=16, maximum=16, cooldown=1.0, clock=clock)
+        limiter.record(0.1, ok=False)
+        limiter.record(0.1, ok=False)
+        # موجة أخطاء واحدة = تخفيض واحد
+        self.assertEqual(limiter.limit, 8)
+        clock.now += 1.5
+        limiter.record(0.1, ok=False)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_high_latency_shrinks_limit(self):
+        limiter = AdaptiveConcurrency(initial=8, target_latency=0.5, smoothing=1.0)
+        limiter.record(2.0, ok=True)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.minimum, 1)
+
+    def test_slot_blocks_at_limit(self):
+        limiter = AdaptiveConcurrency(initial=1)
+        entered = threading.Event()
+
+        def hold_slot():
+            with limiter.slot():
+                entered.set()
+
+        with limiter.slot():
+            worker = threading.Thread(target=hold_slot)
+            worker.start()
+            self.assertFalse(entered.wait(0.1))
+        self.assertTrue(entered.wait(1.0))
+        worker.join()
+
+
+class TestRequestScheduler(unittest.TestCase):
+    """اختبارات جدولة الطلبات مع خادم محلي"""
+
+    def make_scheduler(self, **kwargs):
+        self.delays = []
+        return RequestScheduler(sleep=self.delays.append, rng=lambda: 1.0, **kwargs)
+
+    def test_retries_with_exponential_backoff(self):
+        scheduler = self.make_scheduler(backoff_base=0.5)
+        with ThrottlingServer(failures_per_page=2) as server:
+            response = scheduler.get(server.base_url + "?q=python&start=0")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.delays, [0.5, 1.0])
+        self.assertEqual(scheduler.stats()["retries"], 2)
+        self.assertEqual(scheduler.stats()["requests"], 3)
+
+    def test_retry_after_header(self):
+        scheduler = self.make_scheduler(backoff_base=0.1)
+        with ThrottlingServer(failures_per_page=1, retry_after=3) as server:
+            scheduler.get(server.base_url + "?q=python&start=0")
+        self.assertEqual(self.delays, [3.0])
+
+    def test_gives_up_after_max_retries(self):
+        scheduler = self.make_scheduler(max_retries=2)
+        with ThrottlingServer(failures_per_page=10) as server:
+            with self.assertRaises(requests.HTTPError):
+                scheduler.get(server.base_url + "?q=python&start=0")
+            self.assertEqual(len(server.requests), 3)
+        self.assertEqual(scheduler.failures, 1)
+
+    def test_client_errors_raise_without_retry(self):
+        class NotFoundServer(FakeWuzzufServer):
+            def handle(self, handler):
+                body = b"<html>Not found</html>"
+                handler.send_response(404)
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+        scheduler = self.make_scheduler()
+        with NotFoundServer() as server:
+            with self.assertRaises(requests.HTTPError):
+                scheduler.get(server.base_url + "?q=python&start=0")
+            self.assertEqual(len(server.requests), 1)
+        self.assertEqual(scheduler.failures, 1)
+        self.assertEqual(self.delays, [])
+
+    def test_timeout_is_retried(self):
+        scheduler = self.make_scheduler(max_retries=1, timeout=0.05)
+        with FakeWuzzufServer(delay=0.3) as server:
+            with self.assertRaises(requests.Timeout):
+                scheduler.get(server.base_url + "?q=python&start=0")
+        self.assertEqual(len(self.delays), 1)
+
+    def test_scrape_survives_throttling(self):
+        scheduler = self.make_scheduler(
+            backoff_base=0.01, concurrency=AdaptiveConcurrency(initial=4, maximum=4))
+        with ThrottlingServer(failures_per_page=1, total_jobs=150) as server:
+            ok, data = scrape_wuzzuf_jobs("python", 5, workers=4, base_url=server.base_url,
+                                          scheduler=scheduler)
+        self.assertTrue(ok)
+        self.assertEqual(len(data[0]), 150)
+        self.assertEqual(scheduler.retries, 5)
+        # الأخطاء خفضت حد التوازي
+        self.assertLess(scheduler.concurrency.limit, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
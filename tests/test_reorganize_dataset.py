@@ -2,10 +2,13 @@ import os
 import tempfile
 import shutil
 import unittest
-from unittest.mock import patch, MagicMock
 import sys
+import threading
+from contextlib import redirect_stdout
+from io import StringIO
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_operations import OperationCancelled
 from reorganize_dataset import reorganize_dataset
 
 
@@ -42,8 +45,7 @@ class TestReorganizeDataset(unittest.TestCase):
                 f.write("test content")
     
     """اختبار الوظيفة الأساسية لإعادة التنظيم"""
-    @patch('reorganize_dataset.QMessageBox')
-    def test_reorganize_basic_functionality(self, mock_msg):
+    def test_reorganize_basic_functionality(self):
         reorganize_dataset(self.source_dir, self.dest_dir)
         
         self.assertTrue(os.path.exists(self.dest_dir))
@@ -61,18 +63,17 @@ class TestReorganizeDataset(unittest.TestCase):
             self.assertTrue(os.path.exists(full_path), f"File {file_path} not copied")
     
     """اختبار عندما لا يوجد ملف CSV في المصدر"""
-    @patch('reorganize_dataset.QMessageBox')
-    def test_reorganize_without_csv(self, mock_msg):
+    def test_reorganize_without_csv(self):
         csv_file = os.path.join(self.source_dir, "data.csv")
         if os.path.exists(csv_file):
             os.remove(csv_file)
         
-        reorganize_dataset(self.source_dir, self.dest_dir)
-        mock_msg.warning.assert_called_once()
+        result = reorganize_dataset(self.source_dir, self.dest_dir)
+        # التحذير تعرضه الواجهة بناءً على csv_file
+        self.assertIsNone(result.csv_file)
     
     """اختبار مع مجلد مصدر فارغ"""
-    @patch('reorganize_dataset.QMessageBox')
-    def test_reorganize_empty_source(self, mock_msg):
+    def test_reorganize_empty_source(self):
         empty_dir = tempfile.mkdtemp()
         
         try:
@@ -82,15 +83,13 @@ class TestReorganizeDataset(unittest.TestCase):
             shutil.rmtree(empty_dir, ignore_errors=True)
     
     """اختبار مع مجلد مصدر غير موجود"""
-    @patch('reorganize_dataset.QMessageBox')
-    def test_reorganize_nonexistent_source(self, mock_msg):
+    def test_reorganize_nonexistent_source(self):
         non_existent_dir = "/non/existent/path"
-        reorganize_dataset(non_existent_dir, self.dest_dir)
-        mock_msg.critical.assert_called_once()
+        with self.assertRaises(FileNotFoundError):
+            reorganize_dataset(non_existent_dir, self.dest_dir)
     
     """اختبار عندما يكون المجلد الوجهة موجوداً مسبقاً"""
-    @patch('reorganize_dataset.QMessageBox')
-    def test_reorganize_dest_already_exists(self, mock_msg):
+    def test_reorganize_dest_already_exists(self):
         os.makedirs(self.dest_dir, exist_ok=True)
         reorganize_dataset(self.source_dir, self.dest_dir)
         
@@ -98,8 +97,7 @@ class TestReorganizeDataset(unittest.TestCase):
         self.assertTrue(os.path.exists(os.path.join(self.dest_dir, "data.csv")))
 
     """اختبار نسخ ملف CSV بشكل منفصل"""
-    @patch('reorganize_dataset.QMessageBox')
-    def test_csv_file_copied_separately(self, mock_msg):
+    def test_csv_file_copied_separately(self):
         reorganize_dataset(self.source_dir, self.dest_dir)
         
         csv_in_dest = os.path.join(self.dest_dir, "data.csv")
@@ -109,9 +107,16 @@ class TestReorganizeDataset(unittest.TestCase):
             content = f.read()
         self.assertEqual(content, "test content")
 
+    """رسالة CSV تعكس الملف الموجود فعلاً في الوجهة"""
+    def test_csv_message_reports_destination_file(self):
+        output = StringIO()
+        with redirect_stdout(output):
+            reorganize_dataset(self.source_dir, self.dest_dir, strategy="hardlink")
+        self.assertIn("CSV-файл в целевой папке", output.getvalue())
+        self.assertNotIn("Предупреждение", output.getvalue())
+
     """اختبار عندما يكون هناك multiple ملفات CSV"""
-    @patch('reorganize_dataset.QMessageBox')
-    def test_multiple_csv_files(self, mock_msg):
+    def test_multiple_csv_files(self):
         extra_csv = os.path.join(self.source_dir, "extra_data.csv")
         with open(extra_csv, 'w') as f:
             f.write("extra csv content")
@@ -123,6 +128,68 @@ class TestReorganizeDataset(unittest.TestCase):
         
         self.assertTrue(os.path.exists(csv1) or os.path.exists(csv2))
 
+    """ملف CSV يُنسخ مرة واحدة فقط مع باقي الملفات"""
+    def test_csv_not_copied_twice(self):
+        progress = []
+        result = reorganize_dataset(self.source_dir, self.dest_dir, workers=2,
+                                    progress=progress.append)
+
+        self.assertEqual(result.stats.files_done, 5)
+        self.assertEqual(result.csv_file, os.path.join(self.source_dir, "data.csv"))
+        self.assertEqual(progress[-1].files_done, progress[-1].files_total)
+
+    """الوحدة لا تعرض رسائل Qt بنفسها"""
+    def test_library_has_no_ui_notifications(self):
+        import reorganize_dataset as module
+        self.assertFalse(hasattr(module, "QMessageBox"))
+
+    """وضع dedup: الملفات المتطابقة تُنسخ مرة واحدة"""
+    def test_reorganize_with_dedup(self):
+        result = reorganize_dataset(self.source_dir, self.dest_dir, dedup=True)
+
+        # كل ملفات الاختبار بنفس المحتوى "test content"
+        self.assertEqual(result.duplicates.duplicate_files, 4)
+        first = os.path.join(self.dest_dir, "data.csv")
+        for name in ("file1.txt", os.path.join("subdir2", "nested", "file4.doc")):
+            self.assertTrue(os.path.samefile(first, os.path.join(self.dest_dir, name)))
+        with open(os.path.join(self.dest_dir, "subdir1", "file3.png")) as f:
+            self.assertEqual(f.read(), "test content")
+
+    """النسخ فوق روابط صلبة من تشغيل سابق لا يفسد المصدر"""
+    def test_copy_after_hardlink_keeps_source(self):
+        reorganize_dataset(self.source_dir, self.dest_dir, strategy="hardlink")
+        reorganize_dataset(self.source_dir, self.dest_dir)
+
+        source = os.path.join(self.source_dir, "subdir1", "file3.png")
+        dest = os.path.join(self.dest_dir, "subdir1", "file3.png")
+        with open(source) as f:
+            self.assertEqual(f.read(), "test content")
+        with open(dest) as f:
+            self.assertEqual(f.read(), "test content")
+        self.assertFalse(os.path.samefile(source, dest))
+
+    """إعادة النسخ بعد تشغيل dedup لا تكتب عبر الروابط المشتركة"""
+    def test_copy_after_dedup_keeps_source(self):
+        reorganize_dataset(self.source_dir, self.dest_dir, strategy="hardlink", dedup=True)
+        reorganize_dataset(self.source_dir, self.dest_dir)
+
+        for root, _, names in os.walk(self.source_dir):
+            for name in names:
+                source = os.path.join(root, name)
+                dest = os.path.join(self.dest_dir, os.path.relpath(source, self.source_dir))
+                with open(source) as f:
+                    self.assertEqual(f.read(), "test content", source)
+                with open(dest) as f:
+                    self.assertEqual(f.read(), "test content", dest)
+                self.assertEqual(os.stat(dest).st_nlink, 1)
+
+    """الإلغاء يُمرر إلى المستدعي"""
+    def test_cancel_is_raised(self):
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with self.assertRaises(OperationCancelled):
+            reorganize_dataset(self.source_dir, self.dest_dir, cancel_event=cancel_event)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
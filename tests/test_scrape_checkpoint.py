@@ -0,0 +1,195 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrape_checkpoint import ScrapeCheckpoint
+from web_scraping import JobRecord, scrape_wuzzuf_jobs, get_parser
+from tests.fake_wuzzuf_server import FakeWuzzufServer, make_results_page
+
+
+class FlakyServer(FakeWuzzufServer):
+    """خادم يقطع الاتصال عند صفحة محددة"""
+
+    def __init__(self, fail_page=None, fail_status=None, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_page = fail_page
+        # رمز الحالة لصفحة الخطأ؛ None - قطع الاتصال
+        self.fail_status = fail_status
+
+    def handle(self, handler):
+        page_num = int(parse_qs(urlsplit(handler.path).query).get("start", ["0"])[0])
+        if page_num == self.fail_page:
+            if self.fail_status is None:
+                handler.close_connection = True
+                return
+            body = b"<html><body>Error</body></html>"
+            handler.send_response(self.fail_status)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+            return
+        super().handle(handler)
+
+
+def requested_pages(server):
+    return sorted(int(parse_qs(urlsplit(path).query)["start"][0]) for path in server.requests)
+
+
+class TestScrapeCheckpoint(unittest.TestCase):
+    """اختبارات نقاط حفظ الاستخراج"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.checkpoint = ScrapeCheckpoint(self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_resume_after_failure(self):
+        with FlakyServer(fail_page=3, total_jobs=300) as server:
+            ok, data = scrape_wuzzuf_jobs("python", 6, base_url=server.base_url,
+                                          checkpoint=self.checkpoint)
+            self.assertFalse(ok)
+            self.assertEqual(data, [])
+            self.assertEqual(self.checkpoint.completed_pages("python", server.base_url), [0, 1, 2])
+
+            server.fail_page = None
+            server.requests.clear()
+            ok, data = scrape_wuzzuf_jobs("python", 6, base_url=server.base_url,
+                                          checkpoint=self.checkpoint)
+            # فقط الصفحات الناقصة تُحمل من جديد
+            self.assertEqual(requested_pages(server), [3, 4, 5])
+
+        self.assertTrue(ok)
+        self.assertEqual(len(data[0]), 180)
+        self.assertEqual(data[0][:2], ["python job 0", "python job 1"])
+        self.assertEqual(self.checkpoint.resumed, 3)
+        # التشغيل المكتمل يحذف نقاط الحفظ
+        self.assertEqual(self.checkpoint.completed_pages("python", server.base_url), [])
+
+    def test_error_pages_are_not_checkpointed(self):
+        for status in (403, 404, 500):
+            self.checkpoint.clear()
+            with FlakyServer(fail_page=2, fail_status=status, total_jobs=300) as server:
+                ok, _ = scrape_wuzzuf_jobs("python", 4, base_url=server.base_url,
+                                           checkpoint=self.checkpoint)
+                self.assertFalse(ok)
+                self.assertNotIn(2, self.checkpoint.completed_pages("python", server.base_url))
+
+                server.fail_page = None
+                server.requests.clear()
+                ok, data = scrape_wuzzuf_jobs("python", 4, base_url=server.base_url,
+                                              checkpoint=self.checkpoint)
+                self.assertIn(2, requested_pages(server))
+            self.assertTrue(ok)
+            self.assertEqual(len(data[0]), 120)
+
+    def test_concurrent_resume(self):
+        with FlakyServer(fail_page=4, total_jobs=300) as server:
+            ok, _ = scrape_wuzzuf_jobs("python", 6, workers=3, base_url=server.base_url,
+                                       checkpoint=self.checkpoint)
+            self.assertFalse(ok)
+            saved = self.checkpoint.completed_pages("python", server.base_url)
+            self.assertIn(0, saved)
+            self.assertNotIn(4, saved)
+
+            server.fail_page = None
+            server.requests.clear()
+            ok, data = scrape_wuzzuf_jobs("python", 6, workers=3, base_url=server.base_url,
+                                          checkpoint=self.checkpoint)
+            self.assertNotIn(0, requested_pages(server))
+            self.assertIn(4, requested_pages(server))
+
+        self.assertTrue(ok)
+        self.assertEqual(data[0], [f"python job {n}" for n in range(180)])
+
+    def test_reparse_from_html_with_other_parser(self):
+        base_url = "http://example.invalid/search/jobs/"
+        page = make_results_page("python", 0, total_jobs=10).encode("utf-8")
+        self.checkpoint.save_html("python", base_url, 0, page)
+        self.checkpoint.save_records("python", base_url, 0, "bs4",
+                                     *get_parser("bs4")(page))
+
+        result = self.checkpoint.load_page("python", base_url, 0, "lxml",
+                                           get_parser("lxml"), JobRecord)
+        page_limit, records, skipped = result
+        self.assertEqual(page_limit, 10)
+        self.assertEqual(len(records), 10)
+        self.assertIsInstance(records[0], JobRecord)
+        self.assertEqual(skipped, 0)
+
+        # السجلات المحفوظة تعاد بنفس الشكل
+        cached = self.checkpoint.load_page("python", base_url, 0, "lxml",
+                                           get_parser("lxml"), JobRecord)
+        self.assertEqual(cached, result)
+
+    def test_missing_and_corrupted_pages(self):
+        base_url = "http://example.invalid/search/jobs/"
+        self.assertIsNone(self.checkpoint.load_page("python", base_url, 0, "bs4",
+                                                    get_parser("bs4"), JobRecord))
+
+        page = make_results_page("python", 0, total_jobs=5).encode("utf-8")
+        self.checkpoint.save_html("python", base_url, 0, page)
+        json_path = self.checkpoint._page_paths("python", base_url, 0)[1]
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        page_limit, records, _ = self.checkpoint.load_page("python", base_url, 0, "bs4",
+                                                           get_parser("bs4"), JobRecord)
+        self.assertEqual(page_limit, 5)
+        self.assertEqual(records[4].link, "/jobs/p/python-4")
+
+        self.checkpoint.clear()
+        self.assertEqual(self.checkpoint.completed_pages("python", base_url), [])
+
+    def test_expired_pages_are_refetched(self):
+        base_url = "http://example.invalid/search/jobs/"
+        page = make_results_page("python", 0, total_jobs=5).encode("utf-8")
+        self.checkpoint.save_html("python", base_url, 0, page)
+        self.checkpoint.save_records("python", base_url, 0, "bs4",
+                                     *get_parser("bs4")(page))
+        self.assertIsNotNone(self.checkpoint.load_page("python", base_url, 0, "bs4",
+                                                       get_parser("bs4"), JobRecord))
+
+        # صفحة محملة قبل أكثر من max_age
+        old = time.time() - self.checkpoint.max_age - 60
+        for path in self.checkpoint._page_paths("python", base_url, 0):
+            os.utime(path, (old, old))
+        self.assertIsNone(self.checkpoint.load_page("python", base_url, 0, "bs4",
+                                                    get_parser("bs4"), JobRecord))
+        self.assertEqual(self.checkpoint.completed_pages("python", base_url), [])
+        self.assertEqual(self.checkpoint.resumed, 1)
+
+        unlimited = ScrapeCheckpoint(self.test_dir, max_age=None)
+        self.assertEqual(unlimited.completed_pages("python", base_url), [0])
+
+    def test_default_dir_follows_environment(self):
+        with patch.dict(os.environ, {"JOB_ANALYTICS_CACHE_DIR": self.test_dir}):
+            self.assertEqual(ScrapeCheckpoint().checkpoint_dir,
+                             os.path.join(self.test_dir, "scrape_checkpoints"))
+
+    def test_counters_are_thread_safe(self):
+        base_url = "http://example.invalid/search/jobs/"
+
+        def save(worker):
+            for n in range(50):
+                self.checkpoint.save_html("python", base_url, worker * 50 + n, b"")
+
+        threads = [threading.Thread(target=save, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.checkpoint.fetched, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills_index import (SkillIndex, split_skills_text, tokenize_skills,
+                          encode_postings, decode_postings)
+
+
+class TestSkillsTokenizer(unittest.TestCase):
+    """اختبارات تقسيم نص المهارات"""
+
+    def test_split_glued_flags_and_skills(self):
+        text = ("Full TimePart TimeOn-siteEntry Level · 1 - 3 Yrs of Exp · "
+                "IT/Software Development · Python ·  Django  · python")
+        flags, skills = split_skills_text(text)
+
+        self.assertEqual(flags, ['full time', 'part time', 'on-site', 'entry level'])
+        self.assertEqual(skills, ['it/software development', 'python', 'django'])
+
+    def test_alternative_separators(self):
+        self.assertEqual(tokenize_skills("Full TimeRemoteExperienced � 2+ Yrs of Exp � SQL"),
+                         ['sql'])
+        self.assertEqual(tokenize_skills("Full TimeHybridExperienced ∑ Git ∑ AWS"), ['git', 'aws'])
+
+    def test_empty_values(self):
+        self.assertEqual(tokenize_skills(None), [])
+        self.assertEqual(tokenize_skills(float('nan')), [])
+        self.assertEqual(tokenize_skills(""), [])
+
+    def test_postings_roundtrip(self):
+        ids = [0, 1, 5, 130, 20000, 20001]
+        encoded = encode_postings(ids)
+        self.assertLess(len(encoded), len(ids) * 8)
+        self.assertEqual(decode_postings(encoded).tolist(), ids)
+
+
+class TestSkillIndex(unittest.TestCase):
+    """اختبارات الفهرس المقلوب للمهارات"""
+
+    def setUp(self):
+        self.index = SkillIndex([
+            "Full TimeOn-siteExperienced · Python · Django",
+            "Full TimeRemoteEntry Level · Python · Flask",
+            None,
+            "InternshipHybridStudent · Java · SQL",
+            "Full TimeExperienced · Python · SQL · Django",
+        ])
+
+    def test_postings_and_counts(self):
+        self.assertEqual(self.index.num_rows, 5)
+        self.assertEqual(self.index.postings('PYTHON').tolist(), [0, 1, 4])
+        self.assertEqual(self.index.count('django'), 2)
+        self.assertNotIn('full time', self.index)
+
+    def test_query_all(self):
+        self.assertEqual(self.index.query_all(['python', 'django']).tolist(), [0, 4])
+        self.assertEqual(self.index.query_all(['python', 'rust']).tolist(), [])
+        self.assertEqual(self.index.query_all([]).tolist(), [])
+
+    def test_query_any(self):
+        self.assertEqual(self.index.query_any(['flask', 'java']).tolist(), [1, 3])
+
+    def test_top_skills(self):
+        self.assertEqual(self.index.top_skills(2), [('python', 3), ('django', 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup_profiling import (LazyCallable, StartupProfiler, preload_modules,
+                               report_requested, STARTUP_REPORT_ENV)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeClock:
+    """ساعة وهمية تتقدم يدوياً"""
+
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStartupProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = StartupProfiler(clock=self.clock)
+
+    def test_measure_and_marks(self):
+        with self.profiler.measure("heavy"):
+            self.clock.now += 0.25
+        self.clock.now += 0.5
+        self.assertAlmostEqual(self.profiler.mark("first paint"), 0.75)
+        # أول تسجيل للمرحلة يبقى
+        self.clock.now += 1.0
+        self.assertAlmostEqual(self.profiler.mark("first paint"), 0.75)
+
+        data = self.profiler.as_dict()
+        self.assertAlmostEqual(data["imports"]["heavy"], 0.25)
+        self.assertAlmostEqual(data["marks"]["first paint"], 0.75)
+
+        report = self.profiler.report()
+        self.assertIn("import heavy", report)
+        self.assertIn("250.0", report)
+        self.assertIn("first paint", report)
+
+    def test_import_module_skips_loaded(self):
+        self.profiler.import_module("json")
+        self.assertNotIn("json", self.profiler.imports)
+
+    def test_lazy_callable_imports_on_first_call(self):
+        lazy = LazyCallable("textwrap", "dedent", self.profiler)
+        self.assertEqual(lazy.__name__, "dedent")
+        self.assertEqual(lazy("  a\n  b"), "a\nb")
+        self.assertIs(lazy.resolve(), lazy.resolve())
+
+    def test_lazy_callable_unknown_module(self):
+        lazy = LazyCallable("no_such_module_for_tests", "run", self.profiler)
+        with self.assertRaises(ImportError):
+            lazy()
+
+    def test_preload_modules(self):
+        thread = preload_modules(["colorsys", "no_such_module_for_tests"], self.profiler)
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertIn("colorsys", sys.modules)
+        self.assertIn("background preload done", self.profiler.marks)
+
+    def test_report_requested(self):
+        os.environ.pop(STARTUP_REPORT_ENV, None)
+        self.assertFalse(report_requested(["main_window.py"]))
+        self.assertTrue(report_requested(["main_window.py", "--profile-startup"]))
+        os.environ[STARTUP_REPORT_ENV] = "1"
+        try:
+            self.assertTrue(report_requested(["main_window.py"]))
+        finally:
+            del os.environ[STARTUP_REPORT_ENV]
+
+
+class TestMainWindowStartup(unittest.TestCase):
+    def test_import_does_not_load_heavy_modules(self):
+        """استيراد main_window لا يحمّل pandas أو matplotlib أو requests"""
+        code = ("import sys, main_window; "
+                "print(','.join(m for m in ('pandas', 'matplotlib', 'requests', 'bs4') "
+                "if m in sys.modules))")
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,21 @@
 import unittest
 import os
 import sys
+import csv
+import tempfile
+import shutil
 from unittest.mock import patch, MagicMock
+from urllib.parse import parse_qs, urlsplit
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from web_scraping import scrape_wuzzuf_jobs, save_jobs_to_csv
+from web_scraping import (scrape_wuzzuf_jobs, scrape_wuzzuf_batch, save_jobs_to_csv,
+                          load_seen_links, SEEN_LINKS_SUFFIX, BATCH_HEADER,
+                          parse_jobs_page, parse_job_cards, benchmark_parsers,
+                          register_parser, PARSERS, JobRecord)
+from tests.fake_wuzzuf_server import FakeWuzzufServer, make_results_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
 
 
 class TestWebScraping(unittest.TestCase):
@@ -21,6 +31,10 @@ class TestWebScraping(unittest.TestCase):
             ["Skills 1", "Skills 2"],         # مهارات
             ["Link 1", "Link 2"]              # روابط
         ]
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
     
     @patch('web_scraping.requests.get')
     # اختبار استخراج البيانات بنجاح (محاكاة
@@ -79,6 +93,98 @@ class TestWebScraping(unittest.TestCase):
         success = save_jobs_to_csv(None, "test.csv")
         self.assertFalse(success)  # يجب أن تعيد False
     
+    # اختبار وضع الإضافة مع إزالة التكرار حسب الرابط
+    def test_save_jobs_to_csv_append_dedup(self):
+        test_file = os.path.join(self.test_dir, "jobs.csv")
+        self.assertTrue(save_jobs_to_csv(self.test_data, test_file, mode="a"))
+        
+        second_page = [
+            ["Job Title 2", "Job Title 3"],
+            ["Company 2", "Company 3"],
+            ["Date 2", "Date 3"],
+            ["Location 2", "Location 3"],
+            ["Skills 2", "Skills 3"],
+            ["Link 2", "Link 3"]
+        ]
+        self.assertTrue(save_jobs_to_csv(second_page, test_file, mode="a"))
+        
+        with open(test_file, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][-1], "links")
+        self.assertEqual([row[-1] for row in rows[1:]], ["Link 1", "Link 2", "Link 3"])
+        self.assertTrue(os.path.exists(test_file + SEEN_LINKS_SUFFIX))
+    
+    # اختبار بناء قائمة الروابط من ملف موجود بدون ملف جانبي
+    def test_save_jobs_to_csv_append_to_existing_file(self):
+        test_file = os.path.join(self.test_dir, "jobs.csv")
+        self.assertTrue(save_jobs_to_csv(self.test_data, test_file))
+        self.assertFalse(os.path.exists(test_file + SEEN_LINKS_SUFFIX))
+        
+        self.assertTrue(save_jobs_to_csv(self.test_data, test_file, mode="a"))
+        with open(test_file, encoding="utf-8", newline="") as f:
+            self.assertEqual(len(list(csv.reader(f))), 3)
+    
+    # اختبار ملف جانبي قديم بعد حذف ملف CSV أو تعديله خارجياً
+    def test_save_jobs_to_csv_append_with_stale_sidecar(self):
+        test_file = os.path.join(self.test_dir, "jobs.csv")
+        self.assertTrue(save_jobs_to_csv(self.test_data, test_file, mode="a"))
+        
+        # CSV حُذف والملف الجانبي بقي: كل الوظائف تُكتب من جديد
+        os.remove(test_file)
+        self.assertTrue(os.path.exists(test_file + SEEN_LINKS_SUFFIX))
+        self.assertTrue(save_jobs_to_csv(self.test_data, test_file, mode="a"))
+        with open(test_file, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual([row[-1] for row in rows[1:]], ["Link 1", "Link 2"])
+        
+        # CSV أعيدت كتابته خارجياً بدون Link 2
+        with open(test_file, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(rows[:2])
+        self.assertTrue(save_jobs_to_csv(self.test_data, test_file, mode="a"))
+        with open(test_file, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual([row[-1] for row in rows[1:]], ["Link 1", "Link 2"])
+    
+    # الإضافة المتكررة لا تكبر الملف الجانبي: سطر ختم واحد دائماً
+    def test_save_jobs_to_csv_append_keeps_one_sidecar_stamp(self):
+        test_file = os.path.join(self.test_dir, "jobs.csv")
+        for _ in range(3):
+            self.assertTrue(save_jobs_to_csv(self.test_data, test_file, mode="a"))
+        with open(test_file + SEEN_LINKS_SUFFIX, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[-1].startswith("#csv "))
+        self.assertEqual(len(load_seen_links(test_file)), 2)
+    
+    # اختبار إضافة نتائج دفعة (7 أعمدة) إلى ملف بستة أعمدة والعكس
+    def test_save_jobs_to_csv_append_mixed_headers(self):
+        plain_file = os.path.join(self.test_dir, "plain.csv")
+        batch_file = os.path.join(self.test_dir, "batch.csv")
+        batch_data = [["t2"], ["c2"], ["d2"], ["l2"], ["s2"], ["link2"], ["python|django"]]
+        plain_data = [["t3"], ["c3"], ["d3"], ["l3"], ["s3"], ["link3"]]
+        
+        self.assertTrue(save_jobs_to_csv(self.test_data, plain_file))
+        self.assertTrue(save_jobs_to_csv(batch_data, plain_file, mode="a"))
+        with open(plain_file, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual({len(row) for row in rows}, {6})
+        self.assertEqual(rows[-1], ["t2", "c2", "d2", "l2", "s2", "link2"])
+        
+        self.assertTrue(save_jobs_to_csv(batch_data, batch_file))
+        self.assertTrue(save_jobs_to_csv(plain_data, batch_file, mode="a"))
+        with open(batch_file, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], BATCH_HEADER)
+        self.assertEqual(rows[-1], ["t3", "c3", "d3", "l3", "s3", "link3", ""])
+        
+        # ملف بعناوين غير معروفة لا يُضاف إليه
+        other_file = os.path.join(self.test_dir, "other.csv")
+        with open(other_file, "w", encoding="utf-8", newline="") as f:
+            f.write("id,name\n1,x\n")
+        self.assertFalse(save_jobs_to_csv(plain_data, other_file, mode="a"))
+        with open(other_file, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "id,name\n1,x\n")
+    
     # اختبار خطأ في الشبكة
     def test_scrape_jobs_network_error(self):
         with patch('web_scraping.requests.get') as mock_get:
@@ -90,5 +196,225 @@ class TestWebScraping(unittest.TestCase):
             self.assertEqual(data, [])
 
 
+
+class TestConcurrentScraping(unittest.TestCase):
+    """اختبارات الاستخراج المتوازي مع خادم محلي"""
+    
+    def test_concurrent_matches_serial_order(self):
+        with FakeWuzzufServer(total_jobs=95) as server:
+            ok_serial, serial = scrape_wuzzuf_jobs("python", 10, base_url=server.base_url)
+            ok_parallel, parallel = scrape_wuzzuf_jobs("python", 10, workers=4,
+                                                       base_url=server.base_url)
+        
+        self.assertTrue(ok_serial)
+        self.assertTrue(ok_parallel)
+        self.assertEqual(len(parallel[0]), 95)
+        self.assertEqual(parallel[0][:2], ["python job 0", "python job 1"])
+        self.assertEqual(parallel[0][-1], "python job 94")
+        # الترتيب نفسه كما في الوضع التسلسلي
+        self.assertEqual(parallel[0], serial[0])
+        self.assertEqual(parallel[5], serial[5])
+    
+    def test_concurrent_respects_max_pages(self):
+        with FakeWuzzufServer(total_jobs=300) as server:
+            success, data = scrape_wuzzuf_jobs("python", 3, workers=4, base_url=server.base_url)
+            self.assertEqual(len(server.requests), 3)
+        self.assertTrue(success)
+        self.assertEqual(len(data[0]), 90)
+    
+    def test_per_host_cap_and_connection_reuse(self):
+        with FakeWuzzufServer(total_jobs=300, delay=0.05) as server:
+            success, _ = scrape_wuzzuf_jobs("python", 10, workers=6, max_per_host=2,
+                                            base_url=server.base_url)
+            self.assertTrue(success)
+            self.assertLessEqual(server.max_in_flight, 2)
+            # الاتصالات يعاد استخدامها (keep-alive)
+            self.assertLess(len(server.client_ports), len(server.requests))
+    
+    def test_concurrent_failure_returns_empty(self):
+        success, data = scrape_wuzzuf_jobs("python", 3, workers=2,
+                                           base_url="http://127.0.0.1:9/search/jobs/")
+        self.assertFalse(success)
+        self.assertEqual(data, [])
+
+
+class TestPageParsers(unittest.TestCase):
+    """اختبارات محللات صفحات النتائج على صفحة محفوظة"""
+    
+    def setUp(self):
+        with open(os.path.join(FIXTURES_DIR, "wuzzuf_search_page.html"), "rb") as f:
+            self.page = f.read()
+    
+    def test_lxml_matches_bs4_on_fixture(self):
+        limit_bs4, lists_bs4 = parse_jobs_page(self.page, parser="bs4")
+        limit_lxml, lists_lxml = parse_jobs_page(self.page, parser="lxml")
+        
+        self.assertEqual(limit_lxml, limit_bs4)
+        self.assertEqual(limit_lxml, 15)
+        self.assertEqual(lists_lxml, lists_bs4)
+        self.assertEqual(lists_lxml[0][10], "مطور بايثون")
+        self.assertEqual(lists_lxml[5][0], "/jobs/p/1000-senior-python-developer-cairo-egypt")
+        # str و bytes يعطيان النتيجة نفسها
+        self.assertEqual(parse_jobs_page(self.page.decode("utf-8"), parser="lxml")[1], lists_lxml)
+    
+    def test_dates_stay_with_their_cards(self):
+        page = make_results_page("python", 0, total_jobs=4)
+        for parser in ("bs4", "lxml"):
+            _, lists = parse_jobs_page(page, parser=parser)
+            self.assertEqual(lists[2], ["1 days ago", "2 days ago", "3 days ago", "4 days ago"])
+    
+    def test_malformed_cards_are_skipped(self):
+        page = (
+            '<html><body><strong>3</strong>'
+            '<div><h2 class="css-193uk2c"><a href="/jobs/p/1">Job 1</a></h2>'
+            '<a class="css-ipsyv7">Company 1</a><div class="css-1jldrig">1 days ago</div></div>'
+            # بطاقة بدون شركة
+            '<div><h2 class="css-193uk2c"><a href="/jobs/p/2">Job 2</a></h2>'
+            '<span class="css-16x61xq">Cairo</span></div>'
+            '<div><h2 class="css-193uk2c"><a href="/jobs/p/3">Job 3</a></h2>'
+            '<a class="css-ipsyv7">Company 3</a><span class="css-16x61xq">Giza</span>'
+            '<div class="css-1rhj4yg">Python</div><div class="css-eg55jf">3 days ago</div></div>'
+            '</body></html>')
+        for parser in ("bs4", "lxml"):
+            page_limit, records, skipped = parse_job_cards(page, parser=parser)
+            self.assertEqual(page_limit, 3)
+            self.assertEqual(skipped, 1)
+            self.assertEqual(records, [
+                JobRecord("Job 1", "Company 1", "1 days ago", "", "", "/jobs/p/1"),
+                JobRecord("Job 3", "Company 3", "3 days ago", "Giza", "Python", "/jobs/p/3"),
+            ])
+    
+    def test_scrape_counts_skipped_cards(self):
+        class BrokenCardsServer(FakeWuzzufServer):
+            def handle(self, handler):
+                body = make_results_page("python", 0, 5).replace(
+                    '<a class="css-ipsyv7">Company 2 -</a>', '').encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+        
+        stats = {}
+        with BrokenCardsServer() as server:
+            ok, data = scrape_wuzzuf_jobs("python", 1, base_url=server.base_url, stats=stats)
+        self.assertTrue(ok)
+        self.assertEqual(stats, {"jobs": 4, "skipped": 1})
+        self.assertNotIn("python job 2", data[0])
+        self.assertEqual(data[1][2], "Company 3 -")
+    
+    def test_scrape_with_lxml_parser(self):
+        with FakeWuzzufServer(total_jobs=95) as server:
+            ok, data = scrape_wuzzuf_jobs("python", 10, workers=3, parser="lxml",
+                                          base_url=server.base_url)
+        self.assertTrue(ok)
+        self.assertEqual(len(data[0]), 95)
+        self.assertEqual(data[5][-1], "/jobs/p/python-94")
+    
+    def test_unknown_parser(self):
+        with self.assertRaises(ValueError):
+            parse_jobs_page(self.page, parser="regex")
+        self.assertEqual(scrape_wuzzuf_jobs("python", 1, parser="regex"), (False, []))
+    
+    def test_register_and_benchmark(self):
+        register_parser("empty", lambda src: (0, [], 0))
+        try:
+            timings = benchmark_parsers([self.page] * 3, repeat=2)
+        finally:
+            del PARSERS["empty"]
+        self.assertEqual(set(timings), {"bs4", "lxml", "empty"})
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+
+
+class OverlappingQueriesServer(FakeWuzzufServer):
+    """خادم بعدد وظائف مختلف لكل استعلام وروابط مشتركة بينها"""
+    
+    def __init__(self, totals, failing_pages=(), **kwargs):
+        super().__init__(**kwargs)
+        self.totals = totals
+        # (query, start) صفحات تفشل دائماً
+        self.failing_pages = set(failing_pages)
+    
+    def handle(self, handler):
+        params = parse_qs(urlsplit(handler.path).query)
+        query = params["q"][0]
+        if query not in self.totals or (query, params["start"][0]) in self.failing_pages:
+            handler.close_connection = True
+            return
+        body = make_results_page(query, int(params["start"][0]), self.totals[query],
+                                 link_prefix="job").encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+class TestBatchScraping(unittest.TestCase):
+    """اختبارات الاستخراج الدفعي لعدة استعلامات"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_batch_dedups_by_link_and_tags_queries(self):
+        stats = {}
+        with OverlappingQueriesServer({"python": 60, "django": 75, "sql": 10}) as server:
+            ok, data = scrape_wuzzuf_batch(["python", "django", "sql", "python"], 5, workers=4,
+                                           base_url=server.base_url, stats=stats)
+            # python: 3 صفحات، django: 3، sql: 1 (الاستعلام المكرر لا يُنفذ مرتين)
+            self.assertEqual(len(server.requests), 7)
+        
+        self.assertTrue(ok)
+        self.assertEqual(len(data), len(BATCH_HEADER))
+        self.assertEqual(len(data[0]), 75)
+        self.assertEqual(stats["duplicates"], 70)
+        self.assertEqual(stats["failed_queries"], [])
+        # السجل الأول حسب ترتيب الاستعلامات يبقى
+        self.assertEqual(data[0][:2], ["python job 0", "python job 1"])
+        self.assertEqual(data[0][60:62], ["django job 60", "django job 61"])
+        self.assertEqual(data[6][0], "python|django|sql")
+        self.assertEqual(data[6][20], "python|django")
+        self.assertEqual(data[6][-1], "django")
+        self.assertEqual(len(set(data[5])), 75)
+    
+    def test_batch_keeps_results_of_healthy_queries(self):
+        stats = {}
+        with OverlappingQueriesServer({"python": 30}) as server:
+            ok, data = scrape_wuzzuf_batch(["python", "broken"], 2, workers=2,
+                                           base_url=server.base_url, stats=stats)
+        self.assertTrue(ok)
+        self.assertEqual(len(data[0]), 30)
+        self.assertEqual(stats["failed_queries"], ["broken"])
+        
+        with OverlappingQueriesServer({}) as server:
+            self.assertEqual(scrape_wuzzuf_batch(["broken"], 2, base_url=server.base_url),
+                             (False, []))
+    
+    def test_batch_drops_rows_of_partially_failed_query(self):
+        stats = {}
+        with OverlappingQueriesServer({"python": 60, "django": 75},
+                                      failing_pages=[("django", "1")]) as server:
+            ok, data = scrape_wuzzuf_batch(["python", "django"], 5, workers=2,
+                                           base_url=server.base_url, stats=stats)
+        
+        self.assertTrue(ok)
+        self.assertEqual(stats["failed_queries"], ["django"])
+        # صفحة django الأولى نجحت لكن صفوفها لا تظهر
+        self.assertEqual(len(data[0]), 60)
+        self.assertEqual(set(data[6]), {"python"})
+        self.assertEqual(stats["duplicates"], 0)
+    
+    def test_save_batch_with_queries_column(self):
+        test_file = os.path.join(self.test_dir, "batch.csv")
+        data = [column[:] for column in [["T"], ["C"], ["D"], ["L"], ["S"], ["/j/1"]]]
+        data.append(["python|django"])
+        self.assertTrue(save_jobs_to_csv(data, test_file))
+        with open(test_file, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], BATCH_HEADER)
+        self.assertEqual(rows[1][-1], "python|django")
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
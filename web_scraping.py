@@ -5,13 +5,440 @@ Web Scraping Module - مختبر 1
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 import csv
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from itertools import zip_longest
-from typing import List, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
+from http_cache import HttpCache
+from rate_limiting import DEFAULT_TIMEOUT, RequestScheduler
+from scrape_checkpoint import ScrapeCheckpoint
 
-def scrape_wuzzuf_jobs(search_query: str = "python", max_pages: int = 2) -> Tuple[bool, List]:
+WUZZUF_SEARCH_URL = "https://wuzzuf.net/search/jobs/"
+# Jobs per results page on Wuzzuf - عدد الوظائف في صفحة النتائج
+JOBS_PER_PAGE = 30
+# Default pool size for concurrent fetching - حجم المجموعة الافتراضي
+DEFAULT_WORKERS = 8
+
+CSV_HEADER = ["job title", "company name", "date", "location", "skills", "links"]
+# Batch results carry the matching queries as a 7th column
+# نتائج الدفعة تحمل الاستعلامات المطابقة كعمود سابع
+BATCH_HEADER = CSV_HEADER + ["queries"]
+QUERY_SEPARATOR = "|"
+# Файл с хешами уже сохраненных ссылок рядом с CSV
+# ملف بصمات الروابط المحفوظة بجانب ملف CSV
+SEEN_LINKS_SUFFIX = ".links"
+# Строка файла хешей с размером и временем CSV на момент записи
+# سطر في ملف البصمات بحجم وزمن ملف CSV وقت الكتابة
+SEEN_LINKS_STAMP = "#csv "
+
+
+def build_search_url(search_query: str, page_num: int, base_url: str = WUZZUF_SEARCH_URL) -> str:
+    """
+    Build search results URL for a page - إنشاء رابط صفحة نتائج البحث
+    """
+    return f"{base_url}?a=hpb&q={search_query}&start={page_num}"
+
+
+class JobRecord(NamedTuple):
+    """
+    One job card from a results page - بطاقة وظيفة واحدة من صفحة النتائج
+    Одна карточка вакансии со страницы результатов
+    """
+    title: str
+    company: str
+    date: str
+    location: str
+    skills: str
+    link: str
+
+
+# Без этих полей карточка считается некорректной и пропускается
+# بدون هذه الحقول تعتبر البطاقة غير صالحة ويتم تخطيها
+REQUIRED_FIELDS = ("title", "company", "link")
+
+# Поле записи по (тег, CSS-класс) элемента карточки
+# الحقل حسب (الوسم، صنف CSS) لعنصر البطاقة
+CARD_FIELDS = {
+    ("h2", "css-193uk2c"): "title",
+    ("a", "css-ipsyv7"): "company",
+    ("span", "css-16x61xq"): "location",
+    ("div", "css-1rhj4yg"): "skills",
+    ("div", "css-eg55jf"): "date",
+    ("div", "css-1jldrig"): "date",
+}
+_CARD_TAGS = sorted({tag for tag, _ in CARD_FIELDS})
+_CARD_CLASSES = {cls for _, cls in CARD_FIELDS}
+_TITLE_TAG, _TITLE_CLASS = next(key for key, field in CARD_FIELDS.items() if field == "title")
+
+# Bytes from Wuzzuf are UTF-8 - صفحات Wuzzuf بترميز UTF-8
+_LXML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+# parser(src) -> (page_limit, records, skipped_cards)
+ParseFunc = Callable[[object], Tuple[Optional[int], List[JobRecord], int]]
+
+
+def _card_field(tag: str, classes) -> Optional[str]:
+    for cls in classes:
+        if cls in _CARD_CLASSES:
+            return CARD_FIELDS.get((tag, cls))
+    return None
+
+
+def _card_roots(titles: List, parent_of: Callable) -> List:
+    """
+    Card container for each title - حاوية البطاقة لكل عنوان
+    
+    The container is the highest ancestor that holds no other title, so the
+    fields of one card can never be paired with another card's title.
+    """
+    # id -> [node, titles below]; the node is kept so its id stays valid
+    counts: Dict[int, list] = {}
+    for title in titles:
+        node = parent_of(title)
+        while node is not None:
+            entry = counts.setdefault(id(node), [node, 0])
+            entry[1] += 1
+            node = parent_of(node)
+    
+    roots = []
+    for title in titles:
+        root = title
+        parent = parent_of(title)
+        while parent is not None and counts[id(parent)][1] == 1:
+            root = parent
+            parent = parent_of(parent)
+        roots.append(root)
+    return roots
+
+
+def make_job_record(fields: Dict[str, Optional[str]]) -> Optional[JobRecord]:
+    """
+    Build a record from card fields, None if a required one is missing
+    إنشاء سجل من حقول البطاقة، أو None عند نقص حقل إلزامي
+    """
+    if any(not fields.get(name) for name in REQUIRED_FIELDS):
+        return None
+    return JobRecord(*(fields.get(name) or "" for name in JobRecord._fields))
+
+
+def _collect_records(cards: List[Dict[str, Optional[str]]]) -> Tuple[List[JobRecord], int]:
+    records = []
+    for fields in cards:
+        record = make_job_record(fields)
+        if record is not None:
+            records.append(record)
+    return records, len(cards) - len(records)
+
+
+def records_to_lists(records: List[JobRecord]) -> List[List[str]]:
+    """
+    Records -> six parallel lists (CSV_HEADER order) - السجلات إلى ست قوائم
+    """
+    if not records:
+        return [[] for _ in JobRecord._fields]
+    return [list(column) for column in zip(*records)]
+
+
+def parse_job_cards_bs4(src) -> Tuple[Optional[int], List[JobRecord], int]:
+    """
+    Parse job cards with BeautifulSoup - تحليل بطاقات الوظائف باستخدام BeautifulSoup
+    Разбор карточек вакансий через BeautifulSoup
+    
+    Args:
+        src: Page HTML (bytes or str) - محتوى الصفحة
+        
+    Returns:
+        Tuple[Optional[int], List[JobRecord], int]: (Total jobs count, records, skipped cards)
+        (عدد الوظائف الكلي، السجلات، البطاقات المتخطاة)
+    """
+    soup = BeautifulSoup(src, "lxml")
+    
+    # Check page limit - التحقق من حد الصفحات
+    page_limit = None
+    page_limit_elem = soup.find("strong")
+    if page_limit_elem:
+        page_limit = int(page_limit_elem.text)
+    
+    titles = soup.find_all(_TITLE_TAG, {"class": _TITLE_CLASS})
+    cards = []
+    # Each card is read as a unit - كل بطاقة تُقرأ كوحدة واحدة
+    for title, root in zip(titles, _card_roots(titles, lambda tag: tag.parent)):
+        anchor = title.find("a")
+        fields = {"title": title.text, "link": anchor.get("href") if anchor else None}
+        for element in root.find_all(_CARD_TAGS):
+            field = _card_field(element.name, element.get("class") or ())
+            if field is not None and field not in fields:
+                fields[field] = element.text
+        cards.append(fields)
+    
+    records, skipped = _collect_records(cards)
+    return page_limit, records, skipped
+
+
+def parse_job_cards_lxml(src) -> Tuple[Optional[int], List[JobRecord], int]:
+    """
+    Parse job cards with lxml - تحليل بطاقات الوظائف باستخدام lxml
+    Разбор карточек вакансий через lxml (один обход каждой карточки)
+    
+    Args:
+        src: Page HTML (bytes or str) - محتوى الصفحة
+        
+    Returns:
+        Tuple[Optional[int], List[JobRecord], int]: (Total jobs count, records, skipped cards)
+        (عدد الوظائف الكلي، السجلات، البطاقات المتخطاة)
+    """
+    if isinstance(src, bytes):
+        root = lxml_html.document_fromstring(src, parser=_LXML_PARSER)
+    else:
+        root = lxml_html.document_fromstring(src)
+    
+    page_limit = None
+    strong = root.find(".//strong")
+    if strong is not None:
+        page_limit = int(strong.text_content())
+    
+    titles = [element for element in root.iter(_TITLE_TAG)
+              if _TITLE_CLASS in (element.get("class") or "").split()]
+    cards = []
+    for title, card in zip(titles, _card_roots(titles, lambda element: element.getparent())):
+        anchor = title.find(".//a")
+        fields = {"title": title.text_content(),
+                  "link": anchor.get("href") if anchor is not None else None}
+        for element in card.iter(*_CARD_TAGS):
+            classes = element.get("class")
+            if not classes:
+                continue
+            field = _card_field(element.tag, classes.split())
+            if field is not None and field not in fields:
+                fields[field] = element.text_content()
+        cards.append(fields)
+    
+    records, skipped = _collect_records(cards)
+    return page_limit, records, skipped
+
+
+# Зарегистрированные парсеры страниц - المحللات المسجلة
+PARSERS: Dict[str, ParseFunc] = {
+    "bs4": parse_job_cards_bs4,
+    "lxml": parse_job_cards_lxml,
+}
+DEFAULT_PARSER = "bs4"
+
+
+def register_parser(name: str, parse_func: ParseFunc) -> None:
+    """
+    Register a page parser under a name - تسجيل محلل صفحات باسم
+    """
+    PARSERS[name] = parse_func
+
+
+def get_parser(name: str = DEFAULT_PARSER) -> ParseFunc:
+    """
+    Look up a registered page parser - البحث عن محلل مسجل
+    """
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный парсер: {name}. Доступны: {', '.join(sorted(PARSERS))}")
+
+
+def parse_job_cards(src, parser: str = DEFAULT_PARSER) -> Tuple[Optional[int], List[JobRecord], int]:
+    """
+    Parse one results page into job records - تحليل صفحة نتائج إلى سجلات وظائف
+    """
+    return get_parser(parser)(src)
+
+
+def parse_jobs_page(src, parser: str = DEFAULT_PARSER) -> Tuple[Optional[int], List[List[str]]]:
+    """
+    Parse one search results page - تحليل صفحة نتائج بحث واحدة
+    Разбор одной страницы результатов поиска
+    
+    Args:
+        src: Page HTML (bytes or str) - محتوى الصفحة
+        parser (str): Registered page parser name - اسم محلل الصفحات
+        
+    Returns:
+        Tuple[Optional[int], List[List[str]]]: (Total jobs count, six data lists)
+        (عدد الوظائف الكلي، ست قوائم بيانات)
+    """
+    page_limit, records, _ = parse_job_cards(src, parser)
+    return page_limit, records_to_lists(records)
+
+
+def benchmark_parsers(pages: List, parsers: Optional[List[str]] = None,
+                      repeat: int = 5) -> Dict[str, float]:
+    """
+    Time registered parsers on saved pages - قياس زمن المحللات على صفحات محفوظة
+    Замер времени парсеров на сохраненных страницах
+    
+    Args:
+        pages (List): Page HTML documents - صفحات HTML
+        parsers (List[str]): Parser names (default: all) - أسماء المحللات
+        repeat (int): Runs per parser, best one is kept - عدد مرات التشغيل
+        
+    Returns:
+        Dict[str, float]: Best seconds per full pass over pages - أفضل زمن بالثواني
+    """
+    results = {}
+    for name in parsers or sorted(PARSERS):
+        parse_func = get_parser(name)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in pages:
+                parse_func(page)
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+def is_past_last_page(page_num: int, page_limit: Optional[int]) -> bool:
+    """
+    Whether page_num is beyond the last results page - هل الصفحة بعد آخر صفحة
+    """
+    return page_limit is not None and page_num > page_limit // JOBS_PER_PAGE
+
+
+def create_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    """
+    Shared HTTP session with a keep-alive connection pool - جلسة HTTP مشتركة
+    Общая HTTP-сессия с пулом постоянных соединений
+    
+    Args:
+        pool_size (int): Connections kept per host - عدد الاتصالات لكل مضيف
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class HostLimiter:
+    """
+    Caps concurrent requests per host - تحديد عدد الطلبات المتزامنة لكل مضيف
+    """
+    
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+
+def fetch_page(url: str, session: Optional[requests.Session] = None,
+               host_limiter: Optional[HostLimiter] = None,
+               http_cache: Optional[HttpCache] = None,
+               scheduler: Optional[RequestScheduler] = None) -> bytes:
+    """
+    Download one page - تحميل صفحة واحدة
+    Загрузка страницы (через HTTP-кэш и планировщик запросов, если заданы)
+
+    Raises:
+        requests.HTTPError: Ответ 4xx/5xx - استجابة 4xx/5xx
+    """
+    if scheduler is not None:
+        # Планировщик сам задает таймаут и повторяет запрос
+        # المجدول يحدد المهلة ويعيد المحاولة بنفسه
+        client, timeout = scheduler.bind(session), None
+    else:
+        client, timeout = (session if session is not None else requests), DEFAULT_TIMEOUT
+    
+    def download() -> bytes:
+        if http_cache is not None:
+            return http_cache.get(url, client, timeout=timeout)
+        response = client.get(url, timeout=timeout)
+        # Страница ошибки - не данные: ее нельзя разбирать и сохранять
+        # صفحة الخطأ ليست بيانات: لا تُحلل ولا تُحفظ
+        response.raise_for_status()
+        return response.content
+    
+    if host_limiter is None:
+        return download()
+    with host_limiter.for_url(url):
+        return download()
+
+
+def _load_or_fetch_page(search_query: str, page_num: int, base_url: str,
+                        session: Optional[requests.Session], host_limiter: Optional[HostLimiter],
+                        parser: str, checkpoint: Optional[ScrapeCheckpoint],
+                        http_cache: Optional[HttpCache],
+                        scheduler: Optional[RequestScheduler] = None):
+    parse_func = get_parser(parser)
+    if checkpoint is not None:
+        cached = checkpoint.load_page(search_query, base_url, page_num, parser,
+                                      parse_func, JobRecord)
+        if cached is not None:
+            return cached
+    
+    print(f"Извлечение страницы {page_num + 1}...")
+    content = fetch_page(build_search_url(search_query, page_num, base_url), session,
+                         host_limiter, http_cache, scheduler)
+    if checkpoint is None:
+        return parse_func(content)
+    # HTML сохраняется до разбора: ошибка парсера не требует новой загрузки
+    # يُحفظ HTML قبل التحليل: خطأ المحلل لا يتطلب تحميلاً جديداً
+    checkpoint.save_html(search_query, base_url, page_num, content)
+    result = parse_func(content)
+    checkpoint.save_records(search_query, base_url, page_num, parser, *result)
+    return result
+
+
+def _scrape_pages_concurrently(search_query: str, max_pages: int, workers: int,
+                               session: requests.Session, base_url: str, max_per_host: int,
+                               parser: str, checkpoint: Optional[ScrapeCheckpoint],
+                               http_cache: Optional[HttpCache],
+                               scheduler: Optional[RequestScheduler]) -> Tuple[List[JobRecord], int]:
+    limiter = HostLimiter(max_per_host)
+    
+    # First page gives the total count - الصفحة الأولى تعطي العدد الكلي
+    page_limit, first_page, skipped = _load_or_fetch_page(
+        search_query, 0, base_url, session, limiter, parser, checkpoint, http_cache, scheduler)
+    last_page = max_pages
+    if page_limit is not None:
+        last_page = min(max_pages, page_limit // JOBS_PER_PAGE + 1)
+    
+    def fetch_and_parse(page_num: int) -> Tuple[List[JobRecord], int]:
+        return _load_or_fetch_page(search_query, page_num, base_url, session, limiter,
+                                   parser, checkpoint, http_cache, scheduler)[1:]
+    
+    pages = {0: first_page}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch_and_parse, page_num): page_num
+                   for page_num in range(1, last_page)}
+        for future in as_completed(futures):
+            pages[futures[future]], page_skipped = future.result()
+            skipped += page_skipped
+    
+    # Reassemble in page order - إعادة التجميع بترتيب الصفحات
+    return [record for page_num in sorted(pages) for record in pages[page_num]], skipped
+
+
+def scrape_wuzzuf_jobs(search_query: str = "python", max_pages: int = 2,
+                       workers: int = 1, session: Optional[requests.Session] = None,
+                       base_url: str = WUZZUF_SEARCH_URL,
+                       max_per_host: Optional[int] = None,
+                       parser: str = DEFAULT_PARSER,
+                       stats: Optional[Dict[str, int]] = None,
+                       checkpoint: Optional[ScrapeCheckpoint] = None,
+                       http_cache: Optional[HttpCache] = None,
+                       scheduler: Optional[RequestScheduler] = None) -> Tuple[bool, List]:
     """
     Scrape job data from Wuzzuf website - استخراج بيانات الوظائف من موقع Wuzzuf
     Скрапинг данных о вакансиях с сайта Wuzzuf
@@ -19,69 +446,206 @@ def scrape_wuzzuf_jobs(search_query: str = "python", max_pages: int = 2) -> Tupl
     Args:
         search_query (str): Job search term - مصطلح البحث عن الوظائف
         max_pages (int): Maximum pages to scrape - الحد الأقصى لعدد الصفحات
+        workers (int): Pages fetched in parallel (1 = serial) - عدد الصفحات المتوازية
+        session (requests.Session): Shared session, created when workers > 1 - جلسة مشتركة
+        base_url (str): Search page URL - رابط صفحة البحث
+        max_per_host (int): Concurrent requests per host (default: workers) - حد الطلبات لكل مضيف
+        parser (str): Registered page parser name - اسم محلل الصفحات
+        stats (dict): Filled with "jobs" and "skipped" card counts - إحصاءات البطاقات
+        checkpoint (ScrapeCheckpoint): Page store for resuming failed runs - مخزن الصفحات للاستئناف
+        http_cache (HttpCache): Conditional-request HTTP cache - ذاكرة HTTP المؤقتة
+        scheduler (RequestScheduler): Pacing, retries and adaptive concurrency - جدولة الطلبات
         
     Returns:
         Tuple[bool, List]: (Success status, Data lists) - (حالة النجاح، قوائم البيانات)
     """
-    job_title = []
-    company_name = []
-    location_name = []
-    skills = []
-    links = []
-    date = []
-    page_num = 0
-
     # Starting data extraction
     print("Начало извлечения данных с Wuzzuf...")
     
+    own_session = session is None and workers > 1
+    if own_session:
+        session = create_session(workers)
+    
     try:
-        while page_num < max_pages:
-            # Extracting page
-            print(f"Извлечение страницы {page_num + 1}...")
-            
-            result = requests.get(f"https://wuzzuf.net/search/jobs/?a=hpb&q={search_query}&start={page_num}")
-            src = result.content
-            soup = BeautifulSoup(src, "lxml")
-            
-            # Check page limit - التحقق من حد الصفحات
-            page_limit_elem = soup.find("strong")
-            if page_limit_elem:
-                page_limit = int(page_limit_elem.text)
-                if page_num > page_limit // 30:
+        # Unknown parser fails before any download - المحلل غير المعروف يفشل قبل التحميل
+        get_parser(parser)
+        if workers > 1:
+            records, skipped = _scrape_pages_concurrently(
+                search_query, max_pages, workers, session, base_url, max_per_host or workers,
+                parser, checkpoint, http_cache, scheduler)
+        else:
+            records, skipped = [], 0
+            page_num = 0
+            while page_num < max_pages:
+                # Extracting page (or resuming it from the checkpoint)
+                page_limit, page_records, page_skipped = _load_or_fetch_page(
+                    search_query, page_num, base_url, session, None, parser, checkpoint,
+                    http_cache, scheduler)
+                if is_past_last_page(page_num, page_limit):
                     # تم الوصول إلى نهاية الصفحات" Reached end of pages
                     print("Достигнут конец страниц")
                     break
-            
-            # Extract job elements - استخراج عناصر الوظائف
-            jop_titles = soup.find_all("h2", {"class": "css-193uk2c"})
-            company_names = soup.find_all("a", {"class": "css-ipsyv7"})
-            locations_names = soup.find_all("span", {"class": "css-16x61xq"})
-            jop_skills = soup.find_all("div", {"class": "css-1rhj4yg"})
-            posted_new = soup.find_all("div", {"class": "css-eg55jf"})
-            posted_old = soup.find_all("div", {"class": "css-1jldrig"})
-            posted = [*posted_new, *posted_old]
-            
-            # Store data - تخزين البيانات
-            for i in range(len(jop_titles)):
-                job_title.append(jop_titles[i].text)
-                links.append(jop_titles[i].find("a").attrs['href'])
-                company_name.append(company_names[i].text)
-                location_name.append(locations_names[i].text)
-                skills.append(jop_skills[i].text)
-                date.append(posted[i].text)
-            
-            page_num += 1
+                
+                records.extend(page_records)
+                skipped += page_skipped
+                page_num += 1
         
         # تم استخراج وظيفة بنجاح Successfully extracted jobs
-        print(f"Успешно извлечено {len(job_title)} вакансий")
+        print(f"Успешно извлечено {len(records)} вакансий")
+        if skipped:
+            # تم تخطي بطاقات غير صالحة Skipped malformed cards
+            print(f"Пропущено некорректных карточек: {skipped}")
+        if stats is not None:
+            stats.update(jobs=len(records), skipped=skipped)
+        if http_cache is not None:
+            cache_stats = http_cache.stats()
+            print(f"HTTP-кэш: попаданий {cache_stats['hits']}, "
+                  f"304 {cache_stats['revalidated']}, промахов {cache_stats['misses']}")
+        if scheduler is not None:
+            sched_stats = scheduler.stats()
+            print(f"Запросов: {sched_stats['requests']}, повторов: {sched_stats['retries']}, "
+                  f"лимит параллелизма: {sched_stats['concurrency']:.1f}")
+        if checkpoint is not None:
+            # Прогон завершен: следующий запуск должен скачать свежие данные
+            # اكتمل التشغيل: التشغيل التالي يجب أن يحمل بيانات جديدة
+            checkpoint.clear_query(search_query, base_url)
         
-        data_lists = [job_title, company_name, date, location_name, skills, links]
-        return True, data_lists
+        return True, records_to_lists(records)
         
     except Exception as e:
         #حدث خطأ أثناء الاستخراج  Error during extraction
         print(f"Произошла ошибка при извлечении: {e}")
+        if checkpoint is not None:
+            # Загруженные страницы сохранены, повторный запуск продолжит с них
+            # الصفحات المحملة محفوظة وسيكمل التشغيل التالي منها
+            print(f"Сохранено страниц для продолжения: "
+                  f"{len(checkpoint.completed_pages(search_query, base_url))}")
         return False, []
+    
+    finally:
+        if own_session:
+            session.close()
+
+
+def scrape_wuzzuf_batch(queries: List[str], max_pages: int = 2, workers: int = DEFAULT_WORKERS,
+                        session: Optional[requests.Session] = None,
+                        base_url: str = WUZZUF_SEARCH_URL,
+                        max_per_host: Optional[int] = None,
+                        parser: str = DEFAULT_PARSER,
+                        http_cache: Optional[HttpCache] = None,
+                        scheduler: Optional[RequestScheduler] = None,
+                        stats: Optional[Dict[str, object]] = None) -> Tuple[bool, List]:
+    """
+    Scrape several queries on one worker pool - استخراج عدة استعلامات بمجموعة عمال واحدة
+    Скрапинг нескольких запросов на общем пуле с удалением дублей по ссылке
+    
+    Pages of all queries share the pool; the remaining pages of a query are
+    scheduled as soon as its first page reports the total count. Jobs are
+    deduplicated by link; each job keeps the position of its first occurrence
+    (query order, then page, then card). If any page of a query fails, all
+    rows of that query are dropped and the query is listed in
+    stats["failed_queries"], so returned data never holds a partial query.
+    
+    Args:
+        queries (List[str]): Job search terms - مصطلحات البحث
+        max_pages (int): Maximum pages per query - الحد الأقصى للصفحات لكل استعلام
+        workers (int): Shared pool size - حجم المجموعة المشتركة
+        stats (dict): Filled with "jobs", "duplicates", "skipped", "failed_queries"
+                      إحصاءات الدفعة
+        (other arguments as in scrape_wuzzuf_jobs - بقية الوسائط كما في scrape_wuzzuf_jobs)
+        
+    Returns:
+        Tuple[bool, List]: (Success status, seven data lists: BATCH_HEADER order)
+        (حالة النجاح، سبع قوائم بيانات)
+    """
+    # Одинаковые запросы выполняются один раз الاستعلامات المكررة تُنفذ مرة واحدة
+    queries = list(dict.fromkeys(query.strip() for query in queries if query and query.strip()))
+    print(f"Начало пакетного извлечения: {len(queries)} запросов...")
+    
+    own_session = session is None
+    if own_session:
+        session = create_session(workers)
+    limiter = HostLimiter(max_per_host or workers)
+    
+    # link -> [((query index, page, card position), record)] of every occurrence
+    occurrences: Dict[str, List[Tuple[Tuple[int, int, int], JobRecord]]] = {}
+    skipped = 0
+    failed: List[str] = []
+    
+    def fetch(query_idx: int, page_num: int):
+        return _load_or_fetch_page(queries[query_idx], page_num, base_url, session, limiter,
+                                   parser, None, http_cache, scheduler)
+    
+    try:
+        get_parser(parser)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(fetch, idx, 0): (idx, 0) for idx in range(len(queries))}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query_idx, page_num = pending.pop(future)
+                    query = queries[query_idx]
+                    if query in failed:
+                        continue
+                    try:
+                        page_limit, records, page_skipped = future.result()
+                    except Exception as e:
+                        # Ошибка одного запроса не прерывает остальные
+                        # خطأ استعلام واحد لا يوقف البقية
+                        print(f"Ошибка запроса '{query}': {e}")
+                        failed.append(query)
+                        continue
+                    
+                    if page_num == 0:
+                        last_page = max_pages
+                        if page_limit is not None:
+                            last_page = min(max_pages, page_limit // JOBS_PER_PAGE + 1)
+                        for next_page in range(1, last_page):
+                            pending[executor.submit(fetch, query_idx, next_page)] = (
+                                query_idx, next_page)
+                    
+                    skipped += page_skipped
+                    for position, record in enumerate(records):
+                        occurrences.setdefault(record.link, []).append(
+                            ((query_idx, page_num, position), record))
+        
+        # Строки запросов с ошибкой отбрасываются: их данные неполные
+        # صفوف الاستعلامات الفاشلة تُستبعد لأن بياناتها ناقصة
+        failed_idx = {queries.index(query) for query in failed}
+        first_seen: Dict[str, Tuple[Tuple[int, int, int], JobRecord]] = {}
+        matched: Dict[str, List[int]] = {}
+        kept = 0
+        for link, found in occurrences.items():
+            found = [item for item in found if item[0][0] not in failed_idx]
+            if not found:
+                continue
+            kept += len(found)
+            first_seen[link] = min(found, key=lambda item: item[0])
+            matched[link] = sorted({key[0] for key, _ in found})
+        duplicates = kept - len(first_seen)
+        
+        links = sorted(first_seen, key=lambda link: first_seen[link][0])
+        data_lists = records_to_lists([first_seen[link][1] for link in links])
+        # Запросы в порядке списка queries الاستعلامات بترتيب القائمة
+        data_lists.append([QUERY_SEPARATOR.join(queries[idx] for idx in matched[link])
+                           for link in links])
+        
+        print(f"Успешно извлечено {len(links)} уникальных вакансий, "
+              f"дублей удалено: {duplicates}")
+        if stats is not None:
+            stats.update(jobs=len(links), duplicates=duplicates, skipped=skipped,
+                         failed_queries=list(failed))
+        if queries and len(failed) == len(queries):
+            return False, []
+        return True, data_lists
+    
+    except Exception as e:
+        print(f"Произошла ошибка при извлечении: {e}")
+        return False, []
+    
+    finally:
+        if own_session:
+            session.close()
 
 
 # def save_jobs_to_csv(data_lists: List, file_path: str = "jobs.csv") -> bool:
@@ -112,9 +676,185 @@ def scrape_wuzzuf_jobs(search_query: str = "python", max_pages: int = 2) -> Tupl
 #         # Error saving data
 #         print(f"Ошибка сохранения данных: {e}")
 #         return False
-def save_jobs_to_csv(data_lists: List, file_path: str = "jobs.csv") -> bool:
+def csv_header_for(data_lists: List) -> List[str]:
+    """
+    Header matching the number of data lists - العناوين حسب عدد القوائم
+    """
+    return BATCH_HEADER if len(data_lists) == len(BATCH_HEADER) else CSV_HEADER
+
+
+def link_digest(link: str) -> str:
+    """
+    Short stable hash of a job link - بصمة قصيرة لرابط الوظيفة
+    """
+    return hashlib.blake2b(str(link).strip().encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _csv_stamp(file_path: str) -> str:
+    """
+    Size and mtime of the CSV as a sidecar line - حجم وزمن ملف CSV كسطر في الملف الجانبي
+    """
+    stat = os.stat(file_path)
+    return f"{SEEN_LINKS_STAMP}{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _write_seen_links(file_path: str, seen: Set[str]) -> None:
+    """
+    Rewrite the sidecar with one stamp line - إعادة كتابة الملف الجانبي بسطر ختم واحد
+    Атомарная перезапись файла хешей (временный файл и os.replace)
+    """
+    sidecar = file_path + SEEN_LINKS_SUFFIX
+    tmp_path = sidecar + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(f"{digest}\n" for digest in sorted(seen))
+        f.write(_csv_stamp(file_path) + "\n")
+    os.replace(tmp_path, sidecar)
+
+
+def _rebuild_seen_links(file_path: str) -> Set[str]:
+    """
+    Rebuild the sidecar from the links column of the CSV - إعادة بناء الملف الجانبي من عمود الروابط
+    Перестроение файла хешей по столбцу links
+    """
+    sidecar = file_path + SEEN_LINKS_SUFFIX
+    seen: Set[str] = set()
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        # Нет данных - старый список ссылок недействителен
+        # لا توجد بيانات - قائمة الروابط القديمة غير صالحة
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+        return seen
+    
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "links" in header:
+            link_col = header.index("links")
+            for row in reader:
+                if len(row) > link_col and row[link_col]:
+                    seen.add(link_digest(row[link_col]))
+    _write_seen_links(file_path, seen)
+    return seen
+
+
+def load_seen_links(file_path: str) -> Set[str]:
+    """
+    Load hashes of links already saved in file_path - تحميل بصمات الروابط المحفوظة
+    Загрузка хешей ссылок, уже сохраненных в файле
+    
+    The sidecar ends with the CSV size and mtime it was written for. When the
+    CSV is missing, empty or was changed by anything else, the sidecar is
+    rebuilt from the links column of the CSV.
+    الملف الجانبي ينتهي بحجم وزمن ملف CSV؛ إذا تغير الملف يُعاد بناؤه.
+    
+    Args:
+        file_path (str): CSV file path - مسار ملف CSV
+        
+    Returns:
+        Set[str]: Link hashes - بصمات الروابط
+    """
+    sidecar = file_path + SEEN_LINKS_SUFFIX
+    if os.path.exists(sidecar) and os.path.exists(file_path):
+        seen: Set[str] = set()
+        stamp = None
+        with open(sidecar, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith(SEEN_LINKS_STAMP):
+                    stamp = line
+                elif line:
+                    seen.add(line)
+        if stamp is not None and stamp == _csv_stamp(file_path):
+            return seen
+    return _rebuild_seen_links(file_path)
+
+
+def _align_rows(rows: List, header: List[str], existing_header: List[str]) -> List:
+    """
+    Reorder rows to the header of the existing CSV - مواءمة الصفوف مع عناوين الملف الموجود
+    Приведение строк к заголовку существующего CSV
+    
+    Raises:
+        ValueError: The existing header is not a scraper header - العناوين غير معروفة
+    """
+    if existing_header == header:
+        return rows
+    unknown = [column for column in existing_header if column not in BATCH_HEADER]
+    if unknown or "links" not in existing_header:
+        raise ValueError(f"Заголовок файла не совпадает с форматом вакансий: {existing_header}")
+    dropped = [column for column in header if column not in existing_header]
+    if dropped:
+        # Столбцы, которых нет в файле, не добавляются
+        # الأعمدة غير الموجودة في الملف لا تُضاف
+        print(f"Столбцы {dropped} отсутствуют в файле и не будут добавлены")
+    positions = [header.index(column) if column in header else None
+                 for column in existing_header]
+    return [[row[i] if i is not None else "" for i in positions] for row in rows]
+
+
+def append_jobs_to_csv(data_lists: List, file_path: str = "jobs.csv") -> int:
+    """
+    Append only jobs whose link is not in the file yet - إضافة الوظائف الجديدة فقط
+    Добавление только новых вакансий (по ссылке), без перечитывания файла
+    
+    Rows follow the header already in the file: batch rows lose their
+    "queries" column in a 6-column file, plain rows get an empty one in a
+    7-column file.
+    
+    Args:
+        data_lists (List): Lists of job data - قوائم بيانات الوظائف
+        file_path (str): Output file path - مسار ملف الإخراج
+        
+    Returns:
+        int: Number of appended rows - عدد الصفوف المضافة
+        
+    Raises:
+        ValueError: The file has an unknown header - الملف له عناوين غير معروفة
+    """
+    seen = load_seen_links(file_path)
+    link_col = CSV_HEADER.index("links")
+    header = csv_header_for(data_lists)
+    
+    write_header = not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+    existing_header = header
+    if not write_header:
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            existing_header = next(csv.reader(f), header)
+    
+    new_rows = []
+    for row in zip_longest(*data_lists):
+        link = row[link_col] if len(row) > link_col else None
+        if link:
+            digest = link_digest(link)
+            if digest in seen:
+                continue
+            seen.add(digest)
+        new_rows.append(row)
+    new_rows = _align_rows(new_rows, header, existing_header)
+    
+    with open(file_path, "a", encoding="utf-8", newline="") as myfile:
+        wr = csv.writer(myfile)
+        if write_header:
+            wr.writerow(header)
+        wr.writerows(new_rows)
+    # Хеши пишутся после строк: при сбое строка не потеряется, а отметка
+    # размера не совпадет и список будет перестроен. Файл перезаписывается
+    # целиком, чтобы в нем была одна отметка и он не рос без новых ссылок
+    # تُكتب البصمات بعد الصفوف: عند العطل لا يضيع صف ويُعاد بناء القائمة.
+    # الملف يُعاد كتابته كاملاً فلا يكبر بدون روابط جديدة
+    _write_seen_links(file_path, seen)
+    
+    return len(new_rows)
+
+
+def save_jobs_to_csv(data_lists: List, file_path: str = "jobs.csv", mode: str = "w") -> bool:
     """
     Save scraped data to CSV file
+    
+    Args:
+        data_lists (List): Lists of job data - قوائم بيانات الوظائف
+        file_path (str): Output file path - مسار ملف الإخراج
+        mode (str): "w" rewrites the file, "a" appends new links only - وضع الحفظ
     """
     try:
         # التحقق من صحة البيانات قبل الحفظ
@@ -128,12 +868,27 @@ def save_jobs_to_csv(data_lists: List, file_path: str = "jobs.csv") -> bool:
                 print("Неполные данные для сохранения")
                 return False
         
+        if mode not in ("w", "a"):
+            print(f"Неизвестный режим сохранения: {mode}")
+            return False
+        
+        if mode == "a":
+            added = append_jobs_to_csv(data_lists, file_path)
+            # Добавлено новых вакансий
+            print(f"Добавлено {added} новых вакансий в: {file_path}")
+            return True
+        
         exported = zip_longest(*data_lists)
         with open(file_path, "w", encoding="utf-8", newline="") as myfile:
             wr = csv.writer(myfile)
-            wr.writerow(["job title", "company name", "date", "location", "skills", "links"])
+            wr.writerow(csv_header_for(data_lists))
             wr.writerows(exported)
         
+        # Старый список ссылок больше не соответствует файлу
+        # قائمة الروابط القديمة لم تعد مطابقة للملف
+        if os.path.exists(file_path + SEEN_LINKS_SUFFIX):
+            os.remove(file_path + SEEN_LINKS_SUFFIX)
+        
         print(f"Данные были сохранены в: {file_path}")
         return True
         
@@ -144,6 +899,12 @@ def save_jobs_to_csv(data_lists: List, file_path: str = "jobs.csv") -> bool:
 
 # Main execution block - كتلة التنفيذ الرئيسية
 if __name__ == "__main__":
-    success, data = scrape_wuzzuf_jobs("python", 2)
+    import sys
+    
+    queries = sys.argv[1:] or ["python"]
+    if len(queries) > 1:
+        success, data = scrape_wuzzuf_batch(queries, 2)
+    else:
+        success, data = scrape_wuzzuf_jobs(queries[0], 2)
     if success:
         save_jobs_to_csv(data, "jobs.csv")
\ No newline at end of file